@@ -1,8 +1,16 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
+import json
+from collections import deque
 import gameoflife.evolution as cg
 import gameoflife.patterns as pt
+import gameoflife.cycles as cy
+import gameoflife.dataset as ds
+import gameoflife.profiling as prof
+import gameoflife.memory as mem
+import gameoflife.timeline as tl
+import gameoflife.sampling as smp
+import gameoflife.universe as un
 
 # ==========================================
 # 1. CONFIGURATION SUITE
@@ -50,7 +58,8 @@ TEST_SUITE = [
         "pattern_name": "Glider Gun",
         "pos": (5, 5),
         "steps": 150,
-        "grid_size": (60, 80)
+        "grid_size": (60, 80),
+        "boundary": "grow"      # Infinite plane: the gliders fly away instead of wrapping around
     },
     {
         "name": "Random_Entropy",
@@ -64,6 +73,19 @@ TEST_SUITE = [
 
 OUTPUT_DIR = "Analysis"
 
+# Per-step series and scalar results collected by SimulationRunner.run
+SERIES_KEYS = ["population", "occupancy", "com_x", "com_y", "entropy", "activity"]
+SCALAR_KEYS = ["period", "velocity", "speed", "displacement", "behavior", "memory", "sampling", "universe"]
+
+# Longest period looked for by the cycle detection
+MAX_PERIOD = 200
+
+# Largest side of the heatmap of a sampled run: one heatmap cell then counts block x block grid cells
+HEATMAP_MAX_SIDE = 1024
+
+# config["boundary"]: "wrap" = torus of grid_size cells, "grow" = infinite plane (gameoflife.universe)
+BOUNDARIES = ("wrap", "grow")
+
 # ==========================================
 # 2. CORE ANALYTICS ENGINE
 # ==========================================
@@ -97,28 +119,67 @@ class SimulationRunner:
         # Look backwards from the second-to-last frame
         # We limit the search to avoid performance issues on very long simulations
         search_limit = min(n_steps, 200)
-        
-        for i in range(n_steps - 2, n_steps - 2 - search_limit, -1):
-            if i < 0: break
-            if np.array_equal(last_state, timeline[i]):
+
+        # Slice + reversed: streamed backwards by a lazy Timeline, instead of one random access per frame
+        window = timeline[max(0, n_steps - 1 - search_limit):n_steps - 1]
+        for i, state in zip(range(n_steps - 2, -1, -1), reversed(window)):
+            if np.array_equal(last_state, state):
                 return (n_steps - 1) - i
         return -1
 
     @staticmethod
-    def classify_behavior(period, displacement, population_trend):
+    def block_counts(grid, block):
+        """Live cells of every block x block square of the grid (the last partial blocks are dropped)."""
+        if block == 1:
+            return grid.astype(np.int32)
+        rows, cols = grid.shape[0] // block, grid.shape[1] // block
+        cells = grid[:rows * block, :cols * block].reshape(rows, block, cols, block)
+        return cells.sum(axis=(1, 3), dtype=np.int32)
+
+    @staticmethod
+    def period_from_digests(digests):
+        """
+        detect_period on digests of the last generations collected while they were computed
+        (CycleDetector.last_fingerprint, or gameoflife.cycles.digest): no generation is read again.
+        Returns the period or -1.
+        """
+        digests = list(digests)
+        for i in range(len(digests) - 2, -1, -1):
+            if digests[i] == digests[-1]:
+                return len(digests) - 1 - i
+        return -1
+
+    @staticmethod
+    def detect_motion(timeline, max_period=MAX_PERIOD):
+        """
+        Finds the period and the velocity of the pattern, also for spaceships.
+        Compares translation-normalized fingerprints of each generation (see gameoflife.cycles),
+        so a Glider is recognised after 4 generations instead of a full lap of the torus.
+        Returns a gameoflife.cycles.Cycle, or None if nothing repeats.
+        """
+        return cy.detect_cycle(timeline, max_period=max_period)
+
+    @staticmethod
+    def classify_behavior(period, displacement, population_trend, velocity=None):
         """
         Heuristic function to classify the pattern based on observed metrics.
+        If velocity (dx, dy) per period is known, it is used instead of the displacement threshold.
         """
         start_pop, end_pop = population_trend
         
         if end_pop == 0:
             return "Extinction"
         
-        if period == 1:
+        if velocity is not None:
+            moving = velocity != (0, 0)
+        else:
+            moving = displacement > 2.0 # Threshold for movement
+
+        if period == 1 and not moving:
             return "Still Life (Stable)"
         
-        if period > 1:
-            if displacement > 2.0: # Threshold for movement
+        if period >= 1:
+            if moving:
                 return f"Spaceship / Mover (Period {period})"
             else:
                 return f"Oscillator (Period {period})"
@@ -162,15 +223,29 @@ class SimulationRunner:
         return entropy
 
     @staticmethod
-    def run(config):
+    def run(config, engine="auto", progress=None, memory_budget=None, trace_memory=False,
+            sample_fraction=None):
         """
         Executes a single experiment configuration.
+        engine: evolution engine (see gameoflife.engines), "auto" picks the fastest one.
+        progress: optional function (generation, state) called after every evolution step.
+        memory_budget: bytes (or "2G") allowed for this run, None = a quarter of the RAM. The timeline
+        representation is chosen to fit it (see gameoflife.memory), recorded in results["memory"].
+        trace_memory: also measure the allocation peak with tracemalloc (slower).
+        sample_fraction: estimate population, center of mass, entropy and activity from this share
+        of the cells (random tiles, see gameoflife.sampling), with confidence intervals in
+        results["intervals"]. Grids under sampling.EXACT_BELOW cells are still measured exactly.
+        config["boundary"] = "grow" runs on an infinite plane instead of the torus (see run_universe):
+        no timeline is kept, so memory_budget, trace_memory and sample_fraction do not apply.
         """
         name = config["name"]
         cat = config["category"]
         p_name = config["pattern_name"]
         rows, cols = config["grid_size"]
         steps = config["steps"]
+        boundary = config.get("boundary", "wrap")
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary '{boundary}'. Available: {', '.join(BOUNDARIES)}.")
         
         print(f"[{name}] Initializing grid ({rows}x{cols})...")
 
@@ -179,11 +254,23 @@ class SimulationRunner:
         
         # Inject pattern
         r_start, c_start = config["pos"]
-        grid = pt.insert_pattern(grid, cat, p_name, r_start, c_start)
+        with prof.stage("setup.insert_pattern"):
+            grid = pt.insert_pattern(grid, cat, p_name, r_start, c_start,
+                                     density=config.get("density", 0.5), seed=config.get("seed"))
+        if boundary == "grow":
+            return SimulationRunner.run_universe(config, grid, engine=engine, progress=progress)
 
         # --- B. Evolution Loop ---
+        # Lazy timeline: the generations are computed while the metrics below read them, and kept
+        # in the richest representation that fits the memory budget (frames, packed, deltas, stream)
+        governor = mem.MemoryGovernor(memory_budget, trace=trace_memory)
+        governor.start()
         print(f"[{name}] Simulating {steps} generations...")
-        timeline = cg.evolution(genzero=grid, timesteps=steps)
+        with prof.stage("evolution.setup"):
+            timeline = tl.Timeline(grid, steps, engine=engine, progress=progress,
+                                   **governor.plan((rows, cols), steps))
+        prof.count("evolution.generations", steps)
+        prof.count("evolution.cell_updates", steps * rows * cols)
 
         # --- C. Data Collection ---
         results = {
@@ -194,42 +281,206 @@ class SimulationRunner:
             "com_y": [],
             "entropy": [],
             "activity": [],
-            "heatmap": np.zeros((rows, cols), dtype=int),
             "displacement": 0.0
         }
         
         total_pixels = rows * cols
         prev_state = None
 
-        for state in timeline:
-            # 1. Population Metrics
-            pop = np.sum(state)
+        # Approximate mode: the per-frame metrics are estimated from random tiles, and the
+        # heatmap only adds one generation every `refresh_every`, summed over blocks of cells
+        # so that it stays at most HEATMAP_MAX_SIDE per side (small grids stay exact)
+        sampler = None
+        if sample_fraction is not None:
+            sampler = smp.TileSampler((rows, cols), fraction=sample_fraction, seed=config.get("seed"))
+            if sampler.exact:
+                sampler = None
+        results["sampling"] = None if sampler is None else sampler.describe()
+        if sampler is not None:
+            results["intervals"] = {"population": [], "com_y": [], "com_x": [], "entropy": [], "activity": []}
+            block = -(-max(rows, cols) // HEATMAP_MAX_SIDE)
+            results["sampling"]["heatmap_block"] = block
+            results["heatmap"] = np.zeros((rows // block, cols // block), dtype=np.int32)
+        else:
+            results["heatmap"] = np.zeros((rows, cols), dtype=int)
+
+        # Period and shift detected while the generations stream by (no second pass over the run),
+        # with the fingerprints of the last MAX_PERIOD + 1 generations for the exact-repeat fallback
+        detector = cy.CycleDetector(max_period=MAX_PERIOD)
+        recent = deque(maxlen=MAX_PERIOD + 1)
+
+        # The timeline computes every generation when it is first read: time the reads as "evolution"
+        generations = iter(timeline)
+        for t in range(len(timeline)):
+            with prof.stage("evolution"):
+                state = next(generations)
+
+            if sampler is not None:
+                # 1-4. Estimates with their confidence intervals
+                with prof.stage("metrics.sampled"):
+                    estimates = sampler.measure(t, state, prev_state)
+                estimates["com_y"], estimates["com_x"] = estimates.pop("com_row"), estimates.pop("com_col")
+                for key, intervals in results["intervals"].items():
+                    intervals.append((estimates[key].low, estimates[key].high))
+                pop, ent, flux = (estimates[key].value for key in ("population", "entropy", "activity"))
+                r, c = estimates["com_y"].value, estimates["com_x"].value
+            else:
+                # 1. Population Metrics
+                with prof.stage("metrics.population"):
+                    pop = np.sum(state)
+
+                # 2. Spatial Metrics (Center of Mass)
+                with prof.stage("metrics.center_of_mass"):
+                    r, c = SimulationRunner.get_center_of_mass(state)
+
+                # 3. Entropy: Measure of spatial distribution complexity
+                with prof.stage("metrics.entropy"):
+                    ent = SimulationRunner.calculate_entropy(state)
+
+                # 4. Activity (Flux): Total number of cell state changes from previous step
+                with prof.stage("metrics.activity"):
+                    if prev_state is None:
+                        flux = 0
+                    else:
+                        flux = np.sum(np.logical_xor(state, prev_state))    # XOR logic: True only if state changed
+
             results["population"].append(pop)
             results["occupancy"].append(pop / total_pixels)
-            
-            # 2. Spatial Metrics (Center of Mass)
-            r, c = SimulationRunner.get_center_of_mass(state)
             results["com_y"].append(r) # Row index maps to Y
             results["com_x"].append(c) # Col index maps to X
-
-            # 3. Entropy: Measure of spatial distribution complexity
-            ent = SimulationRunner.calculate_entropy(state)
             results["entropy"].append(ent)
-            
-            # 4. Activity (Flux): Total number of cell state changes from previous step
-            if prev_state is None:
-                flux = 0
-            else:
-                flux = np.sum(np.logical_xor(state, prev_state))    # XOR logic: True only if state changed
             results["activity"].append(flux)
             prev_state = state
-            
+
             # 5. Heatmap Accumulation: Number of cells that are alive at each position
-            results["heatmap"] += state.astype(int)
+            with prof.stage("metrics.heatmap"):
+                if sampler is None:
+                    results["heatmap"] += state.astype(int)
+                elif t % sampler.refresh_every == 0:
+                    results["heatmap"] += SimulationRunner.block_counts(state, block)
+
+            # 6. Translation-aware cycle detection, until the first cycle is found
+            if detector.cycle is None:
+                with prof.stage("metrics.detect_motion"):
+                    detector.update(state)
+                if t >= steps - MAX_PERIOD:
+                    recent.append(detector.last_fingerprint)
+
+            # 7. Memory budget: switches to a cheaper representation if the timeline outgrows it
+            governor.watch(t, timeline)
 
         # --- D. Post-Processing Analysis ---
-        results["period"] = SimulationRunner.detect_period(timeline)
-        
+        # Translation-aware detection first, exact whole-grid repeats as a fallback
+        cycle = detector.cycle
+        if cycle is not None:
+            results["period"] = cycle.period
+            results["velocity"] = (cycle.dx, cycle.dy)
+            results["speed"] = cycle.speed
+        else:
+            results["period"] = SimulationRunner.period_from_digests(recent)
+            results["velocity"] = None
+            results["speed"] = None
+        results["memory"] = governor.finish(timeline)
+        return SimulationRunner.summarize(results)
+
+    @staticmethod
+    def run_universe(config, grid, engine="auto", progress=None, max_period=MAX_PERIOD):
+        """
+        Executes an experiment on an infinite plane (config["boundary"] == "grow"): the grid is a
+        gameoflife.universe.Universe that grows with the pattern, so nothing wraps around.
+        Population, center of mass (global coordinates, those of the initial grid), activity and
+        the cycle are measured on the whole plane; entropy and heatmap on the initial grid window.
+        No generation is kept: the cycle is detected while they are computed.
+        grid: the initial grid, with the pattern already inserted.
+        """
+        name = config["name"]
+        rows, cols = config["grid_size"]
+        steps = config["steps"]
+
+        print(f"[{name}] Simulating {steps} generations on a growing universe...")
+        with prof.stage("evolution.setup"):
+            universe = un.Universe(grid, engine=engine)
+        detector = cy.CycleDetector(max_period=max_period)
+        prof.count("evolution.generations", steps)
+
+        results = {
+            "config": config,
+            "population": [],
+            "occupancy": [],
+            "com_x": [],
+            "com_y": [],
+            "entropy": [],
+            "activity": [],
+            "heatmap": np.zeros((rows, cols), dtype=int),
+            "displacement": 0.0,
+            "memory": None,
+            "sampling": None
+        }
+        total_pixels = rows * cols      # Occupancy is relative to the initial grid
+        previous = None
+
+        for t in range(steps + 1):
+            if t > 0:
+                with prof.stage("evolution"):
+                    universe.step()
+            current = universe.crop()
+            view = universe.window(0, 0, rows, cols)
+            if t > 0 and progress is not None:
+                progress(t, view)
+
+            # 1-4. Population, center of mass and activity of the whole plane, entropy of the window
+            with prof.stage("metrics.population"):
+                pop = universe.population
+            with prof.stage("metrics.center_of_mass"):
+                r, c = universe.center_of_mass()
+            with prof.stage("metrics.entropy"):
+                ent = SimulationRunner.calculate_entropy(view)
+            with prof.stage("metrics.activity"):
+                flux = 0 if previous is None else SimulationRunner.plane_activity(previous, current)
+            previous = current
+
+            results["population"].append(pop)
+            results["occupancy"].append(pop / total_pixels)
+            results["com_y"].append(r)
+            results["com_x"].append(c)
+            results["entropy"].append(ent)
+            results["activity"].append(flux)
+
+            # 5. Heatmap of the initial grid window
+            with prof.stage("metrics.heatmap"):
+                results["heatmap"] += view
+
+            # 6. Period and shift in global coordinates (the crop moves with the pattern)
+            if detector.cycle is None:
+                with prof.stage("metrics.detect_motion"):
+                    detector.update(current[2], origin=current[:2])
+
+        cycle = detector.cycle
+        results["period"] = cycle.period if cycle is not None else -1
+        results["velocity"] = (cycle.dx, cycle.dy) if cycle is not None else None
+        results["speed"] = cycle.speed if cycle is not None else None
+        results["universe"] = {"reallocations": universe.reallocations, "array": list(universe.shape),
+                               "bbox": None if universe.bbox is None else list(universe.bbox)}
+        return SimulationRunner.summarize(results)
+
+    @staticmethod
+    def plane_activity(previous, current):
+        """
+        Number of cells that changed between two generations of a Universe, given as the
+        (top, left, cells) of Universe.crop(): both crops are placed in their common box and XORed.
+        """
+        (top0, left0, before), (top1, left1, after) = previous, current
+        top, left = min(top0, top1), min(left0, left1)
+        bottom = max(top0 + before.shape[0], top1 + after.shape[0])
+        right = max(left0 + before.shape[1], left1 + after.shape[1])
+        canvas = np.zeros((bottom - top, right - left), dtype=bool)
+        canvas[top0 - top:top0 - top + before.shape[0], left0 - left:left0 - left + before.shape[1]] = before
+        canvas[top1 - top:top1 - top + after.shape[0], left1 - left:left1 - left + after.shape[1]] ^= after
+        return int(np.count_nonzero(canvas))
+
+    @staticmethod
+    def summarize(results):
+        """Adds the net displacement and the behavior class to the results of a run. Returns them."""
         # Calculate net displacement
         if not np.isnan(results["com_x"][0]) and not np.isnan(results["com_x"][-1]):
             dx = results["com_x"][-1] - results["com_x"][0]
@@ -241,7 +492,8 @@ class SimulationRunner:
         results["behavior"] = SimulationRunner.classify_behavior(
             results["period"], 
             results["displacement"], 
-            pop_trend
+            pop_trend,
+            results["velocity"]
         )
 
         return results
@@ -250,90 +502,51 @@ class SimulationRunner:
 # 3. REPORTING ENGINE
 # ==========================================
 
-def generate_report(data, output_folder):
+def decimate(series, width):
     """
-    Creates a detailed visual report and saves it to the disk.
-    Includes Population, Trajectory, Entropy, Activity, and Heatmaps.
+    Reduces a time series to at most 2 * width points before plotting: for every pixel
+    column the minimum and the maximum are kept, so the drawn line looks the same
+    (spikes included) while Agg only draws what can be seen.
+    Returns (steps, values) as float arrays. NaN values are ignored inside a column.
     """
+    values = np.asarray(series, dtype=float)
+    n = values.size
+    steps = np.arange(n, dtype=float)
+    if width < 1 or n <= 2 * width:
+        return steps, values
+
+    starts = np.linspace(0, n, width + 1).astype(int)[:-1]
+    with np.errstate(invalid="ignore"):
+        lows = np.fmin.reduceat(values, starts)
+        highs = np.fmax.reduceat(values, starts)
+    centers = (starts + np.append(starts[1:], n) - 1) / 2
+    return np.repeat(centers, 2), np.column_stack([lows, highs]).ravel()
+
+
+def decimate_path(xs, ys, width):
+    """Keeps about 2 * width evenly spaced points of a 2D path (first and last point included)."""
+    xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    stride = max(1, int(np.ceil(xs.size / (2 * max(width, 1)))))
+    if stride == 1:
+        return xs, ys
+    keep = np.append(np.arange(0, xs.size - 1, stride), xs.size - 1)
+    return xs[keep], ys[keep]
+
+
+def report_text(data):
+    """Technical data card shown in the right column of the report."""
     name = data["config"]["name"]
-    filename = os.path.join(output_folder, f"report_{name}.png")
-    
-    # Create a figure with a grid layout (2 rows, 3 columns)
-    # Col 1: Pop, Trajectory
-    # Col 2: Entropy/Activity, Heatmap
-    # Col 3: Stats
-    fig = plt.figure(figsize=(18, 10))
-    gs = fig.add_gridspec(2, 3, width_ratios=[1, 1, 0.4])
-
-    # --- Plot 1: Population History (Top Left) ---
-    ax_pop = fig.add_subplot(gs[0, 0])
-    ax_pop.plot(data["population"], color='#2E86C1', linewidth=2, label='Alive Cells')
-    ax_pop.set_title("Population Evolution", fontweight='bold')
-    ax_pop.set_ylabel("Count")
-    ax_pop.legend(loc='upper right')
-    ax_pop.grid(True, alpha=0.3)
-
-    # --- Plot 2: Trajectory Map (Bottom Left) ---
-    ax_traj = fig.add_subplot(gs[1, 0])
-    
-    # Plot path
-    ax_traj.plot(data["com_x"], data["com_y"], color='#E74C3C', alpha=0.5, label='Path')
-    
-    # Plot Start and End points
-    if len(data["com_x"]) > 0:
-        ax_traj.scatter(data["com_x"][0], data["com_y"][0], c='green', s=100, marker='^', label='Start')
-        ax_traj.scatter(data["com_x"][-1], data["com_y"][-1], c='red', s=100, marker='s', label='End')
-    
-    ax_traj.set_title("Center of Mass Trajectory")
-    ax_traj.set_xlabel("Grid Column")
-    ax_traj.set_ylabel("Grid Row")
-    ax_traj.invert_yaxis() # Important for matrix visualization
-    ax_traj.legend()
-    ax_traj.grid(True, alpha=0.3)
-
-    # --- Plot 3: Entropy & Activity (Top Middle) ---
-    ax_ent = fig.add_subplot(gs[0, 1])
-    
-    # Dual axis
-    color_ent = 'tab:purple'
-    ax_ent.set_xlabel('Step')
-    ax_ent.set_ylabel('Shannon Entropy', color=color_ent)
-    ax_ent.plot(data["entropy"], color=color_ent, linewidth=2, linestyle='--')
-    ax_ent.tick_params(axis='y', labelcolor=color_ent)
-    ax_ent.set_title("Entropy & Activity (Flux)")
-    
-    ax_act = ax_ent.twinx()
-    color_act = 'tab:orange'
-    ax_act.set_ylabel('Activity (Flux)', color=color_act)
-    ax_act.plot(data["activity"], color=color_act, linewidth=2, alpha=0.7)
-    ax_act.tick_params(axis='y', labelcolor=color_act)
-
-    # --- Plot 4: Occupancy Heatmap (Bottom Middle) ---
-    ax_heat = fig.add_subplot(gs[1, 1])
-    
-    # Use log scale if there's huge variance, but linear is usually fine for short runs
-    # Adding 1 to avoid log(0) issues if using LogNorm, but let's stick to linear for now.
-    im = ax_heat.imshow(data["heatmap"], cmap='hot', interpolation='nearest')
-    ax_heat.set_title("Occupancy Heatmap")
-    fig.colorbar(im, ax=ax_heat, fraction=0.046, pad=0.04)
-
-    # --- Panel 5: Technical Data Card (Right Column) ---
-    ax_info = fig.add_subplot(gs[:, 2])
-    ax_info.axis('off')
-    
-    # Calculate new stats
-    peak_entropy = max(data["entropy"]) if data["entropy"] else 0
-    avg_activity = np.mean(data["activity"]) if data["activity"] else 0
-    
-    # Construct the text block
+    peak_entropy = max(data["entropy"]) if len(data["entropy"]) else 0
+    avg_activity = np.mean(data["activity"]) if len(data["activity"]) else 0
     cfg = data["config"]
-    text_content = (
+    return (
         f"EXPERIMENT REPORT: {name}\n"
         f"{'='*30}\n\n"
         f"CONFIGURATION:\n"
         f"• Pattern: {cfg['pattern_name']}\n"
         f"• Category: {cfg['category']}\n"
         f"• Grid Size: {cfg['grid_size']}\n"
+        f"{universe_text(data.get('universe'))}"
         f"• Steps: {cfg['steps']}\n\n"
         f"STATISTICS:\n"
         f"• Initial Pop: {data['population'][0]}\n"
@@ -343,20 +556,340 @@ def generate_report(data, output_folder):
         f"• Avg Activity: {avg_activity:.1f} cells/step\n\n"
         f"PHYSICS ANALYSIS:\n"
         f"• Period Detected: {data['period'] if data['period'] > 0 else 'None'}\n"
+        f"• Shift / Period: {data['velocity'] if data.get('velocity') else 'None'}\n"
+        f"• Speed: {data['speed'] if data.get('speed') else 'None'}\n"
         f"• Net Displacement: {data['displacement']:.2f} px\n"
         f"• Classification: \n  {data['behavior']}"
+        f"{memory_text(data.get('memory'))}"
+        f"{sampling_text(data)}"
     )
-    
-    # Add text box
-    ax_info.text(0.05, 0.95, text_content, 
-                 fontsize=11, family='monospace', verticalalignment='top',
-                 bbox=dict(boxstyle="round,pad=1", facecolor="#F8F9F9", edgecolor="#B2BABB"))
-
-    # Save and Close
-    plt.tight_layout()
-    plt.savefig(filename, dpi=100)
-    plt.close(fig) # Close to free up memory
+
+
+def universe_text(record):
+    """Boundary line of the data card for the runs on a growing universe (empty on the torus)."""
+    if not record:
+        return ""
+    rows, cols = record["array"]
+    return f"• Boundary: grow (final array {rows}x{cols}, {record['reallocations']} reallocations)\n"
+
+
+def sampling_text(data):
+    """Sampling section of the data card (empty when the metrics are exact)."""
+    sampling = data.get("sampling")
+    if not sampling:
+        return ""
+    low, high = data["intervals"]["population"][-1]
+    return (
+        f"\n\nSAMPLED METRICS:\n"
+        f"• {sampling['fraction']*100:g}% of cells ({sampling['tiles']} tiles of {sampling['tile']}², "
+        f"new every {sampling['refresh_every']} steps)\n"
+        + (f"• Heatmap: {sampling['heatmap_block']}x{sampling['heatmap_block']} cells per pixel\n"
+           if sampling.get("heatmap_block", 1) > 1 else "")
+        + f"• Final Pop {sampling['confidence']*100:g}% CI: [{low:.0f}, {high:.0f}]"
+    )
+
+
+def memory_text(record):
+    """Memory section of the data card (empty for results without a memory record)."""
+    if not record:
+        return ""
+    strategy = " -> ".join(record["history"]) if len(record["history"]) > 1 else record["strategy"]
+    return (
+        f"\n\nMEMORY:\n"
+        f"• Timeline: {strategy}\n"
+        f"• Peak RSS: {mem.format_size(record['peak_rss'])}\n"
+        f"• Budget: {mem.format_size(record['budget'])}"
+        + (" (exceeded)" if record.get("over_budget") else "")
+        + (f"\n• Traced Peak: {mem.format_size(record['peak_traced'])}" if record.get("peak_traced") else "")
+    )
+
+
+class ReportRenderer:
+    """
+    Report template: the figure, its five panels and all their artists are created once,
+    and every report only replaces the data of the existing artists and saves the figure.
+    The layout is fixed (no tight_layout per report) and the figure is drawn by the Agg
+    canvas directly, without pyplot, so a renderer can live in a worker process.
+    Includes Population, Trajectory, Entropy, Activity, and Heatmaps.
+    """
+
+    def __init__(self, dpi=100):
+        # Imported here so that SimulationRunner (the compute path) never loads matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.dpi = dpi
+
+        # Create a figure with a grid layout (2 rows, 3 columns)
+        # Col 1: Pop, Trajectory
+        # Col 2: Entropy/Activity, Heatmap
+        # Col 3: Stats
+        fig = Figure(figsize=(18, 10), dpi=dpi)
+        FigureCanvasAgg(fig)
+        gs = fig.add_gridspec(2, 3, width_ratios=[1, 1, 0.65],
+                              left=0.04, right=0.99, bottom=0.06, top=0.95,
+                              wspace=0.22, hspace=0.25)
+        self.fig = fig
+
+        # --- Plot 1: Population History (Top Left) ---
+        ax_pop = fig.add_subplot(gs[0, 0])
+        self.pop_line, = ax_pop.plot([], [], color='#2E86C1', linewidth=2, label='Alive Cells')
+        ax_pop.set_title("Population Evolution", fontweight='bold')
+        ax_pop.set_ylabel("Count")
+        ax_pop.legend(loc='upper right')
+        ax_pop.grid(True, alpha=0.3)
+
+        # --- Plot 2: Trajectory Map (Bottom Left) ---
+        ax_traj = fig.add_subplot(gs[1, 0])
+
+        # Path, Start and End points (markers of the same size as scatter(s=100))
+        self.path_line, = ax_traj.plot([], [], color='#E74C3C', alpha=0.5, label='Path')
+        self.start_mark, = ax_traj.plot([], [], linestyle='', marker='^', markersize=10,
+                                        color='green', label='Start')
+        self.end_mark, = ax_traj.plot([], [], linestyle='', marker='s', markersize=10,
+                                      color='red', label='End')
+
+        ax_traj.set_title("Center of Mass Trajectory")
+        ax_traj.set_xlabel("Grid Column")
+        ax_traj.set_ylabel("Grid Row")
+        ax_traj.invert_yaxis() # Important for matrix visualization
+        ax_traj.legend()
+        ax_traj.grid(True, alpha=0.3)
+
+        # --- Plot 3: Entropy & Activity (Top Middle) ---
+        ax_ent = fig.add_subplot(gs[0, 1])
+
+        # Dual axis
+        color_ent = 'tab:purple'
+        ax_ent.set_xlabel('Step')
+        ax_ent.set_ylabel('Shannon Entropy', color=color_ent)
+        self.ent_line, = ax_ent.plot([], [], color=color_ent, linewidth=2, linestyle='--')
+        ax_ent.tick_params(axis='y', labelcolor=color_ent)
+        ax_ent.set_title("Entropy & Activity (Flux)")
+
+        ax_act = ax_ent.twinx()
+        color_act = 'tab:orange'
+        ax_act.set_ylabel('Activity (Flux)', color=color_act)
+        self.act_line, = ax_act.plot([], [], color=color_act, linewidth=2, alpha=0.7)
+        ax_act.tick_params(axis='y', labelcolor=color_act)
+
+        # --- Plot 4: Occupancy Heatmap (Bottom Middle) ---
+        ax_heat = fig.add_subplot(gs[1, 1])
+        self.heat_image = ax_heat.imshow(np.zeros((1, 1)), cmap='hot', interpolation='nearest')
+        ax_heat.set_title("Occupancy Heatmap")
+        fig.colorbar(self.heat_image, ax=ax_heat, fraction=0.046, pad=0.04)
+
+        # --- Panel 5: Technical Data Card (Right Column) ---
+        ax_info = fig.add_subplot(gs[:, 2])
+        ax_info.axis('off')
+        self.info_text = ax_info.text(0.05, 0.95, "",
+                                      fontsize=11, family='monospace', verticalalignment='top',
+                                      bbox=dict(boxstyle="round,pad=1", facecolor="#F8F9F9",
+                                                edgecolor="#B2BABB"))
+
+        self.ax_pop, self.ax_traj, self.ax_ent, self.ax_act, self.ax_heat = \
+            ax_pop, ax_traj, ax_ent, ax_act, ax_heat
+
+        # Panel widths in pixels (the layout is fixed): long series are decimated to them
+        self.widths = {ax: int(ax.get_window_extent().width) for ax in (ax_pop, ax_traj, ax_ent)}
+
+    def render(self, data, filename):
+        """Updates every artist with the data of one experiment and saves the figure."""
+        with prof.stage("report.artists"):
+            self._update(data)
+
+        # Light PNG compression: zlib level 6 alone took about a third of the time
+        with prof.stage("report.savefig"):
+            self.fig.savefig(filename, dpi=self.dpi, pil_kwargs={"compress_level": 1})
+
+    def _update(self, data):
+        """Sets the data of every artist (lines, markers, heatmap, data card)."""
+        # Population (decimated to the width of its panel)
+        self.pop_line.set_data(*decimate(data["population"], self.widths[self.ax_pop]))
+
+        # Trajectory
+        width = self.widths[self.ax_traj]
+        self.path_line.set_data(*decimate_path(data["com_x"], data["com_y"], width))
+        if len(data["com_x"]) > 0:
+            self.start_mark.set_data([data["com_x"][0]], [data["com_y"][0]])
+            self.end_mark.set_data([data["com_x"][-1]], [data["com_y"][-1]])
+        else:
+            self.start_mark.set_data([], [])
+            self.end_mark.set_data([], [])
+
+        # Entropy & Activity
+        width = self.widths[self.ax_ent]
+        self.ent_line.set_data(*decimate(data["entropy"], width))
+        self.act_line.set_data(*decimate(data["activity"], width))
+
+        # Rescale the line plots to the new data (after all their lines are updated)
+        for ax in (self.ax_pop, self.ax_traj, self.ax_ent, self.ax_act):
+            ax.relim()
+            ax.autoscale_view()
+
+        # Heatmap (new size and color range)
+        heatmap = np.asarray(data["heatmap"])
+        rows, cols = heatmap.shape
+        self.heat_image.set_data(heatmap)
+        self.heat_image.set_extent((-0.5, cols - 0.5, rows - 0.5, -0.5))
+        self.heat_image.set_clim(heatmap.min(), max(heatmap.max(), heatmap.min() + 1))
+        self.ax_heat.set_xlim(-0.5, cols - 0.5)
+        self.ax_heat.set_ylim(rows - 0.5, -0.5)
+
+        # Data card
+        self.info_text.set_text(report_text(data))
+
+
+_RENDERER = None    # Template reused by generate_report in this process
+
+
+def generate_report(data, output_folder):
+    """
+    Creates a detailed visual report and saves it to the disk.
+    Includes Population, Trajectory, Entropy, Activity, and Heatmaps.
+    The figure template is built on the first call and reused afterwards (see ReportRenderer).
+    """
+    global _RENDERER
+    if _RENDERER is None:
+        with prof.stage("report.template"):
+            _RENDERER = ReportRenderer()
+
+    name = data["config"]["name"]
+    filename = os.path.join(output_folder, f"report_{name}.png")
+    _RENDERER.render(data, filename)
     print(f"Saved report: {filename}")
+    return filename
+
+
+def save_report_data(data, output_folder):
+    """
+    Data-only report: saves the time series and the heatmap (report_<name>.npz)
+    and the configuration with the scalar results (report_<name>.json), without plotting.
+    """
+    name = data["config"]["name"]
+    base = os.path.join(output_folder, f"report_{name}")
+    with prof.stage("report.data"):
+        _write_report_data(data, base)
+    print(f"Saved data: {base}.npz")
+    return base + ".npz"
+
+
+def _write_report_data(data, base):
+    """Writes <base>.npz (series + heatmap) and <base>.json (configuration + scalar results)."""
+    np.savez_compressed(base + ".npz",
+                        **{key: np.asarray(data[key]) for key in SERIES_KEYS},
+                        **{f"{key}_ci": np.asarray(value) for key, value in data.get("intervals", {}).items()},
+                        heatmap=np.asarray(data["heatmap"]))
+
+    summary = {key: data.get(key) for key in SCALAR_KEYS}
+    summary["config"] = data["config"]
+    with open(base + ".json", "w") as f:
+        # default=: numpy scalars and tuples are not JSON types
+        json.dump(summary, f, indent=2, default=lambda v: v.item() if hasattr(v, "item") else list(v))
+
+
+def _report_job(data, output_folder, data_only, profile=None):
+    """
+    Worker-side entry point of render_reports (one template per worker process).
+    profile: None, or the events flag of the parent's profiler: the job is then profiled and
+    (filename, profiler snapshot) is returned, to be merged in the parent process.
+    """
+    if profile is None:
+        return _write_report(data, output_folder, data_only)
+    with prof.profile(events=profile, propagate=False) as profiler:
+        filename = _write_report(data, output_folder, data_only)
+    return filename, profiler.snapshot()
+
+
+def _write_report(data, output_folder, data_only):
+    if data_only:
+        return save_report_data(data, output_folder)
+    return generate_report(data, output_folder)
+
+
+def render_reports(results, output_folder, workers=None, data_only=False):
+    """
+    Writes the reports of many experiments, in a pool of worker processes.
+    Every worker builds the report template once and reuses it for all its experiments.
+
+    Args:
+        results (Iterable[dict]): Outputs of SimulationRunner.run. Consumed lazily, so
+                                  reports are rendered while the next simulations run.
+        output_folder (str): Destination folder.
+        workers (int | None): Number of processes (None = CPU count, 1 = no pool).
+        data_only (bool): Skip the PNGs and only write the data (see save_report_data).
+    Returns:
+        list: The files written, in the order of the results.
+        A failed report is printed and recorded as None.
+    """
+    def collect(name, job):
+        try:
+            return job()
+        except Exception as e:
+            print(f"ERROR reporting {name}: {e}")
+            return None
+
+    if workers == 1:
+        return [collect(data["config"]["name"], lambda: _write_report(data, output_folder, data_only))
+                for data in results]
+
+    # With profiling enabled, every job is profiled in its worker and merged here
+    profiler = prof.active()
+    profile = None if profiler is None else profiler.events is not None
+
+    def merged(future):
+        result = future.result()
+        if profile is None:
+            return result
+        filename, snapshot = result
+        prof.merge(snapshot)
+        return filename
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+        futures = [(data["config"]["name"], pool.submit(_report_job, data, output_folder, data_only, profile))
+                   for data in results]
+        return [collect(name, lambda: merged(future)) for name, future in futures]
+
+
+def export_metrics(data, dataset):
+    """
+    Appends the collected data of one experiment to a columnar dataset (gameoflife.dataset):
+    the per-step series and the heatmap go to the run files, the scalar results to the catalog.
+    Returns the key of the run.
+    """
+    velocity = data.get("velocity") or (None, None)
+    scalars = {key: data.get(key) for key in SCALAR_KEYS if key != "velocity"}
+    scalars["dx"], scalars["dy"] = velocity
+    with prof.stage("report.dataset"):
+        return dataset.append(data["config"],
+                              series={key: data[key] for key in SERIES_KEYS},
+                              scalars=scalars,
+                              arrays={"heatmap": data["heatmap"],
+                                      **{f"{key}_ci": value for key, value in data.get("intervals", {}).items()}})
+
+
+def run_suite(configs, dataset=None, engine="auto", memory_budget=None, trace_memory=False,
+              sample_fraction=None):
+    """
+    Runs the experiments one after the other, yielding the results (failed runs are printed and skipped).
+    With a dataset (gameoflife.dataset.MetricsDataset), every result is also appended to it.
+    """
+    for config in configs:
+        try:
+            result_data = SimulationRunner.run(config, engine=engine, memory_budget=memory_budget,
+                                               trace_memory=trace_memory, sample_fraction=sample_fraction)
+            if dataset is not None:
+                export_metrics(result_data, dataset)
+            yield result_data
+        except Exception as e:
+            print(f"ERROR processing {config['name']}: {e}")
+
+
+def _use_agg():
+    """Pool initializer: workers never open windows."""
+    import matplotlib
+    matplotlib.use("Agg")
 
 
 # ==========================================
@@ -364,6 +897,31 @@ def generate_report(data, output_folder):
 # ==========================================
 
 if __name__ == "__main__":
+    import argparse
+    import contextlib
+
+    parser = argparse.ArgumentParser(description="Run the analysis suite and write one report per experiment.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Report rendering processes (default: CPU count, 1 = no pool).")
+    parser.add_argument("--data-only", action="store_true",
+                        help="Write the collected data (npz + json) instead of the PNG reports.")
+    parser.add_argument("--dataset", default=os.path.join(OUTPUT_DIR, "dataset"),
+                        help="Columnar dataset the metrics of every run are appended to.")
+    parser.add_argument("--no-dataset", action="store_true", help="Do not write the dataset.")
+    parser.add_argument("--engine", default="auto",
+                        help="Evolution engine (see gameoflife.engines), default: chosen per run.")
+    parser.add_argument("--memory-budget", default=None, metavar="SIZE",
+                        help="Memory allowed per experiment, e.g. 512M or 2G (default: a quarter of the RAM).")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record the exact allocation peak of every experiment (tracemalloc, slower).")
+    parser.add_argument("--sample-fraction", type=float, default=None, metavar="F",
+                        help="Estimate the per-step metrics of big grids from this share of the cells, "
+                             "with confidence intervals (see gameoflife.sampling).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time every stage and print the histograms (see gameoflife.profiling).")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Profile and write a Chrome trace (chrome://tracing, Perfetto) to PATH.")
+    args = parser.parse_args()
     
     # 1. Prepare Output Directory
     if not os.path.exists(OUTPUT_DIR):
@@ -372,16 +930,16 @@ if __name__ == "__main__":
     
     print(f"Starting Analysis Suite with {len(TEST_SUITE)} experiments...")
     
-    # 2. Loop through experiments
-    for config in TEST_SUITE:
-        try:
-            # Run Simulation
-            result_data = SimulationRunner.run(config)
-            
-            # Generate Report
-            generate_report(result_data, OUTPUT_DIR)
-            
-        except Exception as e:
-            print(f"ERROR processing {config['name']}: {e}")
+    # 2. Run the experiments; every result is handed to the report workers as soon as
+    #    it is ready, so rendering overlaps with the next simulations
+    dataset = None if args.no_dataset else ds.MetricsDataset(args.dataset)
+    profiling = prof.profile(trace=args.trace) if args.profile or args.trace else contextlib.nullcontext()
+    with profiling as profiler:
+        render_reports(run_suite(TEST_SUITE, dataset, args.engine, args.memory_budget, args.trace_memory,
+                                 args.sample_fraction), OUTPUT_DIR, workers=args.workers, data_only=args.data_only)
+    if profiler is not None:
+        print("\n" + profiler.report())
+        if args.trace:
+            print(f"Trace: {args.trace}")
 
-    print("\nAll experiments completed. Check the 'Analysis' folder.")
\ No newline at end of file
+    print("\nAll experiments completed. Check the 'Analysis' folder.")
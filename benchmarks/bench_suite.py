@@ -0,0 +1,412 @@
+"""
+Benchmark suite for the gameoflife package.
+
+Measures the evolution engines (gameoflife.engines), the SimulationRunner metrics, pattern insertion and
+frame rendering on a sweep of grid sizes and workloads, and writes machine-readable
+JSON that can be compared across runs (--compare).
+
+Every result row reports:
+    seconds / gens_per_s / cells_per_s   timing (median of --repeat runs)
+    peak_bytes                           peak traced memory during one call (tracemalloc)
+    live_blocks                          net memory blocks still allocated after the call (tracemalloc):
+                                         what the call retains, not how many allocations it made
+    check                                bit-for-bit cross-check of the output grid:
+                                         {"against": "reference" | "oracle" | "loop", "match": bool}
+
+Cross-checks use the reference engine (evolution.newgen) where it is fast enough
+(--reference-max-cells). Above that, the output is compared with an independent
+np.roll implementation ("oracle"), itself validated against the reference at startup.
+
+Usage (from the repository root):
+    python benchmarks/bench_suite.py --quick
+    python benchmarks/bench_suite.py --sizes 64 256 1024 --json bench.json
+    python benchmarks/bench_suite.py --json new.json --compare bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import gameoflife.engines as engines   # noqa: E402  (needs REPO_ROOT on sys.path)
+import gameoflife.evolution as evo      # noqa: E402
+import gameoflife.export as export      # noqa: E402
+import gameoflife.patterns as pt        # noqa: E402
+import gameoflife.raster as raster      # noqa: E402
+import gameoflife.soup as soup          # noqa: E402
+from analysis import SimulationRunner   # noqa: E402
+
+
+DEFAULT_SIZES = [64, 256, 1024, 2048, 4096, 8192]
+DEFAULT_DENSITIES = [0.1, 0.3, 0.5]
+
+# Pattern workloads: name -> (category, pattern name, spacing between copies)
+PATTERN_WORKLOADS = {
+    "still_life": ("Still Life", "Block", 8),
+    "glider":     ("Spaceship", "Glider", 16),
+    "gun":        ("Complex", "Glider Gun", 64),
+}
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Cross-check helpers
+
+def oracle_step(grid):
+    """Independent implementation of one generation (np.roll neighbor sums, toroidal)."""
+    neighbors = np.zeros(grid.shape, dtype=np.uint8)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                neighbors += np.roll(grid, (dy, dx), axis=(0, 1))
+    return (neighbors == 3) | (grid & (neighbors == 2))
+
+
+def validate_oracle(trials=5, steps=4):
+    """Checks the oracle against the reference engine on small random grids."""
+    rng = np.random.default_rng(0)
+    for _ in range(trials):
+        grid = rng.random((int(rng.integers(5, 40)), int(rng.integers(5, 40)))) < 0.35
+        a, b = grid, grid
+        for _ in range(steps):
+            a, b = evo.newgen(a), oracle_step(b)
+            if not np.array_equal(a, b):
+                raise RuntimeError("The oracle engine does not match evolution.newgen.")
+
+
+def cross_check(start, result, steps, reference_max_cells):
+    """Recomputes `steps` generations from `start` with the reference (or the oracle) and compares."""
+    small = start.size <= reference_max_cells
+    step = evo.newgen if small else oracle_step
+    expected = start
+    for _ in range(steps):
+        expected = step(expected)
+    return {"against": "reference" if small else "oracle", "match": bool(np.array_equal(expected, result))}
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Measurement helpers
+
+def time_call(fn, repeat, min_time):
+    """
+    Median wall time of fn() over `repeat` samples. Every sample calls fn() in a loop
+    for at least min_time seconds. Returns (seconds per call, last return value).
+    """
+    result = fn()     # Warm-up (caches, lazy imports)
+    samples = []
+    for _ in range(repeat):
+        calls = 0
+        t0 = time.perf_counter()
+        while True:
+            result = fn()
+            calls += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_time:
+                break
+        samples.append(elapsed / calls)
+    return statistics.median(samples), result
+
+
+def memory_call(fn):
+    """Peak traced memory (bytes) during one fn() call, and the blocks still allocated after it."""
+    tracemalloc.start()
+    try:
+        base_bytes = tracemalloc.get_traced_memory()[0]
+        base_blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.reset_peak()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] - base_bytes
+        blocks = len(tracemalloc.take_snapshot().traces) - base_blocks
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak, blocks
+
+
+def make_workload(workload, size, density, seed=0):
+    """Initial grid of a workload: a random soup, or copies of a pattern tiled on the grid."""
+    if workload == "soup":
+        return soup.random_grid((size, size), density=density, seed=seed)
+    category, name, spacing = PATTERN_WORKLOADS[workload]
+    grid = np.zeros((size, size), dtype=bool)
+    anchors = np.arange(1, max(2, size - spacing + 1), spacing)
+    rows, cols = np.meshgrid(anchors, anchors, indexing="ij")
+    return pt.insert_patterns(grid, {"category": category, "name": name,
+                                     "row": rows.ravel(), "col": cols.ravel()})
+
+
+def workloads(densities):
+    """(workload, density) pairs: every pattern workload plus a soup per density."""
+    return [(name, None) for name in PATTERN_WORKLOADS] + [("soup", d) for d in densities]
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Benchmark groups
+
+def bench_evolution(sizes, densities, args):
+    """Generations per second of every engine on every workload and size."""
+    rows = []
+    for engine in args.engines:
+        step = engines.get_engine(engine).stepper()
+        for size in sizes:
+            if engine == "reference" and size * size > args.reference_max_cells and not args.full:
+                print(f"  evolution/{engine} {size}^2: skipped (reference engine, use --full)")
+                continue
+            for workload, density in workloads(densities):
+                grid = make_workload(workload, size, density)
+                gens = args.generations
+
+                def run():
+                    state = grid
+                    for _ in range(gens):
+                        state = step(state)
+                    return state
+
+                seconds, result = time_call(run, args.repeat, args.min_time)
+                peak, blocks = memory_call(lambda: step(grid))
+                rows.append({
+                    "group": "evolution", "case": f"{engine}/{workload}", "engine": engine,
+                    "workload": workload, "size": size, "density": density,
+                    "generations": gens, "seconds": seconds,
+                    "gens_per_s": gens / seconds, "cells_per_s": gens * grid.size / seconds,
+                    "peak_bytes": peak, "live_blocks": blocks,
+                    "check": cross_check(grid, result, gens, args.reference_max_cells),
+                })
+                _print_row(rows[-1])
+    return rows
+
+
+def bench_metrics(sizes, densities, args):
+    """SimulationRunner metric functions on one generation of a soup."""
+    functions = {
+        "center_of_mass": SimulationRunner.get_center_of_mass,
+        "entropy": SimulationRunner.calculate_entropy,
+    }
+    rows = []
+    for size in sizes:
+        for density in densities:
+            start = make_workload("soup", size, density)
+            grid = oracle_step(start)     # One evolved generation, checked below
+            check = cross_check(start, grid, 1, args.reference_max_cells)
+            for name, fn in functions.items():
+                seconds, _ = time_call(lambda: fn(grid), args.repeat, args.min_time)
+                peak, blocks = memory_call(lambda: fn(grid))
+                rows.append({
+                    "group": "metrics", "case": name, "size": size, "density": density,
+                    "seconds": seconds, "cells_per_s": grid.size / seconds,
+                    "peak_bytes": peak, "live_blocks": blocks, "check": check,
+                })
+                _print_row(rows[-1])
+
+        # Cycle detection over a short glider run
+        timeline = [make_workload("glider", size, None)]
+        for _ in range(8):
+            timeline.append(oracle_step(timeline[-1]))
+        check = cross_check(timeline[0], timeline[-1], 8, args.reference_max_cells)
+        seconds, _ = time_call(lambda: SimulationRunner.detect_motion(timeline), args.repeat, args.min_time)
+        peak, blocks = memory_call(lambda: SimulationRunner.detect_motion(timeline))
+        rows.append({
+            "group": "metrics", "case": "detect_motion", "size": size, "density": None,
+            "generations": len(timeline), "seconds": seconds,
+            "cells_per_s": len(timeline) * timeline[0].size / seconds,
+            "peak_bytes": peak, "live_blocks": blocks, "check": check,
+        })
+        _print_row(rows[-1])
+    return rows
+
+
+def bench_patterns(sizes, args):
+    """patterns.insert_pattern (one call per copy) against insert_patterns (one batched call)."""
+    rows = []
+    for size in sizes:
+        for workload, (category, name, spacing) in PATTERN_WORKLOADS.items():
+            anchors = np.arange(1, max(2, size - spacing + 1), spacing)
+            r, c = (a.ravel() for a in np.meshgrid(anchors, anchors, indexing="ij"))
+            empty = np.zeros((size, size), dtype=bool)
+
+            def loop():
+                grid = empty.copy()
+                for i in range(r.size):
+                    grid = pt.insert_pattern(grid, category, name, int(r[i]), int(c[i]))
+                return grid
+
+            def batch():
+                return pt.insert_patterns(empty.copy(), {"category": category, "name": name,
+                                                         "row": r, "col": c})
+
+            expected = loop()
+            for case, fn in (("insert_pattern", loop), ("insert_patterns", batch)):
+                if case == "insert_pattern" and r.size > args.max_loop_inserts:
+                    continue
+                seconds, result = time_call(fn, args.repeat, args.min_time)
+                peak, blocks = memory_call(fn)
+                rows.append({
+                    "group": "patterns", "case": f"{case}/{workload}", "size": size,
+                    "copies": int(r.size), "seconds": seconds,
+                    "inserts_per_s": r.size / seconds,
+                    "peak_bytes": peak, "live_blocks": blocks,
+                    "check": {"against": "loop", "match": bool(np.array_equal(expected, result))},
+                })
+                _print_row(rows[-1])
+    return rows
+
+
+def reference_downsample(grid, block, max_samples=4):
+    """
+    Independent version of raster.cells_to_indices for block > 1: the same documented sampling
+    (at most max_samples x max_samples evenly strided cells per block), summed with reduceat.
+    """
+    stride = max(1, block // max_samples)
+    while block % stride:
+        stride -= 1
+    per_block = block // stride
+    rows, cols = grid.shape[0] // block * block, grid.shape[1] // block * block
+    samples = grid[:rows:stride, :cols:stride].astype(np.int64)
+    counts = np.add.reduceat(samples, np.arange(0, samples.shape[0], per_block), axis=0)
+    counts = np.add.reduceat(counts, np.arange(0, samples.shape[1], per_block), axis=1)
+    return np.round(counts / per_block**2 * raster.ALIVE_INDEX).astype(np.uint8)
+
+
+def bench_rendering(sizes, args):
+    """Frame rendering (palette indices + upscaling / downsampling) and PPM encoding."""
+    palette = export.make_palette()
+    rows = []
+    for size in sizes:
+        grid = make_workload("soup", size, 0.3)
+        # Same output size for every grid: upscale small grids, downsample large ones
+        cell_size = max(1, 1024 // size)
+        block = max(1, size // 1024)
+        cases = {
+            "render_frame": lambda: export.render_frame(grid, cell_size, cell_size >= 4, block),
+            "render_ppm": lambda: raster.to_ppm(export.render_frame(grid, cell_size, False, block), palette),
+        }
+        # Naive reference of render_frame without grid lines (cell_size x cell_size repeats)
+        if block == 1:
+            expected = np.kron(grid.astype(np.uint8), np.ones((cell_size, cell_size), np.uint8)) * raster.ALIVE_INDEX
+            check_fn = lambda: export.render_frame(grid, cell_size, False, 1)
+        else:
+            expected = reference_downsample(grid, block)
+            check_fn = lambda: export.render_frame(grid, 1, False, block)
+        check = {"against": "loop", "match": bool(np.array_equal(expected, check_fn()))}
+
+        for case, fn in cases.items():
+            seconds, _ = time_call(fn, args.repeat, args.min_time)
+            peak, blocks = memory_call(fn)
+            rows.append({
+                "group": "rendering", "case": case, "size": size,
+                "cell_size": cell_size, "block": block, "seconds": seconds,
+                "frames_per_s": 1 / seconds, "cells_per_s": grid.size / seconds,
+                "peak_bytes": peak, "live_blocks": blocks, "check": check,
+            })
+            _print_row(rows[-1])
+    return rows
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Output
+
+def _row_key(row):
+    return (row["group"], row["case"], row["size"], row.get("density"))
+
+
+def _print_row(row):
+    rate = next((f"{row[k]:.3g} {k.replace('_per_s', '')}/s" for k in
+                 ("gens_per_s", "inserts_per_s", "frames_per_s", "cells_per_s") if k in row), "")
+    density = f" d={row['density']}" if row.get("density") is not None else ""
+    check = row["check"]
+    status = "n/a" if check["match"] is None else ("ok" if check["match"] else "MISMATCH")
+    print(f"  {row['group']:<10} {row['case']:<32} {row['size']:>5}^2{density:<7} "
+          f"{row['seconds'] * 1e3:>10.2f} ms  {rate:<24} peak {row['peak_bytes'] / 2**20:8.1f} MB  "
+          f"check {check['against']}: {status}")
+
+
+def compare(rows, path):
+    """Prints the speed ratio of every row that also exists in a previous JSON result file."""
+    with open(path) as f:
+        previous = {_row_key(row): row for row in json.load(f)["results"]}
+    print(f"\nComparison with {path} (old time / new time, > 1 = faster):")
+    for row in rows:
+        old = previous.get(_row_key(row))
+        if old is not None:
+            print(f"  {row['group']:<10} {row['case']:<32} {row['size']:>5}^2 "
+                  f"{old['seconds'] / row['seconds']:8.2f}x")
+
+
+def environment():
+    """Machine and code description stored with the results."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": sys.version, "numpy": np.__version__, "platform": platform.platform(),
+            "cpus": os.cpu_count(), "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gameoflife engines, metrics, patterns and rendering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Grid sides to sweep.")
+    parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES, help="Soup densities.")
+    parser.add_argument("--groups", nargs="+", default=["evolution", "metrics", "patterns", "rendering"],
+                        choices=["evolution", "metrics", "patterns", "rendering"])
+    parser.add_argument("--engines", nargs="+", default=engines.available(), choices=engines.available(),
+                        help="Evolution engines to time (default: every registered engine).")
+    parser.add_argument("--generations", type=int, default=4, help="Generations per evolution sample.")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per case (median is reported).")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per sample.")
+    parser.add_argument("--reference-max-cells", type=int, default=256 * 256,
+                        help="Largest grid timed with (and checked against) the reference engine.")
+    parser.add_argument("--max-loop-inserts", type=int, default=20000,
+                        help="Skip the one-call-per-copy insertion benchmark above this many copies.")
+    parser.add_argument("--full", action="store_true", help="Also time the reference engine on large grids (slow).")
+    parser.add_argument("--quick", action="store_true", help="Small sweep (64 and 256) with one sample per case.")
+    parser.add_argument("--json", metavar="PATH", help="Write the results to a JSON file.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with a previous JSON result file.")
+    args = parser.parse_args()
+    if args.quick:
+        args.sizes, args.repeat, args.min_time = [64, 256], 1, 0.0
+
+    validate_oracle()
+    results = []
+    for group in args.groups:
+        print(f"[{group}]")
+        if group == "evolution":
+            results += bench_evolution(args.sizes, args.densities, args)
+        elif group == "metrics":
+            results += bench_metrics(args.sizes, args.densities, args)
+        elif group == "patterns":
+            results += bench_patterns(args.sizes, args)
+        elif group == "rendering":
+            results += bench_rendering(args.sizes, args)
+
+    mismatches = [row for row in results if row["check"]["match"] is False]
+    print(f"\n{len(results)} results, {len(mismatches)} cross-check mismatches.")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "arguments": vars(args), "results": results}, f, indent=2)
+        print(f"Saved: {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
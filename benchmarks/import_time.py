@@ -0,0 +1,85 @@
+"""
+Import-time benchmark for the gameoflife package.
+
+Every measurement runs in a fresh interpreter (like a process-pool worker), and reports
+the wall time of the import and the peak memory (max RSS) of the process.
+The "compute path" rows should stay close to the cost of importing numpy alone,
+while the plotting rows pay for matplotlib.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, statement executed in a fresh interpreter)
+CASES = [
+    ("numpy (baseline)",           "import numpy"),
+    ("gameoflife",                 "import gameoflife"),
+    ("gameoflife.evolution",       "import gameoflife.evolution"),
+    ("evolution.newgen on 64x64",  "import numpy as np, gameoflife.evolution as evo; "
+                                   "evo.newgen(np.zeros((64, 64), dtype=bool))"),
+    ("gameoflife.patterns",        "import gameoflife.patterns"),
+    ("patterns.SEED_DATA",         "import gameoflife.patterns as pt; pt.SEED_DATA"),
+    ("gameoflife.visualization",   "import gameoflife.visualization"),
+]
+
+# Runs the statement and prints the import time and the peak RSS (kB on Linux, bytes on macOS)
+_PROBE = """
+import time, resource, sys
+t0 = time.perf_counter()
+exec({stmt!r})
+elapsed = time.perf_counter() - t0
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss //= 1024
+print(elapsed, rss, int("matplotlib" in sys.modules))
+"""
+
+
+def measure(stmt, repeat):
+    """Runs `stmt` in `repeat` fresh interpreters. Returns (median seconds, median kB, matplotlib loaded)."""
+    times, rss = [], []
+    mpl_loaded = False
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(stmt=stmt)],
+                             cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        elapsed, kb, mpl = out.stdout.split()
+        times.append(float(elapsed))
+        rss.append(int(kb))
+        mpl_loaded = bool(int(mpl))
+    return statistics.median(times), statistics.median(rss), mpl_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import cost of the gameoflife package.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per case (median is reported).")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results to a JSON file.")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<30} {'time [ms]':>10} {'max RSS [MB]':>13} {'matplotlib':>11}")
+    print("-" * 67)
+    for label, stmt in CASES:
+        seconds, kb, mpl = measure(stmt, args.repeat)
+        results.append({"case": label, "statement": stmt, "seconds": seconds,
+                        "max_rss_kb": kb, "matplotlib_loaded": mpl})
+        print(f"{label:<30} {seconds * 1e3:>10.1f} {kb / 1024:>13.1f} {'yes' if mpl else 'no':>11}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version, "repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"\nSaved: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
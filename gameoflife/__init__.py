@@ -1,5 +1,41 @@
 # gameoflife/__init__.py
 
-from . import evolution
-from . import patterns
-from . import visualization
+# Submodules are imported lazily, on first attribute access (PEP 562).
+# A worker that only needs evolution.newgen never imports matplotlib:
+#     import gameoflife.evolution           -> numpy only
+#     import gameoflife; gameoflife.visualization   -> matplotlib is imported here
+
+import importlib
+
+__all__ = [
+    "cycles",
+    "dataset",
+    "engines",
+    "evolution",
+    "export",
+    "memory",
+    "pattern_io",
+    "patterns",
+    "producer",
+    "profiling",
+    "raster",
+    "ringbuffer",
+    "sampling",
+    "soup",
+    "sweep",
+    "timeline",
+    "universe",
+    "visualization",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module    # Cache it, __getattr__ is not called again
+        return module
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,262 @@
+"""
+Cycle and motion detection for Game of Life runs.
+
+Every generation is reduced to a fingerprint: the live cells are cropped to their
+bounding box (taking the toroidal wrap into account) and the crop is hashed.
+Two generations with the same fingerprint show the same shape, possibly shifted,
+so a single dictionary lookup per step is enough to detect oscillators
+(no shift) and spaceships (shift of (dx, dy) every period).
+
+Usage:
+    detector = CycleDetector(max_period=200)
+    for state in timeline:
+        cycle = detector.update(state)
+        if cycle is not None:
+            print(cycle.period, cycle.dx, cycle.dy, cycle.speed)
+            break
+"""
+
+import hashlib
+from collections import deque
+from dataclasses import dataclass
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Fingerprint helpers
+
+def _circular_span(occupied):
+    """
+    Finds the shortest circular interval containing all True entries of a 1D mask.
+    The interval starts right after the longest run of False entries (wrap-around included).
+    Returns (start, length). Returns (0, 0) if the mask is empty.
+    """
+    n = occupied.size
+    idx = np.flatnonzero(occupied)
+    if idx.size == 0:
+        return 0, 0
+
+    # Every entry occupied: no gap to start after, the span is the whole axis (no wrap)
+    if idx.size == n:
+        return 0, n
+
+    # Gaps between consecutive occupied entries, including the one that wraps around the edge
+    gaps = np.diff(np.append(idx, idx[0] + n)) - 1
+    widest = int(np.argmax(gaps))
+
+    # The pattern starts right after the widest gap
+    start = int(idx[(widest + 1) % idx.size])
+    length = n - int(gaps[widest])
+    return start, length
+
+
+def fingerprint(grid):
+    """
+    Computes the translation-normalized fingerprint of a generation.
+
+    Args:
+        grid (np.ndarray): 2D boolean array with the current generation.
+    Returns:
+        tuple: (key, row, col) where key is a hash of the cropped pattern (bytes)
+               and (row, col) is the top-left corner of the crop in the grid.
+    """
+    grid = np.asarray(grid, dtype=bool)
+    n_rows, n_cols = grid.shape
+    row, height = _circular_span(grid.any(axis=1))
+    if height == 0:
+        return digest(grid[:0, :0]), 0, 0
+
+    # Only the occupied rows can have live cells: scan their band when it does not wrap
+    band = grid[row:row + height] if row + height <= n_rows else grid
+    col, width = _circular_span(band.any(axis=0))
+
+    if row + height <= n_rows and col + width <= n_cols:
+        crop = grid[row:row + height, col:col + width]      # A view: no copy before hashing
+    else:
+        # Roll the crop origin to (0, 0) so that patterns crossing the edge stay in one piece
+        rows_idx = (row + np.arange(height)) % n_rows
+        cols_idx = (col + np.arange(width)) % n_cols
+        crop = grid[np.ix_(rows_idx, cols_idx)]
+    return digest(crop), row, col
+
+
+def digest(grid):
+    """16-byte hash of a grid (its shape and its bits): equal grids, equal digests."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(np.array(grid.shape, dtype=np.int64).tobytes())
+    hasher.update(np.packbits(grid, axis=None).tobytes())
+    return hasher.digest()
+
+
+def _signed_shift(delta, size):
+    """Maps a toroidal shift to the equivalent one closest to zero (e.g. size-1 -> -1)."""
+    delta %= size
+    if delta > size // 2:
+        delta -= size
+    return delta
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Detector
+
+@dataclass(frozen=True)
+class Cycle:
+    """
+    Result of a cycle detection.
+
+    Attributes:
+        period (int): Number of generations after which the shape repeats.
+        dx (int): Column shift per period (positive = right).
+        dy (int): Row shift per period (positive = down).
+        transient (int): Generation at which the cycle starts.
+        generation (int): Generation at which the cycle was detected.
+    """
+    period: int
+    dx: int
+    dy: int
+    transient: int
+    generation: int
+
+    @property
+    def is_moving(self):
+        """True if the pattern translates (spaceship), False if it oscillates in place."""
+        return self.dx != 0 or self.dy != 0
+
+    @property
+    def velocity(self):
+        """Speed as a fraction of c (cells per generation along the fastest axis)."""
+        return Fraction(max(abs(self.dx), abs(self.dy)), self.period)
+
+    @property
+    def speed(self):
+        """Speed in the usual c/p notation, e.g. 'c/4' for the glider, '2c/5', or '0'."""
+        step = max(abs(self.dx), abs(self.dy))
+        if step == 0:
+            return "0"
+        g = gcd(step, self.period)
+        step, period = step // g, self.period // g
+        numerator = "c" if step == 1 else f"{step}c"
+        return numerator if period == 1 else f"{numerator}/{period}"
+
+
+class CycleDetector:
+    """
+    Incremental period and velocity detector.
+
+    Keeps the fingerprints of the last `max_period` generations in a hash table,
+    so each call to update() costs O(1) on top of computing the fingerprint.
+    """
+
+    def __init__(self, max_period=None):
+        """
+        Args:
+            max_period (int | None): Longest period to look for. None keeps the whole history.
+        """
+        if max_period is not None and max_period < 1:
+            raise ValueError("max_period must be a positive integer.")
+        self.max_period = max_period
+        self.reset()
+
+    def reset(self):
+        """Forgets all the generations seen so far."""
+        self.generation = -1
+        self.cycle = None
+        self.last_fingerprint = None      # (key, row, col) of the last generation: equal iff the grids are
+        self._seen = {}                   # fingerprint -> (generation, row, col)
+        self._order = deque()             # fingerprints in insertion order, for eviction
+
+    def update(self, grid, origin=None):
+        """
+        Feeds the next generation to the detector.
+
+        Args:
+            grid (np.ndarray): 2D boolean array with the next generation.
+            origin (tuple[int, int] | None): Global (row, col) of grid[0, 0] on an infinite plane
+                                             (e.g. gameoflife.universe.Universe.crop()): the shifts
+                                             are then measured in global coordinates, without wrap.
+        Returns:
+            Cycle | None: The detected cycle, or None if the shape has not repeated yet.
+        """
+        self.generation += 1
+        key, row, col = fingerprint(grid)
+        if origin is not None:
+            row, col = row + origin[0], col + origin[1]
+        self.last_fingerprint = (key, row, col)
+
+        cycle = None
+        previous = self._seen.get(key)
+        if previous is not None:
+            gen, prev_row, prev_col = previous
+            if origin is None:
+                dy = _signed_shift(row - prev_row, grid.shape[0])
+                dx = _signed_shift(col - prev_col, grid.shape[1])
+            else:
+                dy, dx = row - prev_row, col - prev_col
+            cycle = Cycle(period=self.generation - gen, dx=dx, dy=dy,
+                          transient=gen, generation=self.generation)
+            # Keep the first detection: later matches only repeat the same cycle
+            if self.cycle is None:
+                self.cycle = cycle
+
+        # Store the latest occurrence and drop fingerprints older than max_period
+        self._seen[key] = (self.generation, row, col)
+        self._order.append((key, self.generation))
+        if self.max_period is not None:
+            while self._order and self._order[0][1] < self.generation - self.max_period:
+                old_key, old_gen = self._order.popleft()
+                if self._seen.get(old_key, (None,))[0] == old_gen:
+                    del self._seen[old_key]
+
+        return cycle
+
+
+def detect_cycle(timeline, max_period=None):
+    """
+    Scans a sequence of generations and returns the first cycle found.
+
+    Args:
+        timeline (Sequence[np.ndarray]): Generations in order (e.g. the output of evolution.evolution).
+        max_period (int | None): Longest period to look for.
+    Returns:
+        Cycle | None: The first detected cycle, or None if nothing repeats.
+    """
+    detector = CycleDetector(max_period=max_period)
+    for state in timeline:
+        cycle = detector.update(state)
+        if cycle is not None:
+            return cycle
+    return None
+
+
+class CycleReplay:
+    """
+    Step function that stops computing once a cycle is known.
+
+    On a torus, a cycle of period p and shift (dx, dy) means that every generation is the
+    one p steps before, rolled by (dy, dx). The first p calls still use `step` (to collect
+    one full period), afterwards every call is a single np.roll of a stored generation.
+
+    Usage:
+        stepper = CycleReplay(evo.newgen, cycle)
+        state = stepper(state)          # drop-in replacement for evo.newgen
+    """
+
+    def __init__(self, step, cycle):
+        self.step = step
+        self.cycle = cycle
+        self._history = deque(maxlen=cycle.period)     # The last `period` generations
+
+    def __call__(self, state):
+        if len(self._history) < self.cycle.period:
+            new = self.step(state)
+        else:
+            new = np.roll(self._history[0], (self.cycle.dy, self.cycle.dx), axis=(0, 1))
+        self._history.append(new)
+        return new
@@ -0,0 +1,274 @@
+"""
+Columnar storage of simulation metrics.
+
+A dataset is a folder that grows across runs:
+    <root>/catalog.csv          one row per run: key, configuration, scalar results
+    <root>/runs/<key>.npz       per-step series (one compressed array per column) + 2D arrays
+    <root>/runs/<key>.parquet   same series as a Parquet table (only if pyarrow is installed)
+    <root>/columns/<name>.f8    every run's values of one numeric series, appended (float64)
+    <root>/columns/<name>.idx   segments of that file: (run key, offset, length) per append
+
+Runs are keyed by a hash of their configuration: running the same configuration again
+replaces its files and its catalog row (and appends a new segment, the latest one wins).
+Statistics over thousands of runs read a series with one file read (load_columns) instead
+of opening every run; load() reads one run lazily (an .npz member is only decompressed
+when accessed). Runs stored before the column files existed are read from their .npz.
+
+Usage:
+    ds = MetricsDataset("Analysis/dataset")
+    ds.append(config, series={"population": pop, ...}, scalars={"period": 4}, arrays={"heatmap": h})
+    table = ds.load_columns(["population", "entropy"])     # (n_runs, max_steps), NaN padded
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:     # Parquet output is optional
+    pa = pq = None
+
+
+CATALOG_FILENAME = "catalog.csv"
+RUNS_DIRNAME = "runs"
+COLUMNS_DIRNAME = "columns"
+SEGMENT_DTYPE = np.dtype([("key", "S16"), ("offset", "<i8"), ("length", "<i8")])
+
+
+def config_key(config):
+    """Stable 16-character key of a configuration (dict order and tuple / list do not matter)."""
+    canonical = json.dumps(config, sort_keys=True, default=_json_default)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+def _json_default(value):
+    if hasattr(value, "item"):      # numpy scalar
+        return value.item()
+    if isinstance(value, (tuple, set, np.ndarray)):
+        return list(value)
+    return str(value)
+
+
+def _parse(text):
+    """Catalog cells are stored as text: numbers are converted back, the rest stays a string."""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+class MetricsDataset:
+    """
+    Append-only collection of runs (see the module docstring for the layout).
+    """
+
+    def __init__(self, root, parquet=True):
+        """
+        Args:
+            root (str): Dataset folder (created if missing).
+            parquet (bool): Also write Parquet files when pyarrow is available.
+        """
+        self.root = root
+        self.parquet = parquet and pq is not None
+        self.catalog_path = os.path.join(root, CATALOG_FILENAME)
+        self.runs_dir = os.path.join(root, RUNS_DIRNAME)
+        self.columns_dir = os.path.join(root, COLUMNS_DIRNAME)
+        os.makedirs(self.runs_dir, exist_ok=True)
+        os.makedirs(self.columns_dir, exist_ok=True)
+
+    # ---------------------------------------------------------------------------------
+    # Writing
+
+    def append(self, config, series, scalars=None, arrays=None):
+        """
+        Stores one run.
+
+        Args:
+            config (dict): Configuration of the run (its hash is the key of the run).
+            series (dict[str, Sequence]): Per-step columns, all of the same length.
+            scalars (dict | None): Scalar results, stored in the catalog.
+            arrays (dict[str, np.ndarray] | None): Other arrays (e.g. a heatmap), stored in the .npz only.
+        Returns:
+            str: The key of the run.
+        """
+        columns = {name: np.asarray(values) for name, values in series.items()}
+        lengths = {column.shape[0] for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All series must have the same length, got {sorted(lengths)}.")
+        n_steps = lengths.pop() if lengths else 0
+        arrays = {name: np.asarray(value) for name, value in (arrays or {}).items()}
+        overlap = set(columns) & set(arrays)
+        if overlap:
+            raise ValueError(f"Names used both as series and arrays: {sorted(overlap)}.")
+
+        key = config_key(config)
+        np.savez_compressed(self._path(key, ".npz"), **columns, **arrays)
+        if self.parquet:
+            table = pa.table({"step": np.arange(n_steps), **columns})
+            pq.write_table(table, self._path(key, ".parquet"), compression="zstd")
+        self._append_columns(key, columns)
+
+        row = {"key": key, "steps_recorded": n_steps,
+               "series": " ".join(columns), "arrays": " ".join(arrays),
+               "config": json.dumps(config, sort_keys=True, default=_json_default)}
+        for name, value in config.items():
+            row[f"config.{name}"] = value
+        for name, value in (scalars or {}).items():
+            row[name] = value
+        self._append_row(row)
+        return key
+
+    def _append_columns(self, key, columns):
+        """Appends the numeric series of a run to the column files (values first, then the segment)."""
+        for name, column in columns.items():
+            if column.ndim != 1 or column.dtype.kind not in "biuf":
+                continue
+            with open(self._column_path(name, ".f8"), "ab") as f:
+                offset = f.tell() // 8
+                column.astype("<f8").tofile(f)
+            with open(self._column_path(name, ".idx"), "ab") as f:
+                np.array([(key, offset, column.size)], dtype=SEGMENT_DTYPE).tofile(f)
+
+    def _append_row(self, row):
+        """Appends a catalog row; new fields rewrite the header (rare: the schema changed)."""
+        row = {name: (json.dumps(value, default=_json_default)
+                      if isinstance(value, (list, tuple, dict)) else value)
+               for name, value in row.items()}
+        fields = self._fields()
+        if fields is not None and set(row) <= set(fields):
+            with open(self.catalog_path, "a", newline="") as f:
+                csv.DictWriter(f, fieldnames=fields).writerow(row)
+            return
+        rows = self._read_rows()
+        fields = (fields or []) + [name for name in row if name not in (fields or [])]
+        with open(self.catalog_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows + [row])
+
+    # ---------------------------------------------------------------------------------
+    # Reading
+
+    def _path(self, key, ext):
+        return os.path.join(self.runs_dir, key + ext)
+
+    def _column_path(self, name, ext):
+        return os.path.join(self.columns_dir, name + ext)
+
+    def _segments(self, name, keys):
+        """(offsets, lengths) of the latest segment of every key in a column file; offset -1 if absent."""
+        offsets = np.full(len(keys), -1, dtype=np.int64)
+        lengths = np.zeros(len(keys), dtype=np.int64)
+        path = self._column_path(name, ".idx")
+        if not keys or not os.path.exists(path):
+            return offsets, lengths
+        index = np.fromfile(path, dtype=SEGMENT_DTYPE)[::-1]     # Latest first
+        if index.size == 0:
+            return offsets, lengths
+        unique, first = np.unique(index["key"], return_index=True)
+        wanted = np.array(keys, dtype="S16")
+        pos = np.minimum(np.searchsorted(unique, wanted), unique.size - 1)
+        found = unique[pos] == wanted
+        latest = index[first[pos]]
+        offsets[found] = latest["offset"][found]
+        lengths[found] = latest["length"][found]
+        return offsets, lengths
+
+    def _fields(self):
+        if not os.path.exists(self.catalog_path):
+            return None
+        with open(self.catalog_path, newline="") as f:
+            return next(csv.reader(f), None)
+
+    def _read_rows(self):
+        if not os.path.exists(self.catalog_path):
+            return []
+        with open(self.catalog_path, newline="") as f:
+            return list(csv.DictReader(f))
+
+    def catalog(self):
+        """
+        Returns the catalog as a list of dicts, one per run (the latest row of every key),
+        in order of first appearance. Numeric cells are converted to int / float.
+        """
+        latest = {}
+        for row in self._read_rows():
+            # The key stays text: a hex key like "12e4..." would parse as a number
+            latest[row["key"]] = {name: value if name == "key" else _parse(value)
+                                  for name, value in row.items() if value != ""}
+        return list(latest.values())
+
+    def keys(self, **filters):
+        """Keys of the runs whose catalog fields match all the filters, e.g. keys(**{"config.category": "Random"})."""
+        return [row["key"] for row in self.catalog()
+                if all(row.get(name) == value for name, value in filters.items())]
+
+    def __len__(self):
+        return len(self.catalog())
+
+    def load(self, key, columns=None):
+        """
+        Reads the columns (series or arrays) of one run. Only the requested ones are decompressed.
+
+        Args:
+            key (str): Run key (see keys()).
+            columns (Sequence[str] | None): Names to read. None reads everything.
+        Returns:
+            dict[str, np.ndarray]
+        """
+        with np.load(self._path(key, ".npz")) as data:
+            names = data.files if columns is None else columns
+            return {name: data[name] for name in names}
+
+    def load_columns(self, columns, keys=None, fill=np.nan):
+        """
+        Reads the same per-step columns of many runs into 2D arrays, for vectorized statistics:
+        one read of every column file, then a single gather. Runs of different lengths are padded with `fill`.
+
+        Args:
+            columns (Sequence[str]): Series to read.
+            keys (Sequence[str] | None): Runs to read (None = all, in catalog order).
+            fill (float): Padding value.
+        Returns:
+            dict[str, np.ndarray]: name -> float array of shape (n_runs, max_steps),
+                                   plus "key" -> the run keys (rows order) and "length" -> steps per run.
+        """
+        if keys is None:
+            keys = [row["key"] for row in self.catalog()]
+        keys = list(keys)
+        segments = {name: self._segments(name, keys) for name in columns}
+
+        # Runs missing from a column file (stored before it existed) are read from their .npz
+        missing = {}
+        for name, (offsets, _) in segments.items():
+            for i in np.flatnonzero(offsets < 0):
+                missing.setdefault(int(i), []).append(name)
+        fallback = {i: self.load(keys[i], names) for i, names in missing.items()}
+        for i, run in fallback.items():
+            for name, values in run.items():
+                segments[name][1][i] = len(values)
+
+        lengths = segments[columns[0]][1] if columns else np.zeros(len(keys), dtype=np.int64)
+        width = int(max((s[1].max() for s in segments.values() if s[1].size), default=0))
+        steps = np.arange(width)
+
+        out = {"key": np.array(keys), "length": lengths.astype(int)}
+        for name, (offsets, column_lengths) in segments.items():
+            table = np.full((len(keys), width), fill, dtype=float)
+            stored = offsets >= 0
+            if stored.any():
+                values = np.fromfile(self._column_path(name, ".f8"), dtype="<f8")
+                inside = stored[:, None] & (steps < column_lengths[:, None])
+                table[inside] = values[(offsets[:, None] + steps)[inside]]
+            for i, run in fallback.items():
+                if name in run:
+                    table[i, :len(run[name])] = run[name]
+            out[name] = table
+        return out
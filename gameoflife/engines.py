@@ -0,0 +1,383 @@
+"""
+Evolution engines: interchangeable implementations of one Game of Life step.
+
+Every engine is registered with its capabilities:
+    boundaries  edge conditions it implements ("wrap": torus, "dead": cells outside are dead)
+    rules       Life-like rules it implements (None = any "B.../S..." rule)
+    batch       whether it can step a stack of grids (..., rows, cols) in one call
+
+Callers do not have to choose by hand: with engine="auto" the fastest engine supporting
+the request is picked from the grid size, the live-cell density and the number of steps,
+using a cost model fitted by a short local micro-benchmark. The calibration runs once
+per machine and is cached on disk (see calibration_path()). The library entry points
+default to DEFAULT_ENGINE instead, so that using them never benchmarks the machine or
+writes files; applications opt into "auto" (analysis.py, the GUI, the job service).
+
+Usage:
+    step = make_step("auto", grid, horizon=1000)    # function grid -> next grid
+    grid = step(grid)
+
+    engine = get_engine("numpy")
+    stack = engine.step(stack, boundary="dead", rule="B36/S23")
+"""
+
+import json
+import os
+import platform
+import re
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+
+try:
+    from . import evolution as evo
+    from . import profiling
+except ImportError:     # Module used outside the package (e.g. "import engines")
+    import evolution as evo
+    import profiling
+
+
+DEFAULT_RULE = "B3/S23"
+BOUNDARIES = ("wrap", "dead")
+AUTO = "auto"
+DEFAULT_ENGINE = "numpy"    # Default of the library entry points: deterministic, no calibration
+
+CALIBRATION_VERSION = 1
+CALIBRATION_FILENAME = "engines.json"
+CALIBRATION_DENSITIES = (0.1, 0.5)
+CALIBRATION_REPEAT = 3
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Rules
+
+def parse_rule(rule):
+    """
+    Parses a Life-like rule string ("B3/S23", "b36/s23", "23/3" in S/B notation).
+
+    Returns:
+        tuple: (birth, survive), frozensets of neighbor counts (0-8).
+    """
+    text = rule.strip().upper().replace(" ", "")
+    match = re.fullmatch(r"B([0-8]*)/S([0-8]*)", text) or re.fullmatch(r"S([0-8]*)/B([0-8]*)", text)
+    if match is not None:
+        birth, survive = match.groups() if text.startswith("B") else match.groups()[::-1]
+    else:
+        match = re.fullmatch(r"([0-8]*)/([0-8]*)", text)     # Classic "survive/birth" notation
+        if match is None:
+            raise ValueError(f"Invalid rule '{rule}': expected a Life-like rule such as 'B3/S23'.")
+        survive, birth = match.groups()
+    return frozenset(map(int, birth)), frozenset(map(int, survive))
+
+
+def normalize_rule(rule):
+    """Canonical "B.../S..." form of a rule string (digits sorted)."""
+    birth, survive = parse_rule(rule)
+    return "B" + "".join(map(str, sorted(birth))) + "/S" + "".join(map(str, sorted(survive)))
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Engines
+
+@dataclass(frozen=True)
+class Engine:
+    """A registered implementation of one generation step (see the module docstring)."""
+    name: str
+    fn: object                  # Function (cells, boundary, rule) -> next cells
+    boundaries: frozenset
+    rules: frozenset = None     # Normalized rule strings, None = any Life-like rule
+    batch: bool = False
+    calibration_sizes: tuple = (64, 128, 256)   # Grid sides timed by calibrate_engine()
+    description: str = ""
+
+    def supports(self, boundary="wrap", rule=DEFAULT_RULE, batch=False):
+        """True if the engine implements this boundary, rule and (for batch=True) stacks of grids."""
+        return (boundary in self.boundaries
+                and (self.rules is None or normalize_rule(rule) in self.rules)
+                and (self.batch or not batch))
+
+    def check(self, boundary="wrap", rule=DEFAULT_RULE, batch=False):
+        """Raises ValueError if the engine does not support the request."""
+        if not self.supports(boundary, rule, batch):
+            raise ValueError(
+                f"Engine '{self.name}' does not support boundary='{boundary}', rule='{rule}'"
+                + (", batch" if batch else "") + f". Supported: {describe(self)}.")
+
+    def step(self, cells, boundary="wrap", rule=DEFAULT_RULE):
+        """Computes the next generation of a grid (or of a stack of grids for batch engines)."""
+        cells = np.asarray(cells)
+        self.check(boundary, rule, batch=cells.ndim > 2)
+        return self.fn(cells, boundary, normalize_rule(rule))
+
+    def stepper(self, boundary="wrap", rule=DEFAULT_RULE):
+        """Returns a function grid -> next grid (for FrameProducer, CycleReplay, export...)."""
+        self.check(boundary, rule)
+        return partial(self.fn, boundary=boundary, rule=normalize_rule(rule))
+
+
+def describe(engine):
+    """One-line summary of the capabilities of an engine."""
+    rules = "any Life-like rule" if engine.rules is None else ", ".join(sorted(engine.rules))
+    return (f"boundaries {', '.join(sorted(engine.boundaries))}; rules {rules}; "
+            f"batch {'yes' if engine.batch else 'no'}")
+
+
+def _reference_step(cells, boundary, rule):
+    """evolution.newgen: cell by cell, kept as the ground truth of the other engines."""
+    return evo.newgen(cells)
+
+
+def _rule_table(rule):
+    """Lookup table of the next state, indexed by neighbors + 9 * alive (18 entries)."""
+    birth, survive = parse_rule(rule)
+    table = np.zeros(18, dtype=bool)
+    table[list(birth)] = True
+    table[[9 + n for n in survive]] = True
+    return table
+
+
+def _numpy_step(cells, boundary="wrap", rule=DEFAULT_RULE):
+    """
+    Vectorized step: the 8-neighbor sums are built from shifted views of the padded grid
+    (3 horizontal additions, then 3 vertical ones), in uint8. Works on the last two axes,
+    so a stack of grids is stepped in one call.
+    """
+    if cells.dtype != bool:
+        cells = cells.astype(bool)
+    if cells.shape[-1] == 0 or cells.shape[-2] == 0:
+        return cells.copy()
+
+    # 1. Pad the two grid axes by one cell: copies of the opposite edge, or dead cells
+    pad = [(0, 0)] * (cells.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(cells, pad, mode="wrap" if boundary == "wrap" else "constant").view(np.uint8)
+
+    # 2. Sum of the 3 x 3 neighborhood, minus the cell itself
+    rows = padded[..., :, :-2] + padded[..., :, 1:-1] + padded[..., :, 2:]
+    neighbors = rows[..., :-2, :] + rows[..., 1:-1, :] + rows[..., 2:, :]
+    neighbors -= cells.view(np.uint8)
+
+    # 3. Next state (Conway's rule without the lookup table)
+    if rule == DEFAULT_RULE:
+        return (neighbors == 3) | (cells & (neighbors == 2))
+    neighbors += cells.view(np.uint8) * np.uint8(9)
+    return _rule_table(rule)[neighbors]
+
+
+_REGISTRY = {}
+
+
+def register(engine):
+    """Adds (or replaces) an engine in the registry. Returns the engine."""
+    if engine.name == AUTO:
+        raise ValueError(f"'{AUTO}' is reserved for the automatic selection.")
+    _REGISTRY[engine.name] = engine
+    return engine
+
+
+def available():
+    """Names of the registered engines."""
+    return list(_REGISTRY)
+
+
+def get_engine(name):
+    """Returns a registered engine by name."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine '{name}'. Available: {', '.join(available())}, {AUTO}.") from None
+
+
+register(Engine(
+    name="reference", fn=_reference_step,
+    boundaries=frozenset({"wrap"}), rules=frozenset({DEFAULT_RULE}), batch=False,
+    calibration_sizes=(16, 32, 48),
+    description="evolution.newgen, one cell at a time (ground truth)"))
+
+register(Engine(
+    name="numpy", fn=_numpy_step,
+    boundaries=frozenset(BOUNDARIES), rules=None, batch=True,
+    calibration_sizes=(64, 256, 512),
+    description="vectorized neighbor sums on shifted views"))
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Calibration (cost model of every engine, cached on disk)
+
+def calibration_path():
+    """
+    File of the cached calibration: $GAMEOFLIFE_CACHE_DIR/engines.json, or
+    $XDG_CACHE_HOME/gameoflife/engines.json (default ~/.cache/gameoflife/engines.json).
+    """
+    folder = os.environ.get("GAMEOFLIFE_CACHE_DIR")
+    if not folder:
+        cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        folder = os.path.join(cache, "gameoflife")
+    return os.path.join(folder, CALIBRATION_FILENAME)
+
+
+def _machine_key():
+    """The calibration is only reused on the same machine and software versions."""
+    return f"{platform.node()}|{platform.machine()}|{sys.version.split()[0]}|numpy {np.__version__}"
+
+
+def _time_step(engine, grid):
+    """Best time of one step over CALIBRATION_REPEAT calls (after a warm-up call)."""
+    engine.fn(grid, "wrap", DEFAULT_RULE)
+    best = float("inf")
+    for _ in range(CALIBRATION_REPEAT):
+        t0 = time.perf_counter()
+        engine.fn(grid, "wrap", DEFAULT_RULE)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def calibrate_engine(engine, seed=0):
+    """
+    Fits the cost of one step of an engine: seconds = per_step + per_cell * cells + per_alive * alive.
+    Also measures its setup cost (first call on a new grid, minus the steady-state cost).
+
+    Returns:
+        dict: {"setup", "per_step", "per_cell", "per_alive"} in seconds (non-negative).
+    """
+    rng = np.random.default_rng(seed)
+    samples, times = [], []
+    first = None
+    for size in engine.calibration_sizes:
+        for density in CALIBRATION_DENSITIES:
+            grid = rng.random((size, size)) < density
+            if first is None:
+                t0 = time.perf_counter()
+                engine.fn(grid, "wrap", DEFAULT_RULE)
+                first = time.perf_counter() - t0
+            samples.append((1.0, grid.size, np.count_nonzero(grid)))
+            times.append(_time_step(engine, grid))
+
+    coefs, *_ = np.linalg.lstsq(np.array(samples, dtype=float), np.array(times), rcond=None)
+    per_step, per_cell, per_alive = np.maximum(coefs, 0.0)
+    smallest = samples[0]
+    steady = per_step + per_cell * smallest[1] + per_alive * smallest[2]
+    return {"setup": float(max(0.0, first - steady)), "per_step": float(per_step),
+            "per_cell": float(per_cell), "per_alive": float(per_alive)}
+
+
+_CALIBRATION = None     # Loaded (or measured) once per process
+
+
+def load_calibration(recalibrate=False, save=True):
+    """
+    Returns the cost models of the registered engines: read from the cache file when it
+    matches this machine and covers every engine, measured (a second or two) otherwise.
+
+    Args:
+        recalibrate (bool): Ignore the cache and measure again.
+        save (bool): Write the measurements to the cache file (errors are ignored).
+    Returns:
+        dict: engine name -> cost model (see calibrate_engine).
+    """
+    global _CALIBRATION
+    names = set(available())
+    if not recalibrate and _CALIBRATION is not None and names <= set(_CALIBRATION):
+        return _CALIBRATION
+
+    path = calibration_path()
+    models = {}
+    if not recalibrate:
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            if cached.get("version") == CALIBRATION_VERSION and cached.get("machine") == _machine_key():
+                models = cached.get("engines", {})
+        except (OSError, ValueError):
+            pass
+
+    missing = [name for name in available() if name not in models]
+    for name in missing:
+        models[name] = calibrate_engine(get_engine(name))
+    if missing and save:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"version": CALIBRATION_VERSION, "machine": _machine_key(),
+                           "engines": models}, f, indent=2)
+        except OSError:
+            pass    # Read-only home: the calibration is kept for this process only
+
+    _CALIBRATION = models
+    return models
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Automatic selection
+
+def estimate_seconds(model, cells, density, horizon):
+    """Predicted time of `horizon` steps on `cells` cells at the given live-cell density."""
+    per_step = model["per_step"] + model["per_cell"] * cells + model["per_alive"] * cells * density
+    return model["setup"] + horizon * per_step
+
+
+def select_engine(shape, density=0.5, horizon=1, boundary="wrap", rule=DEFAULT_RULE, batch=False):
+    """
+    Picks the engine with the lowest predicted time among those supporting the request.
+
+    Args:
+        shape (tuple): Shape of the grid (or of the stack of grids).
+        density (float): Fraction of live cells.
+        horizon (int): Number of steps that will be computed.
+        boundary (str): "wrap" or "dead".
+        rule (str): Life-like rule.
+        batch (bool): A stack of grids will be stepped in one call.
+    Returns:
+        Engine
+    """
+    candidates = [engine for engine in _REGISTRY.values() if engine.supports(boundary, rule, batch)]
+    if not candidates:
+        raise ValueError(f"No engine supports boundary='{boundary}', rule='{rule}'"
+                         + (", batch" if batch else "") + ".")
+    if len(candidates) == 1:
+        return candidates[0]     # Nothing to compare, no calibration needed
+
+    models = load_calibration()
+    cells = int(np.prod(shape))
+    return min(candidates, key=lambda engine: estimate_seconds(models[engine.name], cells,
+                                                               density, max(1, horizon)))
+
+
+def resolve(engine=DEFAULT_ENGINE, grid=None, horizon=1, boundary="wrap", rule=DEFAULT_RULE, batch=False):
+    """
+    Returns the Engine for an `engine` argument of the public entry points:
+    an Engine instance, a registered name, or "auto" (chosen for `grid` and `horizon`).
+    """
+    if isinstance(engine, Engine):
+        engine.check(boundary, rule, batch)
+        return engine
+    if engine != AUTO:
+        chosen = get_engine(engine)
+        chosen.check(boundary, rule, batch)
+        return chosen
+    if grid is None:
+        shape, density = (256, 256), 0.5
+    else:
+        grid = np.asarray(grid)
+        shape = grid.shape
+        density = np.count_nonzero(grid) / grid.size if grid.size else 0.0
+    return select_engine(shape, density, horizon, boundary, rule, batch)
+
+
+def make_step(engine=DEFAULT_ENGINE, grid=None, horizon=1, boundary="wrap", rule=DEFAULT_RULE):
+    """
+    Shortcut for resolve(...).stepper(boundary, rule): a function grid -> next grid.
+    Its calls are timed as the "evolution.step" stage when profiling is enabled (see gameoflife.profiling).
+    """
+    stepper = resolve(engine, grid, horizon, boundary, rule).stepper(boundary, rule)
+    return profiling.wrap(stepper, "evolution.step")
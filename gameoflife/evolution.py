@@ -46,17 +46,39 @@ def newgen(cells: npt.NDArray[np.bool_]):
 
     return newgen
 
-def evolution(genzero: npt.NDArray[np.bool_], timesteps: int):
+def evolution(genzero: npt.NDArray[np.bool_], timesteps: int, engine="numpy", progress=None, lazy=False):
+    """
+    Computes the generations 0..timesteps starting from genzero.
+    engine: name of a registered engine (see gameoflife.engines), an Engine, or "auto"
+    to pick the fastest one for this grid and number of steps (calibrates the engines on first
+    use and caches the result on disk). Every engine gives the same grids.
+    progress: optional function (generation, state) called after every step (it may raise to abort).
+    lazy: return a gameoflife.timeline.Timeline instead of a list: same indexing and iteration,
+    but the generations are computed on demand and only checkpoints and a cache are kept.
+    """
 
     # Anti bug checks
     if not isinstance(timesteps, int):
         raise TypeError(f"timesteps must be an integer, got {type(timesteps).__name__}.")
     if timesteps < 0:
         raise ValueError("timesteps cannot be negative.")
+    if genzero.ndim != 2:
+        raise ValueError(f"Input array must be 2D, but got {genzero.ndim}D.")
     if genzero.dtype != bool:
         warnings.warn("Input array has non-boolean values. It will be interpreted")
         genzero = genzero.astype(bool)
     
+    # Chooses how to compute one step (imported here: engines itself imports this module)
+    try:
+        from . import engines
+        from . import timeline as tl
+    except ImportError:     # Module used outside the package (e.g. "import evolution")
+        import engines
+        import timeline as tl
+    if lazy:
+        return tl.Timeline(genzero, timesteps, engine=engine, progress=progress)
+    step = engines.make_step(engine, genzero, horizon=timesteps)
+
     # Creates a list containing the configurations for each timestep in the evolution
     timeline = []
     
@@ -67,11 +89,14 @@ def evolution(genzero: npt.NDArray[np.bool_], timesteps: int):
     # Calculates the configuration for each timestep
     for t in range(timesteps):
         # ERROR FIX: We must use 'current_state' as input, not 'genzero' repeatedly
-        new = newgen(cells=current_state)
+        new = step(current_state)
         
         # Update the current state for the next iteration
         current_state = new
         
         timeline.append(new)
+
+        if progress is not None:
+            progress(t + 1, new)
     
     return timeline
@@ -0,0 +1,300 @@
+"""
+Streaming animation export (GIF / MP4) without matplotlib.
+
+Generations are turned into palette-indexed uint8 frames with array operations
+(see gameoflife.raster) and written one at a time, so the memory used does not grow
+with the number of frames:
+    - GIF: encoded with Pillow, frame by frame, with a single global palette;
+    - MP4 (or any other format ffmpeg knows): raw RGB frames piped to an ffmpeg process.
+
+Usage:
+    export_animation(grid, "gifs/glider.gif", frames=50, fps=5, cell_size=10)
+
+    with GifWriter("run.gif", shape=(rows, cols), fps=10) as writer:
+        for state in timeline:
+            writer.write(state)
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+
+import numpy as np
+
+try:
+    from . import engines
+    from . import evolution as evo
+    from . import raster
+except ImportError:     # Module used outside the package (e.g. "import export")
+    import engines
+    import evolution as evo
+    import raster
+
+
+# Same colors as visualization.COLORS, as RGB tuples (0-255)
+DEFAULT_COLORS = {
+    "Alive" : (255, 255, 255),
+    "Dead"  : (0, 0, 0),
+    "Grid"  : (0x50, 0x50, 0x50),
+}
+
+GRID_LINES_MIN_CELL = 4     # Smaller cells are drawn without grid lines by default
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Frame rendering
+
+def make_palette(colors=None):
+    """Returns the 256 x 3 palette (raster index convention) for a {"Alive", "Dead", "Grid"} color dict."""
+    colors = {**DEFAULT_COLORS, **(colors or {})}
+    return raster.make_palette(colors["Dead"], colors["Alive"], colors["Grid"])
+
+
+def frame_shape(shape, cell_size=1, grid_lines=False, block=1):
+    """Pixel size (height, width) of the frames rendered from a grid of the given shape."""
+    rows, cols = shape[0] // block, shape[1] // block
+    extra = 1 if grid_lines else 0
+    return rows * cell_size + extra, cols * cell_size + extra
+
+
+def render_frame(grid, cell_size=1, grid_lines=False, block=1):
+    """
+    Renders one generation as a uint8 image of palette indices.
+
+    Args:
+        grid (np.ndarray): 2D array of the generation (boolean or 0/1).
+        cell_size (int): Pixels per cell (integer upscaling).
+        grid_lines (bool): Draw one-pixel lines between the cells.
+        block (int): Cells per pixel (> 1 to downsample very large grids, shown as density shades).
+    Returns:
+        np.ndarray: uint8 array of shape frame_shape(grid.shape, cell_size, grid_lines, block).
+    """
+    indices = raster.cells_to_indices(np.asarray(grid, dtype=bool), block=block)
+    return raster.upscale(indices, cell_size, grid_lines=grid_lines)
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Writers
+
+class FrameWriter:
+    """
+    Base class of the streaming writers: renders every generation passed to write()
+    and hands the frame to _write_frame(). Usable as a context manager.
+    """
+
+    def __init__(self, path, shape, fps=5, cell_size=1, grid_lines=None, block=1, colors=None):
+        """
+        Args:
+            path (str): Output file.
+            shape (tuple): (rows, cols) of the generations that will be written.
+            fps (float): Frames per second of the animation.
+            cell_size (int): Pixels per cell.
+            grid_lines (bool | None): Draw grid lines. None = only if cell_size >= GRID_LINES_MIN_CELL.
+            block (int): Cells per pixel (downsampling).
+            colors (dict | None): Overrides of DEFAULT_COLORS.
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive.")
+        if cell_size < 1 or block < 1:
+            raise ValueError("cell_size and block must be positive integers.")
+        if grid_lines is None:
+            grid_lines = block == 1 and cell_size >= GRID_LINES_MIN_CELL
+        self.path = path
+        self.shape = tuple(shape)
+        self.fps = fps
+        self.cell_size = int(cell_size)
+        self.grid_lines = bool(grid_lines)
+        self.block = int(block)
+        self.palette = make_palette(colors)
+        self.size = frame_shape(self.shape, self.cell_size, self.grid_lines, self.block)
+        self.frames = 0
+        self._closed = False
+
+    def write(self, grid):
+        """Renders and writes one generation."""
+        if self._closed:
+            raise ValueError("Writer is closed.")
+        if grid.shape != self.shape:
+            raise ValueError(f"Expected a grid of shape {self.shape}, got {grid.shape}.")
+        self._write_frame(render_frame(grid, self.cell_size, self.grid_lines, self.block))
+        self.frames += 1
+
+    def close(self):
+        """Finishes the file. Called automatically when used as a context manager."""
+        if not self._closed:
+            self._closed = True
+            self._finish()
+
+    def _write_frame(self, pixels):
+        raise NotImplementedError
+
+    def _finish(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class GifWriter(FrameWriter):
+    """
+    Animated GIF writer. The header (global palette, loop) is written once and every frame
+    is LZW-encoded by Pillow and appended to the file immediately.
+    """
+
+    def __init__(self, path, shape, fps=5, loop=0, **kwargs):
+        """
+        Args:
+            loop (int | None): Number of loops (0 = forever, None = play once).
+            Other arguments: see FrameWriter.
+        """
+        super().__init__(path, shape, fps=fps, **kwargs)
+        from PIL import GifImagePlugin, Image     # Optional dependency, only needed for GIFs
+        self._Image = Image
+        self._gif = GifImagePlugin
+        self.loop = loop
+        self.duration = max(10, int(round(1000 / fps)))     # GIF delays are in 1/100 s
+        self._file = open(path, "wb")
+
+    def _image(self, pixels):
+        im = self._Image.frombuffer(
+            "P", (pixels.shape[1], pixels.shape[0]), np.ascontiguousarray(pixels), "raw", "P", 0, 1)
+        im.putpalette(self.palette.tobytes())
+        return im
+
+    def _write_frame(self, pixels):
+        im = self._image(pixels)
+        if self.frames == 0:
+            info = {"duration": self.duration, "optimize": False}
+            if self.loop is not None:
+                info["loop"] = self.loop
+            header, _ = self._gif.getheader(im, self.palette.tobytes(), info)
+            self._file.write(b"".join(header))
+        chunks = self._gif.getdata(im, (0, 0), duration=self.duration)
+        self._file.writelines(chunks)
+        # The list belongs to a class created by getdata (a reference cycle, freed only by
+        # the garbage collector): empty it so that memory does not grow with the frames
+        chunks.clear()
+
+    def _finish(self):
+        try:
+            if self.frames:
+                self._file.write(b";")      # GIF trailer
+        finally:
+            self._file.close()
+
+
+class FfmpegWriter(FrameWriter):
+    """
+    Video writer piping raw RGB frames to an ffmpeg subprocess (MP4 / H.264 by default).
+    Frame sizes are padded to even numbers, as required by the yuv420p pixel format.
+    """
+
+    def __init__(self, path, shape, fps=5, codec="libx264", ffmpeg="ffmpeg", extra_args=(), **kwargs):
+        """
+        Args:
+            codec (str): Video codec passed to ffmpeg (-c:v).
+            ffmpeg (str): ffmpeg executable.
+            extra_args (Sequence[str]): Additional output options (e.g. ("-crf", "18")).
+            Other arguments: see FrameWriter.
+        """
+        super().__init__(path, shape, fps=fps, **kwargs)
+        executable = shutil.which(ffmpeg)
+        if executable is None:
+            raise FileNotFoundError(f"'{ffmpeg}' not found: install ffmpeg or export to GIF instead.")
+        height, width = self.size
+        self.padded = (height + height % 2, width + width % 2)
+        command = [executable, "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24",
+                   "-s", f"{self.padded[1]}x{self.padded[0]}", "-r", str(fps), "-i", "-",
+                   "-an", "-c:v", codec, "-pix_fmt", "yuv420p", *extra_args, path]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def _write_frame(self, pixels):
+        if pixels.shape != self.padded:
+            pixels = np.pad(pixels, ((0, self.padded[0] - pixels.shape[0]),
+                                     (0, self.padded[1] - pixels.shape[1])), mode="edge")
+        try:
+            self._process.stdin.write(self.palette[pixels].tobytes())
+        except BrokenPipeError:
+            self._finish()      # Raises with ffmpeg's error message
+
+    def _finish(self):
+        if self._process.stdin and not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        stderr = self._process.stderr.read().decode(errors="replace")
+        self._process.stderr.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.strip()}")
+
+
+def open_writer(path, shape, **kwargs):
+    """Returns a GifWriter for .gif files and an FfmpegWriter for anything else."""
+    if os.path.splitext(path)[1].lower() == ".gif":
+        return GifWriter(path, shape, **kwargs)
+    return FfmpegWriter(path, shape, **kwargs)
+
+
+# =======================================================================================
+# =======================================================================================
+
+# High-level export
+
+def iter_generations(grid, frames, step=evo.newgen):
+    """Yields `frames` generations starting from `grid` (included), computed one at a time."""
+    for i in range(frames):
+        yield grid
+        if i < frames - 1:
+            grid = step(grid)
+
+
+def export_animation(source, path, frames=None, fps=5, step=None, engine=engines.DEFAULT_ENGINE, **kwargs):
+    """
+    Writes an animation of a run to a GIF or video file, one frame at a time.
+
+    Args:
+        source (np.ndarray | Iterable[np.ndarray]): Initial grid (generations are computed
+                                                    with `step`), or the generations themselves
+                                                    (e.g. the list returned by evolution.evolution).
+        path (str): Output file (.gif -> Pillow, anything else -> ffmpeg).
+        frames (int | None): Number of frames. Required when `source` is a single grid;
+                             with a sequence of generations, None writes all of them.
+        fps (float): Frames per second.
+        step (callable | None): Function grid -> next grid, used when `source` is a single grid.
+                                None = one step of `engine`.
+        engine (str): Evolution engine used when no step is given (see gameoflife.engines).
+        **kwargs: cell_size, grid_lines, block, colors, and writer options (see GifWriter, FfmpegWriter).
+    Returns:
+        int: Number of frames written.
+    """
+    if isinstance(source, np.ndarray) and source.ndim == 2:
+        if frames is None:
+            raise ValueError("frames is required when exporting from an initial grid.")
+        if step is None:
+            step = engines.make_step(engine, source, horizon=frames)
+        generations = iter_generations(source, frames, step)
+        shape = source.shape
+    else:
+        generations = iter(source)
+        if frames is not None:
+            generations = (g for _, g in zip(range(frames), generations))
+        first = next(generations, None)
+        if first is None:
+            raise ValueError("No generations to export.")
+        shape = first.shape
+        generations = itertools.chain([first], generations)
+
+    with open_writer(path, shape, fps=fps, **kwargs) as writer:
+        for grid in generations:
+            writer.write(grid)
+    return writer.frames
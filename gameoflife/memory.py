@@ -0,0 +1,281 @@
+"""
+Memory governor: keeps every experiment of analysis.py under a memory budget.
+
+Before a run, the memory of every timeline representation is projected from the grid size
+and the number of steps, and the richest one that fits the budget is chosen:
+    - "frames": every generation kept as a boolean array (no recomputation, 1 byte per cell);
+    - "packed": every generation bit-packed (8 times smaller, unpacked when read);
+    - "deltas": every generation as a zlib-compressed XOR with the previous one (usually much
+      smaller again, since few cells change per step);
+    - "stream": only sparse checkpoints and a small cache are kept; the metrics are computed
+      while the generations are streamed, and every further pass recomputes them.
+The representations are storages of gameoflife.timeline.Timeline. During the run the real
+size of the timeline is extrapolated every CHECK_EVERY generations; when it would exceed the
+budget (e.g. deltas compress worse than assumed), the timeline is compacted to the next
+representation on the fly. When even "stream" does not fit, the run goes on but a
+ResourceWarning is issued and the record is flagged "over_budget".
+
+Usage is measured with the RSS of the process (sampled) and, optionally, tracemalloc (exact
+peak of the Python and numpy allocations, but it slows allocations down). The record returned
+by finish() goes into the results and the report.
+
+Usage:
+    governor = MemoryGovernor(budget="2G")
+    timeline = Timeline(grid, steps, **governor.plan(grid.shape, steps))
+    governor.start()
+    for t, state in enumerate(timeline):
+        ...
+        governor.watch(t, timeline)
+    record = governor.finish(timeline)
+"""
+
+import math
+import os
+import re
+import tracemalloc
+import warnings
+
+try:
+    from . import timeline as tl
+except ImportError:     # Module used outside the package (e.g. "import memory")
+    import timeline as tl
+
+try:
+    import psutil
+except ImportError:     # Optional: only needed where /proc is missing (e.g. macOS, Windows)
+    psutil = None
+
+
+STRATEGIES = ("frames", "packed", "deltas", "stream")
+CHECK_EVERY = 64                    # Generations between two measurements
+MIN_CHECKPOINTS = 32                # Delta (or plain) checkpoints stored before the size is extrapolated
+DELTA_RATIO = 0.5                   # Assumed size of a compressed delta / packed frame (measured afterwards)
+SMALL_CACHE_BYTES = 8 * 2**20       # Cache of the cheaper representations (scrubbing, reverse passes)
+METRIC_BYTES_PER_STEP = 6 * 40      # Six per-step Python lists of numpy scalars (pointer + object)
+WORKING_BYTES_PER_CELL = 24         # int heatmap, its per-step increment and the step temporaries
+STREAM_CHECKPOINT_EVERY = 32        # Smallest distance between the checkpoints of "stream"
+FALLBACK_BUDGET = 2**30             # When the physical memory cannot be read
+
+_UNITS = {"": 1, "B": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Sizes and measurements
+
+def parse_size(value):
+    """Bytes of a size given as a number or a string like "512M", "1.5G", "2GiB"."""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else int(value)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)(?:I?B)?\s*", value.upper())
+    if match is None:
+        raise ValueError(f"Invalid size '{value}' (expected e.g. 512M, 2G).")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def format_size(n):
+    """Human-readable size, e.g. 1.5 GB."""
+    if n is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def default_budget():
+    """A quarter of the physical memory."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 4
+    except (AttributeError, ValueError, OSError):
+        if psutil is not None:
+            return psutil.virtual_memory().total // 4
+        return FALLBACK_BUDGET
+
+
+def rss_bytes():
+    """Current resident memory of this process, or None if it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Projections
+
+def fixed_bytes(shape, steps):
+    """Memory of a run that does not depend on the representation (metrics lists, heatmap, temporaries)."""
+    rows, cols = shape
+    return (steps + 1) * METRIC_BYTES_PER_STEP + rows * cols * WORKING_BYTES_PER_CELL
+
+
+def stream_interval(shape, steps, budget):
+    """Checkpoint distance of "stream": a power of two such that the checkpoints use at most 1/4 of the budget."""
+    packed = math.ceil(shape[0] * shape[1] / 8)
+    k = STREAM_CHECKPOINT_EVERY
+    while packed * (steps // k + 1) > budget // 4 and k < steps:
+        k *= 2
+    return k
+
+
+def _cache_bytes(budget):
+    return min(SMALL_CACHE_BYTES, budget // 8)
+
+
+def project(strategy, shape, steps, budget, delta_ratio=DELTA_RATIO):
+    """Projected bytes of a run with this representation (timeline + fixed part)."""
+    cells = shape[0] * shape[1]
+    frames = steps + 1
+    packed = math.ceil(cells / 8)
+    if strategy == "frames":
+        store = frames * cells
+    elif strategy == "packed":
+        store = frames * packed + _cache_bytes(budget)
+    elif strategy == "deltas":
+        store = frames * packed * delta_ratio + _cache_bytes(budget)
+    elif strategy == "stream":
+        store = (steps // stream_interval(shape, steps, budget) + 1) * packed + _cache_bytes(budget)
+    else:
+        raise ValueError(f"Unknown strategy '{strategy}'. Available: {', '.join(STRATEGIES)}.")
+    return int(store) + fixed_bytes(shape, steps)
+
+
+def extrapolate(info, checkpoint_every, steps):
+    """
+    Bytes of the checkpoints at the end of the run, extrapolated from the ones stored so far
+    (Timeline.cache_info()). The keyframes of "deltas" are whole grids: they are projected with
+    their own mean size, and only the other checkpoints give the per-checkpoint rate.
+    """
+    total = steps // checkpoint_every + 1
+    keyframes = steps // (checkpoint_every * tl.KEYFRAME_EVERY) + 1 if info["storage"] == "deltas" else 0
+    keyframe_size = info["keyframe_bytes"] / info["keyframes"] if info["keyframes"] else 0
+    rate = (info["checkpoint_bytes"] - info["keyframe_bytes"]) / (info["checkpoints"] - info["keyframes"])
+    return int(keyframes * keyframe_size + (total - keyframes) * rate)
+
+
+def timeline_options(strategy, shape, steps, budget):
+    """Keyword arguments of gameoflife.timeline.Timeline (or Timeline.compact) for a representation."""
+    if strategy == "frames":
+        return {"storage": "frames", "checkpoint_every": 1, "cache_bytes": 0}
+    cache = _cache_bytes(budget)
+    if strategy in ("packed", "deltas"):
+        return {"storage": strategy, "checkpoint_every": 1, "cache_bytes": cache}
+    return {"storage": "packed", "checkpoint_every": stream_interval(shape, steps, budget), "cache_bytes": cache}
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Governor
+
+class MemoryGovernor:
+    """Chooses and, if needed, degrades the timeline representation of one run (see module docstring)."""
+
+    def __init__(self, budget=None, trace=False):
+        """
+        Args:
+            budget (int | str | None): Bytes allowed per experiment ("2G" works), None = default_budget().
+            trace (bool): Also measure the exact allocation peak with tracemalloc (slower).
+        """
+        self.budget = parse_size(budget) if budget is not None else default_budget()
+        if self.budget <= 0:
+            raise ValueError("The memory budget must be positive.")
+        self.trace = trace
+        self.strategy = None
+        self.history = []           # Strategies used, in order (more than one if degraded)
+        self.projected = None
+        self.peak_rss = None
+        self._shape = None
+        self._steps = None
+        self._rss_start = None
+        self._started_tracing = False
+
+    def plan(self, shape, steps):
+        """Chooses the richest representation that fits. Returns the Timeline options."""
+        self._shape, self._steps = tuple(shape), steps
+        for strategy in STRATEGIES:
+            self.projected = project(strategy, self._shape, steps, self.budget)
+            if self.projected <= self.budget:
+                break
+        self.strategy = strategy
+        self.history = [strategy]
+        self._warn_if_over_budget()
+        return timeline_options(strategy, self._shape, steps, self.budget)
+
+    def _warn_if_over_budget(self):
+        if self.projected > self.budget:
+            warnings.warn(f"Projected memory {format_size(self.projected)} exceeds the budget "
+                          f"{format_size(self.budget)} even with the '{self.strategy}' timeline.",
+                          ResourceWarning, stacklevel=3)
+
+    def start(self):
+        """Starts the measurements (RSS, and tracemalloc if requested)."""
+        self._rss_start = rss_bytes()
+        self.peak_rss = self._rss_start
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+    def _sample(self):
+        rss = rss_bytes()
+        if rss is not None:
+            self.peak_rss = rss if self.peak_rss is None else max(self.peak_rss, rss)
+
+    def watch(self, generation, timeline):
+        """
+        Called once per generation of the metrics loop: every CHECK_EVERY generations, samples
+        the RSS and extrapolates the timeline size to the end of the run (once MIN_CHECKPOINTS
+        checkpoints give a rate). If the projection exceeds the budget, compacts the timeline to
+        the next representations until it fits.
+        """
+        if generation == 0 or generation % CHECK_EVERY:
+            return
+        self._sample()
+        while self.strategy != "stream":
+            # Checkpoints grow with the generations computed, the cache is bounded by its budget
+            info = timeline.cache_info()
+            if info["checkpoints"] - info["keyframes"] < MIN_CHECKPOINTS:
+                return
+            store = extrapolate(info, timeline.checkpoint_every, self._steps) + timeline.cache_bytes
+            self.projected = store + fixed_bytes(self._shape, self._steps)
+            if self.projected <= self.budget:
+                return
+            self.strategy = STRATEGIES[STRATEGIES.index(self.strategy) + 1]
+            self.history.append(self.strategy)
+            timeline.compact(**timeline_options(self.strategy, self._shape, self._steps, self.budget))
+            if self.strategy == "stream":
+                self.projected = project("stream", self._shape, self._steps, self.budget)
+                self._warn_if_over_budget()
+
+    def finish(self, timeline=None):
+        """Stops the measurements. Returns the record of the run (dict, JSON-friendly)."""
+        self._sample()
+        peak_traced = None
+        if self.trace and tracemalloc.is_tracing():
+            peak_traced = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        return {
+            "strategy": self.strategy,
+            "history": list(self.history),
+            "budget": self.budget,
+            "projected": self.projected,
+            "over_budget": self.projected is not None and self.projected > self.budget,
+            "timeline_bytes": None if timeline is None else timeline.nbytes,
+            "peak_traced": peak_traced,
+            "peak_rss": self.peak_rss,
+            "rss_growth": (None if self.peak_rss is None or self._rss_start is None
+                           else self.peak_rss - self._rss_start),
+        }
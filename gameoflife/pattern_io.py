@@ -0,0 +1,413 @@
+"""
+Readers and writers for the standard Game of Life pattern formats,
+plus the on-disk index of the pattern library.
+
+Supported formats:
+    - RLE (.rle)                 run-length encoded, e.g. "bo$2bo$3o!"
+    - Plaintext (.cells)         '.' for dead cells, 'O' for live cells, '!' comments
+    - Life 1.06 (.lif, .life)    one "x y" coordinate pair per live cell
+
+Usage:
+    import gameoflife.pattern_io as pio
+    pattern = pio.load_pattern("library/Spaceship/mwss.rle")        # 2D uint8 array
+    pio.save_pattern(pattern, "mwss.cells", name="MWSS")
+
+    # Decode an RLE file straight into an existing (boolean or bit-packed) world
+    pio.decode_rle(open("big.rle"), out=world, origin=(100, 100))
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+
+# Default folder of the pattern library (one subfolder per category)
+LIBRARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "library")
+INDEX_FILENAME = "index.npy"
+
+PATTERN_EXTENSIONS = (".rle", ".cells", ".lif", ".life")
+
+# Record layout of the library index (fixed size, so the file can be memory-mapped)
+INDEX_DTYPE = np.dtype([
+    ("category", "U32"),
+    ("name", "U64"),
+    ("path", "U128"),       # Relative to the library folder
+    ("rows", np.int32),     # Bounding box
+    ("cols", np.int32),
+    ("hash", "S16"),        # blake2b digest of the file content
+    ("mtime", np.float64),
+])
+
+
+# =======================================================================================
+# =======================================================================================
+
+# RLE format
+
+_RLE_HEADER = re.compile(r"x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?", re.IGNORECASE)
+_RLE_TOKEN = re.compile(r"(\d*)([A-Za-z.$!])")
+
+
+def read_rle_header(lines):
+    """
+    Reads the comment lines and the header line of an RLE file.
+
+    Args:
+        lines (Iterator[str]): Lines of the file. Consumed up to and including the header.
+    Returns:
+        dict: {"name", "comments", "rows", "cols", "rule"}.
+    """
+    info = {"name": None, "comments": [], "rows": 0, "cols": 0, "rule": "B3/S23"}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if line[:2] in ("#N", "#n"):
+                info["name"] = line[2:].strip()
+            else:
+                info["comments"].append(line[2:].strip())
+            continue
+
+        match = _RLE_HEADER.match(line)
+        if match is None:
+            raise ValueError(f"Invalid RLE header line: '{line}'")
+        info["cols"], info["rows"] = int(match.group(1)), int(match.group(2))
+        if match.group(3):
+            info["rule"] = match.group(3)
+        return info
+
+    raise ValueError("RLE header not found.")
+
+
+def _set_packed_bits(row_bytes, start, length):
+    """Sets `length` bits starting at bit `start` of a packed row (most significant bit first)."""
+    end = start + length - 1
+    first, last = start // 8, end // 8
+    first_mask = 0xFF >> (start % 8)
+    last_mask = (0xFF << (7 - end % 8)) & 0xFF
+    if first == last:
+        row_bytes[first] |= first_mask & last_mask
+    else:
+        row_bytes[first] |= first_mask
+        row_bytes[first + 1:last] = 0xFF
+        row_bytes[last] |= last_mask
+
+
+def _fill_run(out, row, col, length, n_cols, packed):
+    """
+    Sets `length` consecutive live cells starting at (row, col), wrapping around the edges.
+    `out` is either a 2D boolean/numeric grid or a bit-packed grid (np.packbits layout, axis=1)
+    whose logical width is `n_cols`.
+    """
+    row %= out.shape[0]
+    while length > 0:
+        col %= n_cols
+        span = min(length, n_cols - col)
+        if packed:
+            _set_packed_bits(out[row], col, span)
+        else:
+            out[row, col:col + span] = 1
+        col += span
+        length -= span
+
+
+def decode_rle(lines, out=None, origin=(0, 0), packed=False, width=None):
+    """
+    Streaming RLE decoder: live-cell runs are written directly into `out`,
+    without building the intermediate pattern.
+
+    Args:
+        lines (Iterable[str]): Lines of the RLE file (an open file works).
+        out (np.ndarray | None): Grid to write into. If None, a uint8 array of the pattern size
+                                 (or its bit-packed version) is allocated.
+        origin (tuple): (row, col) of the top-left corner of the pattern in `out`.
+                        The pattern wraps around the edges of `out` (toroidal logic).
+        packed (bool): True if `out` is bit-packed along the columns (np.packbits, axis=1).
+        width (int | None): Number of columns of a packed `out` (default: all the bits of a row).
+    Returns:
+        np.ndarray: The grid `out` with the pattern added.
+    """
+    lines = iter(lines)
+    info = read_rle_header(lines)
+
+    if out is None:
+        if packed:
+            out = np.zeros((info["rows"], (info["cols"] + 7) // 8), dtype=np.uint8)
+            width = info["cols"]
+        else:
+            out = np.zeros((info["rows"], info["cols"]), dtype=np.uint8)
+    if packed:
+        n_cols = width if width is not None else out.shape[1] * 8
+    else:
+        n_cols = out.shape[1]
+
+    row0, col0 = origin
+    r, c = 0, 0
+    pending = ""                # Run count split across two lines
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        tokens = _RLE_TOKEN.findall(pending + line)
+        if tokens:
+            pending = ""
+        for count, tag in tokens:
+            n = int(count) if count else 1
+            if tag == "!":
+                return out
+            if tag == "$":
+                r += n
+                c = 0
+            elif tag in "b.":
+                c += n
+            else:
+                # Any other letter is a live state (multi-state files use A, B, ...)
+                _fill_run(out, row0 + r, col0 + c, n, n_cols, packed)
+                c += n
+
+        # A trailing number without its tag continues on the next line
+        trailing = re.search(r"(\d+)$", pending + line)
+        if trailing:
+            pending = trailing.group(1)
+
+    return out
+
+
+def read_rle(path):
+    """Reads an RLE file into a 2D uint8 array (1 = alive)."""
+    with open(path) as f:
+        return decode_rle(f)
+
+
+def write_rle(pattern, path, name=None, rule="B3/S23"):
+    """
+    Writes a 2D pattern to an RLE file (lines of at most 70 characters).
+    """
+    pattern = np.asarray(pattern).astype(bool)
+    rows, cols = pattern.shape
+
+    tokens = []
+    newlines = 0
+    for r in range(rows):
+        row = pattern[r]
+        if r > 0:
+            newlines += 1
+        if not row.any():
+            continue
+
+        # Consecutive row ends are merged, e.g. "3$" skips two blank rows
+        if newlines:
+            tokens.append(f"{newlines}$" if newlines > 1 else "$")
+        newlines = 0
+
+        # Run boundaries: positions where the state changes
+        last = np.flatnonzero(row)[-1] + 1          # Trailing dead cells are implicit
+        changes = np.flatnonzero(np.diff(row[:last].astype(np.int8))) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [last]))
+        for start, end in zip(starts, ends):
+            n = end - start
+            tag = "o" if row[start] else "b"
+            tokens.append(f"{n if n > 1 else ''}{tag}")
+    tokens.append("!")
+
+    with open(path, "w") as f:
+        if name:
+            f.write(f"#N {name}\n")
+        f.write(f"x = {cols}, y = {rows}, rule = {rule}\n")
+        line = ""
+        for token in tokens:
+            if len(line) + len(token) > 70:
+                f.write(line + "\n")
+                line = ""
+            line += token
+        f.write(line + "\n")
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Plaintext (.cells) and Life 1.06 formats
+
+def read_plaintext(path):
+    """Reads a plaintext (.cells) file into a 2D uint8 array (1 = alive)."""
+    with open(path) as f:
+        rows = [line.rstrip("\n") for line in f if not line.startswith("!")]
+    while rows and not rows[-1].strip():
+        rows.pop()
+
+    width = max((len(r) for r in rows), default=0)
+    pattern = np.zeros((len(rows), width), dtype=np.uint8)
+    for r, line in enumerate(rows):
+        for c, char in enumerate(line):
+            if char in "O*":
+                pattern[r, c] = 1
+    return pattern
+
+
+def write_plaintext(pattern, path, name=None):
+    """Writes a 2D pattern to a plaintext (.cells) file."""
+    pattern = np.asarray(pattern).astype(bool)
+    with open(path, "w") as f:
+        if name:
+            f.write(f"!Name: {name}\n")
+        for row in pattern:
+            f.write("".join("O" if cell else "." for cell in row) + "\n")
+
+
+def read_life106(path):
+    """
+    Reads a Life 1.06 file into a 2D uint8 array (1 = alive).
+    Coordinates are "x y" (column, row) and may be negative: the pattern is shifted
+    so that its bounding box starts at (0, 0).
+    """
+    coords = np.loadtxt(path, comments="#", dtype=np.int64, ndmin=2)
+    if coords.size == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    coords -= coords.min(axis=0)
+    pattern = np.zeros((coords[:, 1].max() + 1, coords[:, 0].max() + 1), dtype=np.uint8)
+    pattern[coords[:, 1], coords[:, 0]] = 1
+    return pattern
+
+
+def write_life106(pattern, path):
+    """Writes a 2D pattern to a Life 1.06 file."""
+    rows, cols = np.nonzero(np.asarray(pattern))
+    with open(path, "w") as f:
+        f.write("#Life 1.06\n")
+        for r, c in zip(rows, cols):
+            f.write(f"{c} {r}\n")
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Generic entry points
+
+def load_pattern(path):
+    """Reads a pattern file, choosing the format from the extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".rle":
+        return read_rle(path)
+    if ext == ".cells":
+        return read_plaintext(path)
+    if ext in (".lif", ".life"):
+        return read_life106(path)
+    raise ValueError(f"Unknown pattern format: '{ext}'")
+
+
+def save_pattern(pattern, path, name=None):
+    """Writes a pattern file, choosing the format from the extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".rle":
+        write_rle(pattern, path, name=name)
+    elif ext == ".cells":
+        write_plaintext(pattern, path, name=name)
+    elif ext in (".lif", ".life"):
+        write_life106(pattern, path)
+    else:
+        raise ValueError(f"Unknown pattern format: '{ext}'")
+
+
+def _pattern_info(path):
+    """
+    Reads only what the index needs: name and bounding box.
+    For RLE files the header is enough, the cells are never decoded.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if path.lower().endswith(".rle"):
+        with open(path) as f:
+            info = read_rle_header(f)
+        return info["name"] or stem, info["rows"], info["cols"]
+
+    pattern = load_pattern(path)
+    name = stem
+    if path.lower().endswith(".cells"):
+        with open(path) as f:
+            for line in f:
+                if line.startswith("!Name:"):
+                    name = line[len("!Name:"):].strip()
+                    break
+    return name, pattern.shape[0], pattern.shape[1]
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Library index
+
+def _list_pattern_files(directory):
+    """Returns the (category, relative path) of every pattern file, sorted."""
+    files = []
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if not entry.is_dir():
+            continue
+        for sub in sorted(os.scandir(entry.path), key=lambda e: e.name):
+            if sub.is_file() and sub.name.lower().endswith(PATTERN_EXTENSIONS):
+                files.append((entry.name.replace("_", " "), os.path.join(entry.name, sub.name)))
+    return files
+
+
+def build_library_index(directory=LIBRARY_DIR):
+    """
+    Scans the library folder and writes the index file (name, bounding box, category, hash).
+    Categories are the subfolder names, with underscores shown as spaces ("Still_Life" -> "Still Life").
+
+    Returns:
+        np.ndarray: The index as a structured array (INDEX_DTYPE).
+    """
+    return _build_index(directory)[0]
+
+
+def _build_index(directory):
+    """build_library_index, also returning whether the index file could be written."""
+    files = _list_pattern_files(directory)
+    index = np.zeros(len(files), dtype=INDEX_DTYPE)
+    for i, (category, rel_path) in enumerate(files):
+        full_path = os.path.join(directory, rel_path)
+        name, rows, cols = _pattern_info(full_path)
+        with open(full_path, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+        index[i] = (category, name, rel_path, rows, cols, digest, os.path.getmtime(full_path))
+
+    try:
+        np.save(os.path.join(directory, INDEX_FILENAME), index)
+    except OSError:
+        return index, False     # Read-only install: keep the index in memory only
+    return index, True
+
+
+def _index_is_stale(directory, index_path):
+    """True if a pattern file was added, removed, renamed or modified after the index was written."""
+    if not os.path.exists(index_path):
+        return True
+    index_mtime = os.path.getmtime(index_path)
+    files = _list_pattern_files(directory)
+    index = np.load(index_path, mmap_mode="r")
+    if len(index) != len(files):
+        return True
+    # Renames keep the count and the mtime: compare the paths too
+    if sorted(index["path"]) != sorted(rel for _, rel in files):
+        return True
+    return any(os.path.getmtime(os.path.join(directory, rel)) > index_mtime for _, rel in files)
+
+
+def load_library_index(directory=LIBRARY_DIR):
+    """
+    Returns the library index, memory-mapped from disk.
+    The index is built the first time and rebuilt only when the library content changes.
+    """
+    if not os.path.isdir(directory):
+        return np.zeros(0, dtype=INDEX_DTYPE)
+
+    index_path = os.path.join(directory, INDEX_FILENAME)
+    if _index_is_stale(directory, index_path):
+        index, saved = _build_index(directory)
+        if not saved:
+            return index    # The file on disk (if any) is stale: use the fresh index
+    return np.load(index_path, mmap_mode="r")
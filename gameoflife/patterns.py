@@ -4,17 +4,32 @@
 Usage:
     import patterns
     grid = patterns.insert_pattern(grid, "Category", "Name", row, col, rotate=0, flip=False)
+    grid = patterns.insert_patterns(grid, [("Category", "Name", row, col, rotate, flip), ...])
 
 Available Tools:
     - patterns.get_available_categories()
     - patterns.get_patterns_by_category("CategoryName")
+    - patterns.get_pattern("CategoryName", "Name")
+
+Besides the built-in SEED_DATA, patterns are served from the pattern files
+(RLE, .cells, Life 1.06) in gameoflife/library/<Category>/, see pattern_io.
 """
 
 # IMPORTANT : THIS VERSION HAS BEEN MODIFIED FROM THE TINA'S ONE.
 
 
+import os
+from functools import lru_cache
+
 import numpy as np
 
+try:
+    from . import soup
+    from . import pattern_io
+except ImportError:     # Module used outside the package (e.g. "import patterns")
+    import soup
+    import pattern_io
+
 # FOR THE SIMULATION
 
 # =======================================================================================
@@ -58,45 +73,115 @@ def _create_glider_gun():
         gun[r, c] = 1
     return gun
 
-# Nested dictionary storing all patterns by category
-SEED_DATA = {
-    "Still Life": {
-        "Block": np.array([[1, 1], [1, 1]]),
-        "Beehive": np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]]),
-        "Loaf": np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 0]])
-    },
-    "Oscillator": {
-        "Blinker": np.array([[1, 1, 1]]),
-        "Toad": np.array([[0, 0, 1, 0], [1, 0, 0, 1], [1, 0, 0, 1], [0, 1, 0, 0]]),
-        "Pulsar": _create_pulsar(),
-        "Pentadecathlon": _create_pentadecathlon()
-    },
-    "Spaceship": {
-        "Glider": np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]]),
-        "LWSS": np.array([[0, 1, 1, 1, 1], [1, 0, 0, 0, 1], [0, 0, 0, 0, 1], [1, 0, 0, 1, 0]])
-    },
-    "Complex": { 
-        "Glider Gun": _create_glider_gun() 
-    },
-    "Random": {
-        "Random": None      # This is a placeholder for the random pattern
+# Nested dictionary storing all patterns by category.
+# It is built on first use (see __getattr__ below), so importing this module stays cheap.
+
+@lru_cache(maxsize=1)
+def _seed_data():
+    """Builds the SEED_DATA dictionary (once per process)."""
+    return {
+        "Still Life": {
+            "Block": np.array([[1, 1], [1, 1]]),
+            "Beehive": np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]]),
+            "Loaf": np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 0]])
+        },
+        "Oscillator": {
+            "Blinker": np.array([[1, 1, 1]]),
+            "Toad": np.array([[0, 0, 1, 0], [1, 0, 0, 1], [1, 0, 0, 1], [0, 1, 0, 0]]),
+            "Pulsar": _create_pulsar(),
+            "Pentadecathlon": _create_pentadecathlon()
+        },
+        "Spaceship": {
+            "Glider": np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]]),
+            "LWSS": np.array([[0, 1, 1, 1, 1], [1, 0, 0, 0, 1], [0, 0, 0, 0, 1], [1, 0, 0, 1, 0]])
+        },
+        "Complex": { 
+            "Glider Gun": _create_glider_gun() 
+        },
+        "Random": {
+            "Random": None      # This is a placeholder for the random pattern
+        }
     }
-}
+
+
+def __getattr__(name):
+    # Module-level lazy attribute (PEP 562): patterns.SEED_DATA builds the dictionary on first access
+    if name == "SEED_DATA":
+        return _seed_data()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Pattern library (files in gameoflife/library, see pattern_io)
+# Only the index (name, category, bounding box) is read up front: a pattern file
+# is parsed the first time the pattern is actually used.
+
+@lru_cache(maxsize=1)
+def _library_index():
+    """Returns the memory-mapped library index (loaded once per process)."""
+    return pattern_io.load_library_index()
+
+
+def _library_lookup(category, name):
+    """Returns the index record of a library pattern, or None if it does not exist."""
+    index = _library_index()
+    hits = np.flatnonzero((index["category"] == category) & (index["name"] == name))
+    return index[hits[0]] if hits.size else None
+
+
+def _has_pattern(category, name):
+    """True if the pattern exists, either in SEED_DATA or in the library."""
+    if name in _seed_data().get(category, {}):
+        return True
+    return _library_lookup(category, name) is not None
+
+
+@lru_cache(maxsize=None)
+def _get_seed(category, name):
+    """Returns the seed matrix of a pattern, parsing the library file the first time."""
+    if name in _seed_data().get(category, {}):
+        return _seed_data()[category][name]
+    record = _library_lookup(category, name)
+    return pattern_io.load_pattern(os.path.join(pattern_io.LIBRARY_DIR, str(record["path"])))
+
 
 #Core functions
 
-def insert_pattern(grid, category, name, row_origin, col_origin, rotate=0, flip=False):
+@lru_cache(maxsize=None)
+def _oriented_coords(category, name, rotate=0, flip=False):
+    """
+    Returns the (row, col) coordinates of the live cells of a seed after flip and rotation.
+    The result is cached, so every orientation of a pattern is transformed only once.
+    The returned array is read-only because it is shared between calls.
+    """
+    seed = _get_seed(category, name)
+    if flip:
+        seed = np.fliplr(seed)
+    if rotate % 4 != 0:
+        seed = np.rot90(seed, k=rotate % 4)
+
+    coords = np.argwhere(seed == 1)
+    coords.setflags(write=False)
+    return coords
+
+
+def insert_pattern(grid, category, name, row_origin, col_origin, rotate=0, flip=False,
+                   density=0.5, seed=None):
     """
     Inserts a pattern into the provided grid using toroidal (wrap-around) logic.
     
     Parameters:
     - grid: The NumPy array representing the world.
-    - category/name: Strings to identify the pattern in SEED_DATA.
+    - category/name: Strings to identify the pattern in SEED_DATA or in the pattern library.
     - row_origin/col_origin: Starting coordinates for the top-left of the pattern.
     - rotate: Number of 90-degree anticlockwise rotations (0-3).
     - flip: If True, flips the pattern horizontally before insertion.
+    - density/seed: Only for the "Random" category, probability of a live cell and
+                    seed (int or np.random.Generator) of the random soup.
     """
-    if category not in SEED_DATA or name not in SEED_DATA[category]:
+    if not _has_pattern(category, name):
         print(f"Error: Pattern '{name}' in '{category}' not found.")
         return grid
 
@@ -104,31 +189,78 @@ def insert_pattern(grid, category, name, row_origin, col_origin, rotate=0, flip=
     if category == "Random":
         if name == "Random":
             # Generate a random grid of the same shape as the input grid
-            random_grid = np.random.choice([0, 1], size=grid.shape, p=[0.5, 0.5])
-            return random_grid
+            random_grid = soup.random_grid(grid.shape, density=density, seed=seed)
+            return random_grid.astype(grid.dtype, copy=False)
         else:
             print(f"Error: Pattern '{name}' in '{category}' not found.")
             return grid
 
-    # Copy the seed to avoid modifying the original database during transformations
-    seed = SEED_DATA[category][name].copy()
-    
-    if flip: 
-        seed = np.fliplr(seed)
-    if rotate != 0: 
-        seed = np.rot90(seed, k=rotate)
+    # Live cells of the transformed seed (cached per orientation)
+    coords = _oriented_coords(category, name, rotate % 4, bool(flip))
+
+    # Use modulo operator (%) to handle wrap-around at grid edges
+    g_rows, g_cols = grid.shape
+    grid[(row_origin + coords[:, 0]) % g_rows, (col_origin + coords[:, 1]) % g_cols] = 1
+    return grid
+
+def insert_patterns(grid, placements):
+    """
+    Inserts many patterns at once into the provided grid using toroidal (wrap-around) logic.
+    All the placements sharing the same pattern and orientation are stamped together
+    with a single fancy-indexing assignment.
+
+    Parameters:
+    - grid: The NumPy array representing the world (modified in place).
+    - placements: Either a sequence of (category, name, row, col, rotate, flip) tuples,
+                  or a dict of equally long arrays with keys "category", "name", "row", "col"
+                  and optionally "rotate" and "flip" (default 0 and False).
+
+    Example:
+        rows = np.arange(0, 1000, 10)
+        grid = insert_patterns(grid, {"category": "Spaceship", "name": "Glider",
+                                      "row": rows, "col": rows})
+    """
+    if isinstance(placements, dict):
+        rows = np.atleast_1d(np.asarray(placements["row"], dtype=np.int64))
+        n = rows.size
+        columns = [placements["category"], placements["name"], rows, placements["col"],
+                   placements.get("rotate", 0), placements.get("flip", False)]
+        cats, names, rows, cols, rots, flips = (np.broadcast_to(np.asarray(c), (n,)) for c in columns)
+    else:
+        placements = list(placements)
+        if not placements:
+            return grid
+        cats, names, rows, cols, rots, flips = (np.asarray(c) for c in zip(*placements))
+
+    if rows.size == 0:
+        return grid
+    rows = rows.astype(np.int64)
+    cols = cols.astype(np.int64)
+
+    # Group the placements by (category, name, rotation, flip): one stamp per group.
+    # Each pattern gets an integer label, the orientation is packed in the lowest 3 bits.
+    cat_labels, cat_idx = np.unique(cats.astype(str), return_inverse=True)
+    name_labels, name_idx = np.unique(names.astype(str), return_inverse=True)
+    pattern_ids = cat_idx.ravel() * len(name_labels) + name_idx.ravel()
+    group_ids = pattern_ids * 8 + (rots.astype(np.int64) % 4) * 2 + flips.astype(bool)
 
-    s_rows, s_cols = seed.shape
     g_rows, g_cols = grid.shape
+    for group in np.unique(group_ids):
+        category = str(cat_labels[group // 8 // len(name_labels)])
+        name = str(name_labels[group // 8 % len(name_labels)])
+        rotate, flip = int(group % 8) // 2, bool(group % 2)
+        if category == "Random" or not _has_pattern(category, name):
+            print(f"Error: Pattern '{name}' in '{category}' not found.")
+            continue
+
+        coords = _oriented_coords(category, name, rotate, flip)
+        mask = group_ids == group
+
+        # Outer sum (placements x live cells) gives every target coordinate in one go
+        target_r = (rows[mask][:, None] + coords[None, :, 0]) % g_rows
+        target_c = (cols[mask][:, None] + coords[None, :, 1]) % g_cols
+        grid[target_r.ravel(), target_c.ravel()] = 1
 
-    # Iterate through the pattern and place live cells (1s) into the grid
-    for r in range(s_rows):
-        for c in range(s_cols):
-            if seed[r, c] == 1:
-                # Use modulo operator (%) to handle wrap-around at grid edges
-                target_r = (row_origin + r) % g_rows
-                target_c = (col_origin + c) % g_cols
-                grid[target_r, target_c] = 1
     return grid
 
 # =======================================================================================
@@ -138,10 +270,25 @@ def insert_pattern(grid, category, name, row_origin, col_origin, rotate=0, flip=
 # Useful functions to check cathegories and patterns available for the simulation
 
 def get_available_categories():
-    """Returns a list of all available pattern categories."""
-    return list(SEED_DATA.keys())
+    """Returns a list of all available pattern categories (built-in and library)."""
+    categories = list(_seed_data().keys())
+    for category in _library_index()["category"]:
+        if str(category) not in categories:
+            categories.append(str(category))
+    return categories
 
 def get_patterns_by_category(category):
-    """Returns a list of pattern names within a specific category."""
-    return list(SEED_DATA.get(category, {}).keys())
+    """Returns a list of pattern names within a specific category (built-in and library)."""
+    names = list(_seed_data().get(category, {}).keys())
+    index = _library_index()
+    for name in index["name"][index["category"] == category]:
+        if str(name) not in names:
+            names.append(str(name))
+    return names
+
+def get_pattern(category, name):
+    """Returns the seed matrix of a pattern (read-only, shared with the cache)."""
+    if not _has_pattern(category, name) or category == "Random":
+        raise KeyError(f"Pattern '{name}' in '{category}' not found.")
+    return _get_seed(category, name)
 
@@ -0,0 +1,195 @@
+"""
+Background generation producer.
+
+A FrameProducer computes generations in a worker thread and keeps the next few of them
+in a bounded buffer, so viewers (the Tk app, matplotlib animations) never step the grid
+on their own UI thread.
+
+Usage:
+    producer = FrameProducer(grid, step=evo.newgen, maxsize=8)
+    producer.start()
+    ...
+    frame = producer.latest(max_generation=target)   # newest frame, older ones are dropped
+    frame = producer.get(timeout=1.0)                # or: next frame in order
+    ...
+    producer.stop()
+"""
+
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from . import evolution as evo
+except ImportError:     # Module used outside the package (e.g. "import producer")
+    import evolution as evo
+
+
+class Frame(NamedTuple):
+    """A generation produced by the worker."""
+    generation: int         # Generation number of `state`
+    state: np.ndarray       # Grid at that generation
+    finished: bool          # True if the producer stopped after this frame (e.g. stable state)
+    steps: int = 1          # Generations computed for this frame
+    compute_seconds: float = 0.0    # Time spent in `step` for this frame
+
+
+def is_stable(previous, current):
+    """Default stop condition: the grid did not change in the last step."""
+    return np.array_equal(previous, current)
+
+
+class FrameProducer:
+    """
+    Computes generations ahead of the consumer in a background thread.
+
+    The buffer holds at most `maxsize` frames: when it is full the worker waits,
+    so memory stays bounded and no work is wasted far in the future.
+    """
+
+    def __init__(self, state, step=evo.newgen, maxsize=8, gens_per_frame=1,
+                 generation=0, stop_when=is_stable):
+        """
+        Args:
+            state (np.ndarray): Starting grid (generation `generation`).
+            step (callable): Function grid -> next grid.
+            maxsize (int): Maximum number of frames waiting in the buffer.
+            gens_per_frame (int): Generations computed for every frame put in the buffer.
+                                  Can be changed while running (turbo mode).
+            generation (int): Generation number of `state`.
+            stop_when (callable | None): Function (previous, current) -> bool. When it returns
+                                         True the frame is marked as finished and the worker stops.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.step = step
+        self.maxsize = maxsize
+        self.gens_per_frame = max(1, int(gens_per_frame))
+        self.stop_when = stop_when
+        self.error = None               # Exception raised by the worker, if any
+        self.total_steps = 0            # Generations computed so far (dropped frames included)
+        self.total_compute_seconds = 0.0
+
+        self._state = state
+        self._generation = generation
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._done = threading.Event()  # Set when the worker thread exits
+        self._thread = None
+
+    # ---------------------------------------------------------------------------------
+    # Worker side
+
+    def _run(self):
+        state, generation = self._state, self._generation
+        try:
+            while not self._stop.is_set():
+                finished = False
+                steps = 0
+                t0 = time.perf_counter()
+                for _ in range(self.gens_per_frame):
+                    new = self.step(state)
+                    generation += 1
+                    steps += 1
+                    if self.stop_when is not None and self.stop_when(state, new):
+                        finished = True
+                    state = new
+                    if finished or self._stop.is_set():
+                        break
+                compute_seconds = time.perf_counter() - t0
+                self.total_steps += steps
+                self.total_compute_seconds += compute_seconds
+
+                with self._cond:
+                    # Wait for room in the buffer (or for cancellation)
+                    while len(self._buffer) >= self.maxsize and not self._stop.is_set():
+                        self._cond.wait(0.1)
+                    if self._stop.is_set():
+                        break
+                    self._buffer.append(Frame(generation, state, finished, steps, compute_seconds))
+                    self._cond.notify_all()
+
+                if finished:
+                    break
+        except Exception as e:          # Reported to the consumer through self.error
+            self.error = e
+        finally:
+            self._done.set()
+            with self._cond:
+                self._cond.notify_all()
+
+    # ---------------------------------------------------------------------------------
+    # Consumer side
+
+    def start(self):
+        """Starts the worker thread."""
+        if self._thread is not None:
+            raise RuntimeError("FrameProducer can only be started once.")
+        self._thread = threading.Thread(target=self._run, name="FrameProducer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Cancels the worker and waits for it to exit. Frames still in the buffer are discarded.
+        After stop() returns the worker does not touch any state anymore.
+        """
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._cond:
+            self._buffer.clear()
+
+    @property
+    def running(self):
+        """True while the worker thread is alive."""
+        return self._thread is not None and not self._done.is_set()
+
+    @property
+    def exhausted(self):
+        """True if the worker has exited and every frame has been consumed."""
+        return self._done.is_set() and not self._buffer
+
+    def latest(self, max_generation=None):
+        """
+        Returns the newest available frame without blocking, dropping the older ones.
+
+        Args:
+            max_generation (int | None): Do not go past this generation; frames after it
+                                         stay in the buffer for the next call.
+        Returns:
+            Frame | None: None if no frame is ready yet.
+        """
+        frame = None
+        with self._cond:
+            while self._buffer and (max_generation is None
+                                    or self._buffer[0].generation <= max_generation):
+                frame = self._buffer.popleft()
+            self._cond.notify_all()
+        return frame
+
+    def get(self, timeout=None):
+        """
+        Returns the next frame in order, waiting up to `timeout` seconds for it.
+        Returns None on timeout, or when the worker has stopped and the buffer is empty.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._buffer or self._done.is_set(), timeout):
+                return None
+            if not self._buffer:
+                return None
+            frame = self._buffer.popleft()
+            self._cond.notify_all()
+            return frame
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
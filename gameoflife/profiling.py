@@ -0,0 +1,346 @@
+"""
+Opt-in instrumentation of the hot paths (pattern insertion, evolution steps, metrics, reports).
+
+Disabled by default: stage() returns a shared no-op context manager, wrap() returns the
+function unchanged and count() returns immediately, so instrumented code costs one global
+lookup per call. When enabled, every stage is timed with time.perf_counter_ns and
+aggregated in a histogram (power-of-two buckets), with an optional event list that can be
+written as a Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+
+Enable it:
+    - for the whole process, with environment variables (summary printed to stderr at exit):
+          GAMEOFLIFE_PROFILE=1 python analysis.py
+          GAMEOFLIFE_TRACE=trace.json python analysis.py      (also writes the trace)
+    - for a block of code:
+          with profiling.profile(trace="trace.json") as prof:
+              SimulationRunner.run(config)
+          print(prof.report())
+
+Instrumenting code:
+    with profiling.stage("metrics.entropy"):
+        ...
+    step = profiling.wrap(step, "evolution.step")
+    profiling.count("evolution.generations", steps)
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+ENV_PROFILE = "GAMEOFLIFE_PROFILE"
+ENV_TRACE = "GAMEOFLIFE_TRACE"
+
+HISTOGRAM_BUCKETS = 48      # Bucket i: durations in [2^i, 2^(i+1)) ns (the last one is open-ended)
+MAX_EVENTS = 1_000_000      # Trace events kept per profiler (the histograms are never truncated)
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Aggregation
+
+class StageStats:
+    """Count, total, extremes and log2 histogram of the durations (ns) of one stage."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.buckets[min(ns.bit_length(), HISTOGRAM_BUCKETS) - 1 if ns else 0] += 1
+
+    def merge(self, other):
+        """Adds the values of another StageStats (or of its as_dict())."""
+        if isinstance(other, dict):
+            count, total, low, high, buckets = (other["count"], other["total_ns"], other["min_ns"],
+                                                other["max_ns"], other["buckets"])
+        else:
+            count, total, low, high, buckets = other.count, other.total, other.min, other.max, other.buckets
+        if not count:
+            return
+        self.count += count
+        self.total += total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = max(self.max, high)
+        self.buckets = [a + b for a, b in zip(self.buckets, buckets)]
+
+    def quantile(self, q):
+        """
+        Estimated q-quantile in ns: geometric middle of the histogram bucket that contains it,
+        clamped to the observed minimum and maximum (exact within a factor of sqrt(2)).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(max(2.0 ** (i + 0.5), self.min), self.max)
+        return float(self.max)
+
+    def as_dict(self):
+        return {"count": self.count, "total_ns": self.total, "min_ns": self.min,
+                "max_ns": self.max, "buckets": list(self.buckets)}
+
+
+class Profiler:
+    """
+    Collects stage durations, counters and (optionally) trace events.
+    Safe to use from several threads (e.g. a FrameProducer worker and the UI thread).
+    """
+
+    def __init__(self, events=False, max_events=MAX_EVENTS):
+        """
+        Args:
+            events (bool): Keep one event per stage call, for write_trace().
+            max_events (int): Events kept at most (later ones are only counted in the histograms).
+        """
+        self.stages = {}
+        self.counters = {}
+        self.events = [] if events else None    # (name, start_ns, duration_ns, pid, tid)
+        self.max_events = max_events
+        self.dropped_events = 0
+        self.start_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def record(self, name, start_ns, end_ns):
+        """Adds one call of a stage."""
+        duration = end_ns - start_ns
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.add(duration)
+            if self.events is not None:
+                if len(self.events) < self.max_events:
+                    self.events.append((name, start_ns, duration, os.getpid(), threading.get_native_id()))
+                else:
+                    self.dropped_events += 1
+
+    def count(self, name, n=1):
+        """Adds n to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # ---------------------------------------------------------------------------------
+    # Exchange between processes
+
+    def snapshot(self):
+        """Picklable copy of everything collected (see merge)."""
+        with self._lock:
+            return {"stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+                    "counters": dict(self.counters),
+                    "events": None if self.events is None else list(self.events),
+                    "dropped_events": self.dropped_events}
+
+    def merge(self, snapshot):
+        """Adds a snapshot taken in another profiler (e.g. in a worker process)."""
+        with self._lock:
+            for name, values in snapshot["stages"].items():
+                self.stages.setdefault(name, StageStats()).merge(values)
+            for name, n in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            if self.events is not None and snapshot.get("events"):
+                room = self.max_events - len(self.events)
+                self.events.extend(snapshot["events"][:room])
+                self.dropped_events += max(0, len(snapshot["events"]) - room)
+            self.dropped_events += snapshot.get("dropped_events", 0)
+
+    # ---------------------------------------------------------------------------------
+    # Output
+
+    def summary(self):
+        """dict: stage -> {count, total_s, mean_s, min_s, p50_s, p90_s, p99_s, max_s}."""
+        with self._lock:
+            stages = list(self.stages.items())
+        return {name: {"count": s.count, "total_s": s.total / 1e9, "mean_s": s.total / s.count / 1e9,
+                       "min_s": s.min / 1e9, "p50_s": s.quantile(0.5) / 1e9,
+                       "p90_s": s.quantile(0.9) / 1e9, "p99_s": s.quantile(0.99) / 1e9,
+                       "max_s": s.max / 1e9}
+                for name, s in stages if s.count}
+
+    def report(self):
+        """Text table of the stages (slowest total first) and of the counters."""
+        summary = self.summary()
+        lines = [f"{'stage':<28} {'calls':>8} {'total ms':>10} {'mean ms':>9} "
+                 f"{'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for name, s in sorted(summary.items(), key=lambda item: -item[1]["total_s"]):
+            lines.append(f"{name:<28} {s['count']:>8} {s['total_s'] * 1e3:>10.2f} {s['mean_s'] * 1e3:>9.3f} "
+                         f"{s['p50_s'] * 1e3:>9.3f} {s['p90_s'] * 1e3:>9.3f} {s['p99_s'] * 1e3:>9.3f} "
+                         f"{s['max_s'] * 1e3:>9.3f}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:<28} {n:>8}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        """
+        Writes the events in the Chrome trace format (JSON object with "traceEvents").
+        Timestamps come from the monotonic clock, so events of worker processes line up.
+        """
+        if self.events is None:
+            raise ValueError("This profiler was created without events=True.")
+        with self._lock:
+            events = list(self.events)
+        base = min([self.start_ns] + [start for _, start, _, _, _ in events])
+        trace = [{"name": name, "cat": name.split(".", 1)[0], "ph": "X",
+                  "ts": (start - base) / 1e3, "dur": duration / 1e3, "pid": pid, "tid": tid}
+                 for name, start, duration, pid, tid in events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"summary": self.summary(), "counters": self.counters,
+                                     "dropped_events": self.dropped_events}}, f)
+        return path
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Instrumentation API (no-ops while no profiler is active)
+
+_active = None      # Profiler collecting in this process, None = disabled
+
+
+class _Stage:
+    """Times the enclosed block (context manager returned by stage() when enabled)."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def enabled():
+    """True while a profiler is active in this process."""
+    return _active is not None
+
+
+def active():
+    """The active Profiler, or None."""
+    return _active
+
+
+def stage(name):
+    """Context manager timing a block as stage `name` (a shared no-op when disabled)."""
+    profiler = _active
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name)
+
+
+def wrap(fn, name):
+    """
+    Times every call of fn as stage `name`. Returns fn itself when profiling is disabled
+    (decided once, when wrap is called: wrap hot functions after enabling the profiler).
+    """
+    if _active is None:
+        return fn
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.record(name, start, time.perf_counter_ns())
+    return timed
+
+
+def count(name, n=1):
+    """Adds n to a counter (no-op when disabled)."""
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, n)
+
+
+def merge(snapshot):
+    """Adds a Profiler.snapshot() from another process to the active profiler."""
+    if _active is not None and snapshot is not None:
+        _active.merge(snapshot)
+
+
+@contextlib.contextmanager
+def profile(trace=None, events=None, propagate=True):
+    """
+    Enables profiling inside the block.
+
+    Args:
+        trace (str | None): Write a Chrome trace to this file when the block exits.
+        events (bool | None): Keep trace events (default: only if a trace file is requested).
+        propagate (bool): When nested in another profile() (or in GAMEOFLIFE_PROFILE), also add
+                          the results to the outer profiler on exit.
+    Yields:
+        Profiler
+    """
+    global _active
+    previous = _active
+    profiler = Profiler(events=trace is not None if events is None else events)
+    _active = profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+        if trace is not None:
+            profiler.write_trace(trace)
+        if propagate and previous is not None:
+            previous.merge(profiler.snapshot())
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Process-wide profiling from the environment
+
+def _report_at_exit(profiler, trace):
+    if trace:
+        try:
+            profiler.write_trace(trace)
+            print(f"Profile trace written: {trace}", file=sys.stderr)
+        except OSError as e:
+            print(f"Could not write the profile trace: {e}", file=sys.stderr)
+    if profiler.stages or profiler.counters:
+        print(profiler.report(), file=sys.stderr)
+
+
+def _enable_from_environment():
+    global _active
+    flag = os.environ.get(ENV_PROFILE, "").strip().lower()
+    trace = os.environ.get(ENV_TRACE) or None
+    if flag in ("", "0", "false", "no", "off") and trace is None:
+        return
+    _active = Profiler(events=trace is not None)
+    atexit.register(_report_at_exit, _active, trace)
+
+
+_enable_from_environment()
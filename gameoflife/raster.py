@@ -0,0 +1,93 @@
+"""
+Array-only rasterization helpers shared by the viewers and the exporters.
+
+A grid (or a window of it) is turned into an image of palette indices (uint8),
+either upscaled (several pixels per cell) or downsampled (several cells per pixel,
+shown as a density shade). No plotting library is involved.
+
+Palette convention:
+    0 ... SHADES-1   dead -> alive shades (0 = dead, SHADES-1 = alive)
+    GRID_INDEX       grid lines
+"""
+
+import numpy as np
+
+
+SHADES = 255            # Number of dead -> alive shade levels
+ALIVE_INDEX = SHADES - 1
+GRID_INDEX = 255
+
+
+def make_palette(dead, alive, grid):
+    """
+    Builds the 256 x 3 RGB palette matching the index convention of this module.
+
+    Args:
+        dead, alive, grid (tuple): RGB colors (0-255) of dead cells, live cells and grid lines.
+    Returns:
+        np.ndarray: uint8 array of shape (256, 3).
+    """
+    t = np.linspace(0.0, 1.0, SHADES)[:, None]
+    shades = (1 - t) * np.asarray(dead, dtype=float) + t * np.asarray(alive, dtype=float)
+    palette = np.zeros((256, 3), dtype=np.uint8)
+    palette[:SHADES] = np.round(shades).astype(np.uint8)
+    palette[GRID_INDEX] = grid
+    return palette
+
+
+def block_density(window, block, max_samples=4):
+    """
+    Reduces a window of cells to one density value (0..1) per block x block square.
+
+    To keep the cost proportional to the output size, at most max_samples x max_samples
+    cells are read in every block (evenly strided) when the block is larger than that.
+    The window is cropped to a multiple of the block size.
+
+    Returns:
+        np.ndarray: float32 array of shape (rows // block, cols // block).
+    """
+    rows, cols = window.shape[0] // block, window.shape[1] // block
+
+    # Sampling stride inside a block (a divisor of block, so blocks stay aligned)
+    stride = max(1, block // max_samples)
+    while block % stride:
+        stride -= 1
+    per_block = block // stride
+
+    samples = window[:rows * block:stride, :cols * block:stride].astype(np.uint8, copy=False)
+    counts = samples.reshape(rows, per_block, cols, per_block).sum(axis=(1, 3), dtype=np.uint32)
+    return counts.astype(np.float32) / (per_block * per_block)
+
+
+def cells_to_indices(window, block=1, max_samples=4):
+    """
+    Maps a window of cells to palette indices, one index per cell (block = 1)
+    or one shade per block x block square (block > 1).
+    """
+    if block == 1:
+        return np.where(window, ALIVE_INDEX, 0).astype(np.uint8)
+    density = block_density(window, block, max_samples)
+    return np.round(density * ALIVE_INDEX).astype(np.uint8)
+
+
+def upscale(indices, cell_size, grid_lines=False):
+    """
+    Repeats every index on a cell_size x cell_size square.
+    With grid_lines, one-pixel lines are drawn between cells and around the border,
+    so the result has one extra row and column: (rows * cell_size + 1, cols * cell_size + 1).
+    """
+    pixels = indices
+    if cell_size > 1:
+        pixels = np.repeat(np.repeat(indices, cell_size, axis=0), cell_size, axis=1)
+    if grid_lines:
+        pixels = np.pad(pixels, ((0, 1), (0, 1)), mode="edge")
+        pixels[::cell_size, :] = GRID_INDEX
+        pixels[:, ::cell_size] = GRID_INDEX
+    return pixels
+
+
+def to_ppm(pixels, palette):
+    """Encodes an index image as binary PPM (P6) bytes, the format Tk PhotoImage reads natively."""
+    rgb = palette[pixels]
+    header = f"P6 {rgb.shape[1]} {rgb.shape[0]} 255\n".encode()
+    return header + rgb.tobytes()
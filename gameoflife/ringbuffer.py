@@ -0,0 +1,460 @@
+"""
+Shared-memory frame ring buffer: one simulation process, any number of local consumers.
+
+The publisher runs the simulation in its own process and writes every generation,
+bit-packed (8 cells per byte), into a ring of slots in a multiprocessing.shared_memory
+block. Consumers (a viewer, a metrics collector, a GIF exporter...) attach to the block
+by name from any local process and read the frames in place, each at its own pace:
+nothing is pickled and nothing is recomputed.
+
+The ring never blocks the publisher. A consumer that falls more than `slots` frames behind
+skips to the oldest frame still available, and the number of skipped frames is reported
+(Frame.skipped, RingReader.dropped). Every slot carries the sequence number of its frame,
+so a frame overwritten while it was being read is detected (FrameOverwritten).
+
+Usage:
+    with SimulationPublisher(grid, steps=10_000, slots=64) as sim:     # starts the process
+        start_consumers(sim.name)       # e.g. multiprocessing.Process(target=..., args=(sim.name,))
+        sim.join()
+                                        # the ring is destroyed when the block exits
+    # In any local process:
+    ring = FrameRing.attach(name)
+    reader = ring.reader(start="oldest")
+    for frame in reader:                        # waits for new frames, ends when the run ends
+        grid = frame.grid()                     # unpacked copy (frame.packed is zero-copy)
+    export.export_animation(ring.reader().grids(), "run.gif", frames=200)
+"""
+
+import multiprocessing
+import os
+import time
+from typing import NamedTuple
+
+import numpy as np
+from multiprocessing import shared_memory
+
+try:
+    from . import engines
+except ImportError:     # Module used outside the package (e.g. "import ringbuffer")
+    import engines
+
+
+MAGIC = 0x474F4C52          # "GOLR"
+VERSION = 1
+ALIGN = 64                  # Byte alignment of the slot data
+
+# Fields of the header (int64 each)
+(_MAGIC, _VERSION, _ROWS, _COLS, _SLOTS, _ROW_BYTES, _WRITE_SEQ, _FINISHED, _STOP, _FAILED, _PID,
+ _TRACKER) = range(12)
+_HEADER_FIELDS = 16
+
+POLL_SECONDS = 0.001        # Sleep between two checks for a new frame
+
+
+class FrameOverwritten(RuntimeError):
+    """The publisher reused the slot of a frame while a consumer was reading it."""
+
+
+def _aligned(n):
+    return -(-n // ALIGN) * ALIGN
+
+
+def _tracker_pid():
+    """Pid of this process' multiprocessing resource tracker (0 if unknown)."""
+    try:
+        from multiprocessing import resource_tracker
+        return resource_tracker._resource_tracker._pid or 0
+    except Exception:
+        return 0
+
+
+def _attach_memory(name):
+    """
+    Attaches to an existing block without leaving it registered with a resource tracker
+    other than the creator's: only the creator unlinks the block (before Python 3.13 every
+    attaching process with its own tracker would otherwise unlink it when it exits).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:       # Python < 3.13: no track argument
+        pass
+    memory = shared_memory.SharedMemory(name=name)
+    creator_tracker = int(np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=memory.buf)[_TRACKER])
+    if _tracker_pid() != creator_tracker:   # Forked processes share the creator's tracker
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, "shared_memory")
+        except Exception:
+            pass
+    return memory
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Ring
+
+class Frame(NamedTuple):
+    """A generation read from the ring. `packed` is a view of the shared memory."""
+    seq: int                # Position in the stream (0, 1, 2...)
+    generation: int         # Generation number of the grid
+    packed: np.ndarray      # uint8 (rows, ceil(cols / 8)), np.packbits of the grid along the rows
+    cols: int
+    skipped: int            # Frames lost just before this one (the reader lagged behind)
+    ring: "FrameRing"
+
+    def valid(self):
+        """True while the slot still holds this frame."""
+        return self.ring.slot_seq(self.seq) == self.seq
+
+    def grid(self):
+        """Unpacks the frame into a new boolean grid. Raises FrameOverwritten if it was overwritten meanwhile."""
+        grid = np.unpackbits(self.packed, axis=1, count=self.cols).view(bool)
+        if not self.valid():
+            raise FrameOverwritten(f"Frame {self.seq} was overwritten while it was read.")
+        return grid
+
+
+class FrameRing:
+    """
+    The shared block: a header, one (seq, generation) pair per slot, and the packed frames.
+    Created once (create), attached to by name from other processes (attach).
+    A single process writes (write); any number read (reader).
+    """
+
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner
+        self.header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=memory.buf)
+        if self.header[_MAGIC] != MAGIC or self.header[_VERSION] != VERSION:
+            raise ValueError(f"Shared memory block '{memory.name}' is not a frame ring.")
+        self.shape = (int(self.header[_ROWS]), int(self.header[_COLS]))
+        self.slots = int(self.header[_SLOTS])
+        row_bytes = int(self.header[_ROW_BYTES])
+
+        offset = _aligned(_HEADER_FIELDS * 8)
+        self.slot_info = np.ndarray((self.slots, 2), dtype=np.int64, buffer=memory.buf, offset=offset)
+        offset += _aligned(self.slots * 16)
+        self.data = np.ndarray((self.slots, self.shape[0], row_bytes), dtype=np.uint8,
+                               buffer=memory.buf, offset=offset)
+
+    @classmethod
+    def create(cls, shape, slots=64, name=None):
+        """
+        Allocates a new ring for grids of the given shape.
+
+        Args:
+            shape (tuple): (rows, cols) of the generations.
+            slots (int): Frames kept (how far behind a consumer can be without losing frames).
+            name (str | None): Name of the block (None = random, see .name).
+        """
+        rows, cols = shape
+        if slots < 2:
+            raise ValueError("A ring needs at least 2 slots.")
+        row_bytes = -(-cols // 8)
+        size = (_aligned(_HEADER_FIELDS * 8) + _aligned(slots * 16)
+                + _aligned(slots * rows * row_bytes))
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=memory.buf)
+        header[:] = 0
+        header[[_ROWS, _COLS, _SLOTS, _ROW_BYTES]] = rows, cols, slots, row_bytes
+        header[_TRACKER] = _tracker_pid()
+        header[[_MAGIC, _VERSION]] = MAGIC, VERSION
+        del header
+        ring = cls(memory, owner=True)
+        ring.slot_info[:] = -1
+        return ring
+
+    @classmethod
+    def attach(cls, name):
+        """Attaches to the ring created (in any local process) under this name."""
+        return cls(_attach_memory(name), owner=False)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    # ---------------------------------------------------------------------------------
+    # State shared by the processes
+
+    @property
+    def write_seq(self):
+        """Number of frames published so far (the next frame will have this seq)."""
+        return int(self.header[_WRITE_SEQ])
+
+    @property
+    def finished(self):
+        """True once the publisher has written its last frame (or failed)."""
+        return bool(self.header[_FINISHED])
+
+    @property
+    def failed(self):
+        """True if the publisher stopped on an error."""
+        return bool(self.header[_FAILED])
+
+    def request_stop(self):
+        """Asks the publisher to stop after the frame it is computing."""
+        self.header[_STOP] = 1
+
+    @property
+    def stop_requested(self):
+        return bool(self.header[_STOP])
+
+    def slot_seq(self, seq):
+        """Seq of the frame currently stored in the slot of `seq` (-1 while being written)."""
+        return int(self.slot_info[seq % self.slots, 0])
+
+    # ---------------------------------------------------------------------------------
+    # Publisher side
+
+    def write(self, grid, generation):
+        """Publishes one generation (single writer). Returns its seq."""
+        if grid.shape != self.shape:
+            raise ValueError(f"Expected a grid of shape {self.shape}, got {grid.shape}.")
+        seq = self.write_seq
+        slot = seq % self.slots
+        info = self.slot_info[slot]
+        info[0] = -1                                # Readers of the old frame see it is gone
+        self.data[slot] = np.packbits(grid, axis=1)
+        info[1] = generation
+        info[0] = seq
+        self.header[_WRITE_SEQ] = seq + 1           # Published
+        return seq
+
+    def finish(self, failed=False):
+        """Marks the end of the stream: readers return once they have read every frame."""
+        self.header[_FAILED] = int(failed)
+        self.header[_FINISHED] = 1
+
+    # ---------------------------------------------------------------------------------
+    # Consumer side
+
+    def reader(self, start="latest"):
+        """
+        New independent reader.
+
+        Args:
+            start (str | int): "latest" (next frame published), "oldest" (oldest frame still
+                               in the ring) or a seq number.
+        """
+        return RingReader(self, start)
+
+    def read(self, seq):
+        """
+        Returns the frame `seq` if it is still in the ring, None if it is not published yet.
+        Raises FrameOverwritten if it has already been overwritten.
+        """
+        if seq >= self.write_seq:
+            return None
+        slot = seq % self.slots
+        if int(self.slot_info[slot, 0]) != seq:
+            raise FrameOverwritten(f"Frame {seq} is no longer in the ring.")
+        generation = int(self.slot_info[slot, 1])
+        frame = Frame(seq, generation, self.data[slot], self.shape[1], 0, self)
+        if not frame.valid():       # Overwritten between the two reads of the slot
+            raise FrameOverwritten(f"Frame {seq} is no longer in the ring.")
+        return frame
+
+    def close(self):
+        """Detaches from the block (frames still referenced keep it mapped until they are freed)."""
+        self.header = self.slot_info = self.data = None
+        try:
+            self.memory.close()
+        except BufferError:
+            pass    # Views exported to frames: the mapping is released with them
+
+    def unlink(self):
+        """Destroys the block (owner only, once every process is done with it)."""
+        if self.owner:
+            self.memory.unlink()
+
+
+class RingReader:
+    """
+    Reads the frames of a ring in order, at its own pace. Iterating yields frames until the
+    publisher finishes. A reader that is lapped skips to the oldest frame still available.
+    """
+
+    def __init__(self, ring, start="latest"):
+        self.ring = ring
+        if start == "latest":
+            self.next_seq = ring.write_seq
+        elif start == "oldest":
+            self.next_seq = self._oldest()
+        else:
+            self.next_seq = int(start)
+        self.dropped = 0        # Frames lost because the reader lagged behind
+
+    def _oldest(self):
+        # The slot of write_seq - slots may be being overwritten right now
+        return max(0, self.ring.write_seq - self.ring.slots + 1)
+
+    @property
+    def lag(self):
+        """Frames published but not read yet."""
+        return self.ring.write_seq - self.next_seq
+
+    def poll(self):
+        """Next frame if it is available, without waiting (None otherwise)."""
+        while True:
+            skipped = 0
+            oldest = self._oldest()
+            if self.next_seq < oldest:
+                skipped = oldest - self.next_seq
+                self.next_seq = oldest
+            try:
+                frame = self.ring.read(self.next_seq)
+            except FrameOverwritten:
+                self.dropped += skipped + 1
+                self.next_seq += 1      # Lapped between the checks: move on
+                continue
+            if frame is None:
+                return None
+            self.dropped += skipped
+            self.next_seq += 1
+            return frame._replace(skipped=skipped)
+
+    def next(self, timeout=None):
+        """
+        Waits for the next frame. Returns None on timeout, or when the publisher has
+        finished and every frame has been read.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            finished = self.ring.finished       # Read before polling: no frame can be missed
+            frame = self.poll()
+            if frame is not None or finished:
+                return frame
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(POLL_SECONDS)
+
+    def latest(self):
+        """Newest published frame, skipping every older one (for viewers). None if there is none."""
+        if self.ring.write_seq > self.next_seq + 1:
+            skipped = self.ring.write_seq - 1 - self.next_seq
+            self.next_seq += skipped
+            self.dropped += skipped
+        return self.poll()
+
+    def __iter__(self):
+        while True:
+            frame = self.next()
+            if frame is None:
+                return
+            yield frame
+
+    def grids(self):
+        """Yields the unpacked grids (e.g. for export.export_animation or the metrics)."""
+        for frame in self:
+            try:
+                yield frame.grid()
+            except FrameOverwritten:
+                self.dropped += 1
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Simulation process
+
+def _publish(name, grid, steps, engine, max_fps):
+    """Target of the publisher process: steps the grid and writes every generation."""
+    ring = FrameRing.attach(name)
+    ring.header[_PID] = os.getpid()
+    failed = True
+    try:
+        step = engines.make_step(engine, grid, horizon=steps or 1000)
+        period = 1 / max_fps if max_fps else 0.0
+        ring.write(grid, 0)
+        generation = 0
+        next_time = time.perf_counter() + period
+        while (steps is None or generation < steps) and not ring.stop_requested:
+            grid = step(grid)
+            generation += 1
+            if period:
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+                next_time = time.perf_counter() + period
+            ring.write(grid, generation)
+        failed = False
+    finally:
+        ring.finish(failed)
+        ring.close()
+
+
+class SimulationPublisher:
+    """
+    Runs a simulation in a separate process and publishes every generation in a FrameRing.
+    The ring is owned (and destroyed on close) by the process that created the publisher.
+    """
+
+    def __init__(self, grid, steps=None, slots=64, engine=engines.DEFAULT_ENGINE, max_fps=None, context=None):
+        """
+        Args:
+            grid (np.ndarray): Initial generation (published as generation 0).
+            steps (int | None): Generations to compute (None = until stop()).
+            slots (int): Frames kept in the ring.
+            engine (str): Evolution engine (see gameoflife.engines).
+            max_fps (float | None): Publish at most this many generations per second.
+            context: multiprocessing context (default: multiprocessing's default start method).
+        """
+        self.grid = np.asarray(grid, dtype=bool)
+        if self.grid.ndim != 2:
+            raise ValueError(f"Input array must be 2D, but got {self.grid.ndim}D.")
+        self.steps = steps
+        self.slots = slots
+        self.engine = engine
+        self.max_fps = max_fps
+        self.context = context or multiprocessing.get_context()
+        self.ring = None
+        self.process = None
+
+    def start(self):
+        """Creates the ring and starts the simulation process."""
+        if self.process is not None:
+            raise RuntimeError("SimulationPublisher can only be started once.")
+        self.ring = FrameRing.create(self.grid.shape, self.slots)
+        self.process = self.context.Process(
+            target=_publish, name="SimulationPublisher", daemon=True,
+            args=(self.ring.name, self.grid, self.steps, self.engine, self.max_fps))
+        self.process.start()
+        return self
+
+    @property
+    def name(self):
+        """Name of the shared memory block, to FrameRing.attach() from other processes."""
+        return self.ring.name
+
+    def reader(self, start="oldest"):
+        """Reader of the ring in this process."""
+        return self.ring.reader(start)
+
+    def join(self, timeout=None):
+        """Waits for the simulation to end (all steps computed)."""
+        self.process.join(timeout)
+        return not self.process.is_alive()
+
+    def stop(self, timeout=5.0):
+        """Asks the simulation to stop and waits for the process (terminated after `timeout`)."""
+        if self.process is None:
+            return
+        self.ring.request_stop()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+            self.ring.finish(failed=True)
+
+    def close(self):
+        """Stops the simulation and destroys the ring (attached consumers must be done with it)."""
+        self.stop()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,190 @@
+"""
+Approximate per-frame metrics for huge grids, estimated from a random sample of tiles.
+
+On a 16k x 16k soup, exact population / entropy / activity read 256M cells per generation.
+A TileSampler reads only `fraction` of them: n square tiles (tile x tile cells) at uniformly
+random positions on the torus, drawn again every `refresh_every` generations. Every cell has
+the same probability of being sampled, so the estimates are unbiased:
+    - population: mean tile density x cells, normal confidence interval from the tile variance;
+    - activity (cells changed since the previous generation): same, on the XOR of the two grids;
+    - center of mass: ratio estimator (sampled sum of positions / sampled population),
+      delta-method interval;
+    - entropy of the neighbor-count distribution (SimulationRunner.calculate_entropy): plug-in
+      entropy of the pooled tile histograms, percentile bootstrap interval over the tiles.
+Tiles carry a one-cell halo, so the neighbor counts are the ones of the whole grid.
+
+Grids under `exact_below` cells are cheap enough: `exact` is then True and the caller keeps
+its exact metrics (see SimulationRunner.run).
+
+Usage:
+    sampler = TileSampler(grid.shape, fraction=0.01, seed=0)
+    metrics = sampler.measure(t, state, previous_state)
+    metrics["population"].value, metrics["population"].low, metrics["population"].high
+"""
+
+import math
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+
+DEFAULT_FRACTION = 0.02             # Share of the cells read per generation
+DEFAULT_TILE = 64                   # Side of a tile, in cells
+DEFAULT_REFRESH_EVERY = 16          # Generations between two draws of the tiles
+DEFAULT_CONFIDENCE = 0.95
+EXACT_BELOW = 2048 * 2048           # Smaller grids are measured exactly
+MIN_TILES = 32                      # Fewer tiles give unreliable intervals
+BOOTSTRAP_SAMPLES = 200
+
+
+class Estimate(NamedTuple):
+    """Estimated value with its confidence interval [low, high]."""
+    value: float
+    low: float
+    high: float
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Estimators
+
+def _mean_estimate(values, scale, z):
+    """Mean of per-tile values times `scale`, with a normal interval."""
+    mean = values.mean()
+    half = z * values.std(ddof=1) / math.sqrt(values.size) if values.size > 1 else 0.0
+    return Estimate(mean * scale, (mean - half) * scale, (mean + half) * scale)
+
+
+def _ratio_estimate(numerators, denominators, z):
+    """sum(numerators) / sum(denominators) over the tiles, with a delta-method interval."""
+    total = denominators.sum()
+    if total == 0:
+        return Estimate(np.nan, np.nan, np.nan)
+    ratio = numerators.sum() / total
+    n = numerators.size
+    residuals = numerators - ratio * denominators
+    half = (z * math.sqrt(residuals.var(ddof=1) / n) / denominators.mean()) if n > 1 else 0.0
+    return Estimate(ratio, ratio - half, ratio + half)
+
+
+def _entropy(counts):
+    """Shannon entropy (bits) of histograms along the last axis."""
+    total = counts.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probs = np.where(total > 0, counts / np.maximum(total, 1), 0.0)
+        terms = np.where(probs > 0, probs * np.log2(np.where(probs > 0, probs, 1.0)), 0.0)
+    return -terms.sum(axis=-1)
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Sampler
+
+class TileSampler:
+    """Estimates the metrics of a generation from random tiles (see the module docstring)."""
+
+    def __init__(self, shape, fraction=DEFAULT_FRACTION, tile=DEFAULT_TILE,
+                 refresh_every=DEFAULT_REFRESH_EVERY, confidence=DEFAULT_CONFIDENCE,
+                 exact_below=EXACT_BELOW, seed=None):
+        """
+        Args:
+            shape (tuple[int, int]): Grid shape.
+            fraction (float): Share of the cells read per generation, in (0, 1].
+            tile (int): Side of a tile (clipped to the grid).
+            refresh_every (int): New tiles every K generations (the same tiles in between, so the
+                                 activity compares the same cells and the series are smoother).
+            confidence (float): Level of the intervals, in (0, 1).
+            exact_below (int): Grids with fewer cells are not sampled (`exact` is True).
+            seed (int | None): Seed of the tile positions.
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1].")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be in (0, 1).")
+        if tile < 1 or refresh_every < 1:
+            raise ValueError("tile and refresh_every must be positive integers.")
+
+        self.shape = tuple(shape)
+        self.cells = self.shape[0] * self.shape[1]
+        self.fraction = fraction
+        self.tile = min(tile, *self.shape)
+        self.refresh_every = refresh_every
+        self.confidence = confidence
+        self.exact = self.cells < exact_below or fraction >= 1
+        self.n_tiles = max(MIN_TILES, math.ceil(fraction * self.cells / self.tile ** 2))
+        self._z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self._rng = np.random.default_rng(seed)
+        self._rows = self._cols = None      # (n_tiles, tile + 2) indices, halo included
+
+    def describe(self):
+        """dict with the sampling settings (for the results and the report)."""
+        return {"fraction": self.fraction, "tile": self.tile, "tiles": self.n_tiles,
+                "refresh_every": self.refresh_every, "confidence": self.confidence}
+
+    def _draw(self):
+        rows, cols = self.shape
+        offsets = np.arange(-1, self.tile + 1)
+        tops = self._rng.integers(0, rows, self.n_tiles)
+        lefts = self._rng.integers(0, cols, self.n_tiles)
+        self._rows = (tops[:, None] + offsets) % rows
+        self._cols = (lefts[:, None] + offsets) % cols
+
+    def _gather(self, state, halo):
+        """(n_tiles, tile [+ 2], tile [+ 2]) stack of the sampled tiles (wrapped on the torus)."""
+        rows, cols = (self._rows, self._cols) if halo else (self._rows[:, 1:-1], self._cols[:, 1:-1])
+        return state[rows[:, :, None], cols[:, None, :]]
+
+    def measure(self, generation, state, previous=None):
+        """
+        Estimates the metrics of one generation.
+
+        Args:
+            generation (int): Index of the generation (the tiles change every refresh_every).
+            state (np.ndarray): 2D boolean grid.
+            previous (np.ndarray | None): The generation before, for the activity.
+        Returns:
+            dict[str, Estimate]: population, entropy, activity, com_row, com_col.
+        """
+        if self._rows is None or generation % self.refresh_every == 0:
+            self._draw()
+        z = self._z
+        area = self.tile ** 2
+
+        # 1. Tiles with their halo, and the neighbor counts of their inner cells
+        tiles = self._gather(state, halo=True).view(np.uint8)
+        inner = tiles[:, 1:-1, 1:-1]
+        horizontal = tiles[:, :, :-2] + tiles[:, :, 1:-1] + tiles[:, :, 2:]
+        neighbors = horizontal[:, :-2, :] + horizontal[:, 1:-1, :] + horizontal[:, 2:, :] - inner
+
+        # 2. Population (and occupancy) from the tile densities
+        alive = inner.reshape(self.n_tiles, -1).sum(axis=1, dtype=np.int64)
+        population = _mean_estimate(alive / area, self.cells, z)
+
+        # 3. Center of mass: ratio of the sampled position sums to the sampled population
+        rows_inner, cols_inner = self._rows[:, 1:-1], self._cols[:, 1:-1]
+        row_sums = (inner.sum(axis=2, dtype=np.int64) * rows_inner).sum(axis=1)
+        col_sums = (inner.sum(axis=1, dtype=np.int64) * cols_inner).sum(axis=1)
+        com_row = _ratio_estimate(row_sums, alive, z)
+        com_col = _ratio_estimate(col_sums, alive, z)
+
+        # 4. Entropy of the pooled neighbor-count histogram, bootstrap over the tiles
+        flat = neighbors.reshape(self.n_tiles, -1).astype(np.int64) + 9 * np.arange(self.n_tiles)[:, None]
+        histograms = np.bincount(flat.ravel(), minlength=9 * self.n_tiles).reshape(self.n_tiles, 9)
+        value = float(_entropy(histograms.sum(axis=0)))
+        weights = self._rng.multinomial(self.n_tiles, np.full(self.n_tiles, 1 / self.n_tiles), BOOTSTRAP_SAMPLES)
+        replicates = _entropy(weights @ histograms)
+        tail = (1 - self.confidence) / 2
+        entropy = Estimate(value, float(np.quantile(replicates, tail)), float(np.quantile(replicates, 1 - tail)))
+
+        # 5. Activity: changed cells of the same tiles in the previous generation
+        if previous is None:
+            activity = Estimate(0.0, 0.0, 0.0)
+        else:
+            changed = (inner.view(bool) ^ self._gather(previous, halo=False)).reshape(self.n_tiles, -1)
+            activity = _mean_estimate(changed.sum(axis=1) / area, self.cells, z)
+
+        return {"population": population, "entropy": entropy, "activity": activity,
+                "com_row": com_row, "com_col": com_col}
@@ -0,0 +1,161 @@
+"""
+Random initial grids ("soups") for the Game of Life.
+
+All the random grids of the project come from here, so that they are reproducible
+and never touch the global np.random state.
+
+Usage:
+    import gameoflife.soup as soup
+    grid = soup.random_grid((200, 300), density=0.3, seed=42)
+    packed = soup.random_grid((200, 300), density=0.3, seed=42, packed=True)
+
+    # Independent reproducible streams, one per worker
+    rngs = soup.spawn_generators(seed=42, n=8)
+
+    # Grids larger than RAM, written chunk by chunk to disk
+    soup.random_grid_to_file("soup.npy", (100_000, 100_000), density=0.5, seed=1)
+"""
+
+import numpy as np
+
+
+# Resolution used to turn a density into an integer threshold on raw random bits
+_THRESHOLD_BITS = 16
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Random streams
+
+def make_generator(seed=None):
+    """
+    Returns a np.random.Generator.
+    Accepts None (fresh entropy), an int, a SeedSequence or an existing Generator (returned as is).
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_generators(seed, n):
+    """
+    Creates n independent and reproducible generators, e.g. one per worker process.
+    The same (seed, n) always gives the same streams, and the streams never overlap.
+
+    Args:
+        seed (int | np.random.SeedSequence | None): Root seed.
+        n (int): Number of streams.
+    Returns:
+        list[np.random.Generator]
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Grid generation
+
+def _random_bits(rng, shape, density):
+    """
+    Draws a boolean array where each cell is alive with probability `density`.
+    For density 0.5 the raw random bytes are unpacked directly (1 random bit per cell),
+    otherwise 16 raw bits per cell are compared with an integer threshold.
+    """
+    rows, cols = shape
+    if density <= 0.0:
+        return np.zeros(shape, dtype=bool)
+    if density >= 1.0:
+        return np.ones(shape, dtype=bool)
+
+    if density == 0.5:
+        # Same bytes as the packed version, so packed and boolean grids of a seed match
+        packed = _random_packed_rows(rng, rows, cols, density)
+        return np.unpackbits(packed, axis=1, count=cols).view(bool)
+
+    threshold = int(round(density * (1 << _THRESHOLD_BITS)))
+    raw = rng.integers(0, 1 << _THRESHOLD_BITS, size=shape, dtype=np.uint16)
+    return raw < threshold
+
+
+def _random_packed_rows(rng, n_rows, cols, density):
+    """
+    Draws n_rows rows already bit-packed along the columns (np.packbits layout, axis=1).
+    For density 0.5 the random bytes are the packed rows, so nothing is unpacked at all.
+    """
+    row_bytes = (cols + 7) // 8
+    if density == 0.5:
+        packed = np.frombuffer(rng.bytes(n_rows * row_bytes), dtype=np.uint8).reshape(n_rows, row_bytes).copy()
+        # Clear the padding bits past the last column, so the packed grid is canonical
+        if cols % 8:
+            packed[:, -1] &= np.uint8((0xFF << (8 - cols % 8)) & 0xFF)
+        return packed
+    return np.packbits(_random_bits(rng, (n_rows, cols), density), axis=1)
+
+
+def random_grid(shape, density=0.5, seed=None, packed=False):
+    """
+    Generates a random grid where each cell is alive with probability `density`.
+
+    Args:
+        shape (tuple): (rows, cols) of the grid.
+        density (float): Probability for a cell to be alive, between 0 and 1.
+        seed (int | np.random.Generator | None): Seed or generator. None gives a different grid every call.
+        packed (bool): If True, returns a bit-packed uint8 array of shape (rows, ceil(cols/8))
+                       (same layout as np.packbits(grid, axis=1)); otherwise a boolean array.
+    Returns:
+        np.ndarray: The random grid.
+    """
+    if not 0.0 <= density <= 1.0:
+        raise ValueError(f"density must be between 0 and 1, got {density}.")
+    rows, cols = shape
+    rng = make_generator(seed)
+
+    if packed:
+        return _random_packed_rows(rng, rows, cols, density)
+    return _random_bits(rng, (rows, cols), density)
+
+
+def iter_random_chunks(shape, density=0.5, seed=None, chunk_rows=1024, packed=False):
+    """
+    Generates a random grid in horizontal bands, without ever holding the whole grid in memory.
+    Every band has its own stream spawned from the seed, so the result only depends on
+    (seed, chunk_rows) and bands can also be generated in parallel.
+
+    Yields:
+        (row_start, chunk): first row of the band and the band itself (boolean or packed).
+    """
+    if not 0.0 <= density <= 1.0:
+        raise ValueError(f"density must be between 0 and 1, got {density}.")
+    rows, cols = shape
+    n_chunks = max(1, -(-rows // chunk_rows))
+    rngs = spawn_generators(seed, n_chunks)
+
+    for i, rng in enumerate(rngs):
+        start = i * chunk_rows
+        n_rows = min(chunk_rows, rows - start)
+        if packed:
+            yield start, _random_packed_rows(rng, n_rows, cols, density)
+        else:
+            yield start, _random_bits(rng, (n_rows, cols), density)
+
+
+def random_grid_to_file(path, shape, density=0.5, seed=None, chunk_rows=1024, packed=True):
+    """
+    Writes a random grid to a memory-mapped .npy file, one band at a time.
+    Useful for grids larger than RAM; read it back with np.load(path, mmap_mode="r").
+
+    Returns:
+        np.memmap: The memory-mapped grid (bit-packed by default).
+    """
+    rows, cols = shape
+    out_shape = (rows, (cols + 7) // 8) if packed else (rows, cols)
+    out = np.lib.format.open_memmap(path, mode="w+",
+                                    dtype=np.uint8 if packed else bool, shape=out_shape)
+    for start, chunk in iter_random_chunks(shape, density, seed, chunk_rows, packed):
+        out[start:start + chunk.shape[0]] = chunk
+    out.flush()
+    return out
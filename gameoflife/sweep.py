@@ -0,0 +1,458 @@
+"""
+Parameter sweeps: thousands of runs described by a few axes, reduced on the fly.
+
+A Sweep combines a base configuration (same keys as analysis.TEST_SUITE entries) with
+    - grid axes: every combination of their values (Cartesian product);
+    - random axes: values drawn for every run (`samples` runs per grid combination),
+      from Uniform / Randint / Choice / RandomPosition or any function (rng, config) -> value.
+Configurations are generated lazily and reproducibly (every run has its own seed).
+
+Runs are executed in chunks: the runs of a chunk that share a grid shape, rule and boundary
+are stacked and stepped together by a batch engine (see gameoflife.engines). Every run stops
+as soon as it settles (a CycleDetector finds a repeat, see gameoflife.cycles), so stable
+soups cost a few generations instead of `steps`. Chunks can run in a process pool.
+
+Only a small summary of every run is kept (lifetime, final population, period, shift), and
+it is folded into per-axis aggregates right away (SweepAggregator): mean and quantiles of the
+lifetime and of the final population, and the period distribution, per value of every axis.
+
+Usage:
+    sweep = Sweep(base={"category": "Random", "pattern_name": "Random", "steps": 1000},
+                  grid={"grid_size": [(64, 64), (128, 128)], "rule": ["B3/S23", "B36/S23"]},
+                  random={"density": Uniform(0.1, 0.6, bins=5)},
+                  samples=200, seed=1)
+    aggregates = run_sweep(sweep, workers=4)
+    print(aggregates.report())
+"""
+
+import itertools
+from collections import Counter
+
+import numpy as np
+
+try:
+    from . import cycles
+    from . import engines
+    from . import patterns as pt
+except ImportError:     # Module used outside the package (e.g. "import sweep")
+    import cycles
+    import engines
+    import patterns as pt
+
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_MAX_PERIOD = 100
+QUANTILES = (0.1, 0.5, 0.9)
+
+# Axis that sets both the category and the pattern name: values are (category, name) pairs
+PATTERN_AXIS = "pattern"
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Random axes
+
+class Uniform:
+    """Float drawn uniformly in [low, high). Aggregated in `bins` equal intervals."""
+
+    def __init__(self, low, high, bins=10):
+        self.low, self.high, self.bins = low, high, bins
+
+    def __call__(self, rng, config):
+        return float(rng.uniform(self.low, self.high))
+
+    def key(self, value):
+        width = (self.high - self.low) / self.bins
+        i = min(int((value - self.low) // width), self.bins - 1)
+        return (round(self.low + i * width, 6), round(self.low + (i + 1) * width, 6))
+
+
+class Randint:
+    """Integer drawn uniformly in [low, high)."""
+
+    def __init__(self, low, high):
+        self.low, self.high = low, high
+
+    def __call__(self, rng, config):
+        return int(rng.integers(self.low, self.high))
+
+    def key(self, value):
+        return value
+
+
+class Choice:
+    """One of the values, with optional probabilities."""
+
+    def __init__(self, values, p=None):
+        self.values, self.p = list(values), p
+
+    def __call__(self, rng, config):
+        return self.values[int(rng.choice(len(self.values), p=self.p))]
+
+    def key(self, value):
+        return value
+
+
+class RandomPosition:
+    """(row, col) drawn uniformly on the grid of the run (config["grid_size"]). Not aggregated."""
+
+    def __call__(self, rng, config):
+        rows, cols = config["grid_size"]
+        return int(rng.integers(rows)), int(rng.integers(cols))
+
+    def key(self, value):
+        return None
+
+
+def _axis_key(sampler, value):
+    """Aggregation key of a drawn value (None = the axis is not aggregated)."""
+    key = getattr(sampler, "key", None)
+    return key(value) if key is not None else None
+
+
+def _hashable(value):
+    return tuple(_hashable(v) for v in value) if isinstance(value, (list, tuple)) else value
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Sweep specification
+
+class Sweep:
+    """Lazy description of the configurations of a sweep (see the module docstring)."""
+
+    def __init__(self, base, grid=None, random=None, samples=1, seed=0):
+        """
+        Args:
+            base (dict): Keys shared by every run: category, pattern_name, grid_size, steps,
+                         pos, rotate, flip, density, rule, boundary, max_period...
+            grid (dict[str, Sequence] | None): Cartesian axes: key -> values.
+            random (dict[str, callable] | None): Sampled axes: key -> sampler (rng, config) -> value.
+            samples (int): Runs per combination of the grid axes.
+            seed (int): Seed of the sampled values and of the random soups.
+        """
+        self.base = dict(base)
+        self.grid = {name: list(values) for name, values in (grid or {}).items()}
+        self.random = dict(random or {})
+        self.samples = samples
+        self.seed = seed
+        overlap = set(self.grid) & set(self.random)
+        if overlap:
+            raise ValueError(f"Axes both in grid and random: {sorted(overlap)}.")
+        for category, name in self._patterns():
+            check_pattern(category, name)
+
+    def _patterns(self):
+        """(category, pattern_name) pairs known before running (sampled ones are checked per run)."""
+        if PATTERN_AXIS in self.grid:
+            return set(map(tuple, self.grid[PATTERN_AXIS]))
+        if {"category", "pattern_name"} & set(self.random):
+            return set()
+        categories = self.grid.get("category", [self.base.get("category")])
+        names = self.grid.get("pattern_name", [self.base.get("pattern_name")])
+        return {(category, name) for category in categories for name in names
+                if category is not None and name is not None}
+
+    @property
+    def axes(self):
+        return list(self.grid) + list(self.random)
+
+    def __len__(self):
+        n = self.samples
+        for values in self.grid.values():
+            n *= len(values)
+        return n
+
+    def __iter__(self):
+        """Yields (index, config, axis_keys) for every run, without building the whole list."""
+        names = list(self.grid)
+        index = 0
+        for combination in itertools.product(*(self.grid[name] for name in names)):
+            for _ in range(self.samples):
+                rng = np.random.default_rng([self.seed, index])
+                config = dict(self.base)
+                keys = {}
+                for name, value in zip(names, combination):
+                    _set(config, name, value)
+                    keys[name] = _hashable(value)
+                for name, sampler in self.random.items():
+                    value = sampler(rng, config)
+                    _set(config, name, value)
+                    keys[name] = _axis_key(sampler, value)
+                config.setdefault("seed", int(rng.integers(2**63)))
+                config.setdefault("name", f"sweep_{index}")
+                yield index, config, keys
+                index += 1
+
+
+def _set(config, name, value):
+    if name == PATTERN_AXIS:
+        config["category"], config["pattern_name"] = value
+    else:
+        config[name] = value
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Execution
+
+def check_pattern(category, name):
+    """
+    Raises ValueError if the pattern does not exist: insert_pattern only prints an error and
+    leaves the grid empty, which a sweep would aggregate as a run that settled at once.
+    """
+    if name not in pt.get_patterns_by_category(category):
+        raise ValueError(f"Pattern '{name}' in '{category}' not found.")
+
+
+def initial_grid(config):
+    """First generation of a sweep run."""
+    check_pattern(config["category"], config["pattern_name"])
+    rows, cols = config["grid_size"]
+    grid = np.zeros((rows, cols), dtype=bool)
+    row, col = config.get("pos", (rows // 2, cols // 2))
+    return pt.insert_pattern(grid, config["category"], config["pattern_name"], row, col,
+                             rotate=config.get("rotate", 0), flip=config.get("flip", False),
+                             density=config.get("density", 0.5), seed=config.get("seed"))
+
+
+def _summary(config, cycle, generation, grid):
+    """Per-run result: a few numbers, never the timeline."""
+    return {"settled": cycle is not None,
+            "lifetime": cycle.transient if cycle is not None else generation,
+            "generations": generation,
+            "final_population": int(np.count_nonzero(grid)),
+            "period": cycle.period if cycle is not None else None,
+            "dx": cycle.dx if cycle is not None else 0,
+            "dy": cycle.dy if cycle is not None else 0}
+
+
+def _settles(cycle, boundary):
+    """
+    On a torus any repeat (even shifted) means the run is periodic from then on. With dead
+    boundaries a shifted shape may still hit the edge, so only exact repeats stop the run.
+    """
+    return cycle is not None and (boundary == "wrap" or not cycle.is_moving)
+
+
+def run_group(configs, engine=engines.DEFAULT_ENGINE):
+    """
+    Runs configurations sharing grid_size, rule and boundary, stacked in one array.
+
+    Returns:
+        list[dict]: One summary per configuration (same order).
+    """
+    first = configs[0]
+    boundary = first.get("boundary", "wrap")
+    rule = first.get("rule", engines.DEFAULT_RULE)
+    steps = np.array([config["steps"] for config in configs])
+    stack = np.stack([initial_grid(config) for config in configs])
+    chosen = engines.resolve(engine, stack, horizon=int(steps.max()), boundary=boundary,
+                             rule=rule, batch=len(configs) > 1)
+
+    detectors = [cycles.CycleDetector(config.get("max_period", DEFAULT_MAX_PERIOD)) for config in configs]
+    results = [None] * len(configs)
+    alive = np.arange(len(configs))     # Runs still evolving, rows of `stack`
+    generation = 0
+    while True:
+        # 1. Detect settled runs (and runs out of steps), remove them from the stack
+        keep = []
+        for row, i in enumerate(alive):
+            cycle = detectors[i].update(stack[row])
+            if _settles(cycle, boundary) or generation >= steps[i]:
+                results[i] = _summary(configs[i], cycle if _settles(cycle, boundary) else None,
+                                      generation, stack[row])
+            else:
+                keep.append(row)
+        if not keep:
+            return results
+        if len(keep) < len(alive):
+            stack, alive = stack[keep], alive[keep]
+
+        # 2. One step of every remaining run
+        stack = chosen.step(stack, boundary, rule) if chosen.batch else \
+            np.stack([chosen.step(grid, boundary, rule) for grid in stack])
+        generation += 1
+
+
+def run_chunk(configs, engine=engines.DEFAULT_ENGINE):
+    """Runs a chunk of configurations, grouped by (grid_size, rule, boundary)."""
+    groups = {}
+    for i, config in enumerate(configs):
+        key = (tuple(config["grid_size"]), engines.normalize_rule(config.get("rule", engines.DEFAULT_RULE)),
+               config.get("boundary", "wrap"))
+        groups.setdefault(key, []).append(i)
+    results = [None] * len(configs)
+    for indices in groups.values():
+        for i, summary in zip(indices, run_group([configs[i] for i in indices], engine)):
+            results[i] = summary
+    return results
+
+
+def _chunks(sweep, chunk_size):
+    iterator = iter(sweep)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_results(sweep, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, engine=engines.DEFAULT_ENGINE):
+    """
+    Runs the sweep and yields (index, config, axis_keys, summary) as chunks complete.
+    With workers > 1 the chunks run in a process pool, at most 2 * workers chunks in flight.
+    """
+    if workers == 1:
+        for chunk in _chunks(sweep, chunk_size):
+            summaries = run_chunk([config for _, config, _ in chunk], engine)
+            for (index, config, keys), summary in zip(chunk, summaries):
+                yield index, config, keys, summary
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        chunks = _chunks(sweep, chunk_size)
+        while True:
+            for chunk in itertools.islice(chunks, 2 * workers - len(pending)):
+                pending[pool.submit(run_chunk, [config for _, config, _ in chunk], engine)] = chunk
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                for (index, config, keys), summary in zip(chunk, future.result()):
+                    yield index, config, keys, summary
+
+
+def run_sweep(sweep, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, engine=engines.DEFAULT_ENGINE, progress=None):
+    """
+    Runs the sweep and returns its SweepAggregator.
+
+    Args:
+        sweep (Sweep): Configurations to run.
+        workers (int): Processes (1 = run in this process).
+        chunk_size (int): Runs per chunk (stacked together when they share a grid shape).
+        engine (str): Evolution engine (see gameoflife.engines), must support batches to stack runs.
+        progress (callable | None): Function (runs done, total runs) called after every chunk.
+    """
+    aggregator = SweepAggregator(sweep.axes)
+    total = len(sweep)
+    for done, (_, _, keys, summary) in enumerate(iter_results(sweep, workers, chunk_size, engine), 1):
+        aggregator.add(keys, summary)
+        if progress is not None and (done % chunk_size == 0 or done == total):
+            progress(done, total)
+    return aggregator
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Aggregation
+
+class Distribution:
+    """Exact distribution of integer values (a Counter: memory grows with distinct values, not runs)."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.n = 0
+        self.total = 0
+
+    def add(self, value):
+        self.counts[value] += 1
+        self.n += 1
+        self.total += value
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else float("nan")
+
+    def quantile(self, q):
+        if not self.n:
+            return float("nan")
+        rank = q * (self.n - 1)
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen > rank:
+                return value
+        return max(self.counts)
+
+    def as_dict(self):
+        return {"mean": self.mean, **{f"q{int(q * 100)}": self.quantile(q) for q in QUANTILES}}
+
+
+class _Group:
+    """Aggregates of the runs sharing one value of one axis."""
+
+    def __init__(self):
+        self.runs = 0
+        self.settled = 0
+        self.lifetime = Distribution()
+        self.final_population = Distribution()
+        self.periods = Counter()        # period (None = not settled) -> runs
+        self.moving = 0
+
+    def add(self, summary):
+        self.runs += 1
+        self.settled += summary["settled"]
+        self.lifetime.add(summary["lifetime"])
+        self.final_population.add(summary["final_population"])
+        self.periods[summary["period"]] += 1
+        self.moving += bool(summary["dx"] or summary["dy"])
+
+    def as_dict(self):
+        return {"runs": self.runs, "settled": self.settled, "moving": self.moving,
+                "lifetime": self.lifetime.as_dict(),
+                "final_population": self.final_population.as_dict(),
+                "periods": dict(sorted(self.periods.items(), key=lambda item: (item[0] is None, item[0])))}
+
+
+class SweepAggregator:
+    """
+    Folds run summaries into per-axis aggregates. The lifetime is the generation at which
+    the run became periodic, or the number of generations computed if it never settled.
+    """
+
+    def __init__(self, axes):
+        self.axes = list(axes)
+        self.all = _Group()
+        self.groups = {axis: {} for axis in self.axes}
+
+    def add(self, keys, summary):
+        self.all.add(summary)
+        for axis in self.axes:
+            key = keys.get(axis)
+            if key is not None:
+                self.groups[axis].setdefault(key, _Group()).add(summary)
+
+    def summary(self):
+        """dict: {"all": aggregates, axis: {value: aggregates}}."""
+        out = {"all": self.all.as_dict()}
+        for axis, groups in self.groups.items():
+            if groups:
+                out[axis] = {key: group.as_dict() for key, group in sorted(groups.items(), key=lambda g: str(g[0]))}
+        return out
+
+    def report(self):
+        """Text table: one line per axis value."""
+        header = (f"{'axis':<12} {'value':<22} {'runs':>6} {'settled':>8} {'life mean':>10} "
+                  f"{'q10/q50/q90':>16} {'pop mean':>10} {'top periods':<24}")
+        lines = [header]
+
+        def line(axis, value, group):
+            life = group.lifetime
+            periods = ", ".join(f"{p}:{n}" for p, n in group.periods.most_common(3) if p is not None)
+            quantiles = "/".join(str(life.quantile(q)) for q in QUANTILES)
+            lines.append(f"{axis:<12} {str(value):<22} {group.runs:>6} {group.settled:>8} "
+                         f"{life.mean:>10.1f} {quantiles:>16} {group.final_population.mean:>10.1f} {periods:<24}")
+
+        line("all", "", self.all)
+        for axis, groups in self.groups.items():
+            for key, group in sorted(groups.items(), key=lambda g: str(g[0])):
+                line(axis, key, group)
+        return "\n".join(lines)
@@ -0,0 +1,411 @@
+"""
+Lazy timelines: random access to the generations of a run without keeping them all.
+
+A Timeline behaves like the list returned by evolution.evolution (len, timeline[t],
+negative indices, slices, iteration, reversed), but a generation is only computed when it is
+asked for. What is kept in memory:
+    - a checkpoint every `checkpoint_every` generations, stored as `storage`:
+      "frames" (boolean arrays), "packed" (1 bit per cell, the default) or "deltas"
+      (zlib-compressed XOR with the previous checkpoint, a full keyframe every KEYFRAME_EVERY);
+    - an LRU cache of the last generations computed or read, bounded by `cache_bytes`.
+So memory is O(T / K + cache) instead of O(T), and timeline[t] costs at most K - 1 steps
+from the closest checkpoint (usually none, when scrubbing around recently seen frames).
+
+Iteration and slices are streamed: forward iteration steps from the previous frame,
+reversed iteration recomputes one checkpoint segment at a time (O(T) steps in total
+instead of O(T * K) for timeline[t] in a loop). Slices are views (TimelineSlice) that
+compute nothing until they are read.
+
+The generations are read-only arrays (they are shared with the cache): use .copy() to
+modify one.
+
+Usage:
+    timeline = Timeline(grid, 10_000, engine="auto", checkpoint_every=64)
+    last = timeline[-1]
+    for state in reversed(timeline[-200:]):
+        ...
+    print(timeline.cache_info())
+"""
+
+import operator
+import threading
+import warnings
+import zlib
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+
+try:
+    from . import engines
+except ImportError:     # Module used outside the package (e.g. "import timeline")
+    import engines
+
+
+DEFAULT_CHECKPOINT_EVERY = 32
+DEFAULT_CACHE_BYTES = 64 * 2**20
+STORAGES = ("frames", "packed", "deltas")
+KEYFRAME_EVERY = 64         # "deltas" storage: a full checkpoint every KEYFRAME_EVERY checkpoints
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Timeline
+
+def _freeze(state):
+    """Makes a generation read-only, since it is shared by the cache and the callers."""
+    state.setflags(write=False)
+    return state
+
+
+class Timeline(Sequence):
+    """
+    Generations 0..timesteps of a run, computed on demand (see the module docstring).
+    Safe to read from several threads (e.g. a UI and a background producer).
+    """
+
+    def __init__(self, genzero, timesteps, engine=engines.DEFAULT_ENGINE, step=None,
+                 checkpoint_every=DEFAULT_CHECKPOINT_EVERY, cache_bytes=DEFAULT_CACHE_BYTES,
+                 progress=None, storage="packed"):
+        """
+        Args:
+            genzero (np.ndarray): 2D boolean array with the generation zero (copied).
+            timesteps (int): Number of steps: the timeline has timesteps + 1 generations.
+            engine (str | Engine): Evolution engine (see gameoflife.engines), used when no step is given.
+            step (callable | None): Function grid -> next grid, instead of an engine.
+            checkpoint_every (int): Distance K between two stored generations.
+            cache_bytes (int): Memory budget of the LRU cache of recent generations.
+            progress (callable | None): Function (generation, state) called the first time every
+                                        generation is computed (it may raise to abort).
+            storage (str): Representation of the checkpoints, one of STORAGES.
+        """
+        # Anti bug checks
+        if not isinstance(timesteps, int):
+            raise TypeError(f"timesteps must be an integer, got {type(timesteps).__name__}.")
+        if timesteps < 0:
+            raise ValueError("timesteps cannot be negative.")
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be a positive integer.")
+        if cache_bytes < 0:
+            raise ValueError("cache_bytes cannot be negative.")
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown storage '{storage}'. Available: {', '.join(STORAGES)}.")
+        genzero = np.asarray(genzero)
+        if genzero.ndim != 2:
+            raise ValueError(f"Input array must be 2D, but got {genzero.ndim}D.")
+        if genzero.dtype != bool:
+            warnings.warn("Input array has non-boolean values. It will be interpreted")
+
+        self.timesteps = timesteps
+        self.checkpoint_every = checkpoint_every
+        self.cache_bytes = cache_bytes
+        self.storage = storage
+        self.progress = progress
+        self.shape = genzero.shape
+        self._step = step if step is not None else engines.make_step(engine, genzero, horizon=timesteps)
+
+        genzero = _freeze(np.array(genzero, dtype=bool))
+        self._checkpoints = {}              # generation -> encoded grid (see _encode)
+        self._checkpoint_nbytes = 0
+        self._keyframes = 0                 # "deltas" keyframes stored, and their bytes (part of the above)
+        self._keyframe_nbytes = 0
+        self._last_checkpoint = None        # Last checkpoint stored: reference of the next delta
+        self._decoded = None                # Last checkpoint decoded: start of the next delta chain
+        self._store(0, genzero)
+        self._frontier = 0                  # Last generation computed so far...
+        self._frontier_state = genzero      # ...and its grid (the next steps start from it)
+        self._cache = OrderedDict()         # generation -> grid, least recently used first
+        self._cache_nbytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.steps = 0                      # Steps computed, recomputations included
+        self._remember(0, genzero)
+
+    # ---------------------------------------------------------------------------------
+    # Storage
+
+    def _unpack(self, packed):
+        count = self.shape[0] * self.shape[1]
+        return np.unpackbits(packed, count=count).reshape(self.shape).view(bool)
+
+    def _encode(self, state, storage, ordinal, previous):
+        """Encoded checkpoint number `ordinal` (generation / K); `previous` is the grid of the one before."""
+        if storage == "frames":
+            return state
+        if storage == "packed":
+            return np.packbits(state, axis=None)
+        data = state if ordinal % KEYFRAME_EVERY == 0 else state ^ previous
+        return zlib.compress(np.packbits(data, axis=None).tobytes(), 1)
+
+    def _store(self, generation, state):
+        ordinal = generation // self.checkpoint_every
+        previous = None if self._last_checkpoint is None else self._last_checkpoint[1]
+        encoded = self._encode(state, self.storage, ordinal, previous)
+        self._checkpoints[generation] = encoded
+        size = len(encoded) if isinstance(encoded, bytes) else encoded.nbytes
+        self._checkpoint_nbytes += size
+        if self.storage == "deltas" and ordinal % KEYFRAME_EVERY == 0:
+            self._keyframes += 1
+            self._keyframe_nbytes += size
+        self._last_checkpoint = (generation, state)
+
+    def _load(self, generation):
+        """Grid of a checkpoint. "deltas" replays the XORs since the keyframe (or the last decoded one)."""
+        encoded = self._checkpoints[generation]
+        if self.storage == "frames":
+            return encoded
+        if self.storage == "packed":
+            return _freeze(self._unpack(encoded))
+
+        k = self.checkpoint_every
+        ordinal = generation // k
+        first = ordinal - ordinal % KEYFRAME_EVERY
+        if self._decoded is not None and self._decoded[0] == generation:
+            return self._decoded[1]
+        if self._decoded is not None and first * k <= self._decoded[0] < generation:
+            gen, state = self._decoded
+            state = state.copy()
+        else:
+            gen = first * k
+            state = self._unpack(np.frombuffer(zlib.decompress(self._checkpoints[gen]), dtype=np.uint8))
+        while gen < generation:
+            gen += k
+            state ^= self._unpack(np.frombuffer(zlib.decompress(self._checkpoints[gen]), dtype=np.uint8))
+        state = _freeze(state)
+        self._decoded = (generation, state)
+        return state
+
+    def compact(self, storage=None, checkpoint_every=None, cache_bytes=None):
+        """
+        Re-encodes the checkpoints already stored, e.g. to fit a smaller memory budget
+        (see gameoflife.memory). The new checkpoint_every must be a multiple of the current one.
+
+        Args:
+            storage (str | None): New representation (one of STORAGES), None keeps it.
+            checkpoint_every (int | None): New distance between checkpoints, None keeps it.
+            cache_bytes (int | None): New cache budget, None keeps it.
+        """
+        with self._lock:
+            storage = storage or self.storage
+            k = checkpoint_every or self.checkpoint_every
+            if storage not in STORAGES:
+                raise ValueError(f"Unknown storage '{storage}'. Available: {', '.join(STORAGES)}.")
+            if k % self.checkpoint_every:
+                raise ValueError("checkpoint_every must be a multiple of the current one.")
+
+            # Decode in order (cheap for delta chains) and re-encode the checkpoints kept
+            generations = sorted(g for g in self._checkpoints if g % k == 0)
+            checkpoints, nbytes, keyframes, keyframe_nbytes, previous = {}, 0, 0, 0, None
+            for gen in generations:
+                state = self._load(gen)
+                encoded = self._encode(state, storage, gen // k, previous)
+                checkpoints[gen] = encoded
+                size = len(encoded) if isinstance(encoded, bytes) else encoded.nbytes
+                nbytes += size
+                if storage == "deltas" and (gen // k) % KEYFRAME_EVERY == 0:
+                    keyframes += 1
+                    keyframe_nbytes += size
+                previous = state
+            self._checkpoints = checkpoints
+            self._checkpoint_nbytes = nbytes
+            self._keyframes = keyframes
+            self._keyframe_nbytes = keyframe_nbytes
+            self.storage = storage
+            self.checkpoint_every = k
+            self._last_checkpoint = (generations[-1], previous)
+            self._decoded = None
+
+            if cache_bytes is not None:
+                self.cache_bytes = cache_bytes
+                while self._cache and self._cache_nbytes > self.cache_bytes:
+                    _, old = self._cache.popitem(last=False)
+                    self._cache_nbytes -= old.nbytes
+
+    def _remember(self, generation, state):
+        """Adds a generation to the LRU cache, evicting the oldest ones beyond the budget."""
+        if generation in self._cache:
+            self._cache.move_to_end(generation)
+            return
+        if state.nbytes > self.cache_bytes:
+            return
+        self._cache[generation] = state
+        self._cache_nbytes += state.nbytes
+        while self._cache_nbytes > self.cache_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cache_nbytes -= old.nbytes
+
+    def _advance(self, state):
+        """Computes the generation after the frontier and stores it (checkpoint, progress)."""
+        state = _freeze(self._step(state))
+        self.steps += 1
+        self._frontier += 1
+        self._frontier_state = state
+        if self._frontier % self.checkpoint_every == 0:
+            self._store(self._frontier, state)
+        if self.progress is not None:
+            self.progress(self._frontier, state)
+        return state
+
+    # ---------------------------------------------------------------------------------
+    # Random access
+
+    def _frame(self, t, hint=None):
+        """
+        Generation t (0 <= t <= timesteps). Starts from the closest known generation before t:
+        the frontier or a checkpoint, a cached generation, or `hint` (generation, grid).
+        """
+        with self._lock:
+            state = self._cache.get(t)
+            if state is not None:
+                self.hits += 1
+                self._cache.move_to_end(t)
+                return state
+            self.misses += 1
+
+            # 1. Closest stored starting point
+            if t > self._frontier:
+                gen, state = self._frontier, self._frontier_state
+            else:
+                gen = t - t % self.checkpoint_every
+                state = None
+            if hint is not None and gen <= hint[0] <= t:
+                gen, state = hint
+            for g in range(t - 1, gen, -1):
+                cached = self._cache.get(g)
+                if cached is not None:
+                    gen, state = g, cached
+                    break
+            if state is None:
+                state = self._load(gen)
+                self._remember(gen, state)
+
+            # 2. Steps up to t, caching every generation on the way (the next accesses are
+            #    usually close by: scrubbing back and forth, or the next frame of a loop)
+            while gen < t:
+                if gen == self._frontier:
+                    state = self._advance(state)
+                else:
+                    state = _freeze(self._step(state))
+                    self.steps += 1
+                gen += 1
+                self._remember(gen, state)
+            return state
+
+    def _segment(self, start, stop):
+        """Generations start..stop (a checkpoint and the frames after it), as a list."""
+        with self._lock:
+            self._frame(stop)   # Computes the checkpoints up to stop if needed
+            state = self._cache.get(start)
+            if state is None:
+                state = self._load(start)
+            frames = [state]
+            for gen in range(start + 1, stop + 1):
+                cached = self._cache.get(gen)
+                if cached is None:
+                    cached = _freeze(self._step(frames[-1]))
+                    self.steps += 1
+                frames.append(cached)
+            for gen, state in enumerate(frames, start):
+                self._remember(gen, state)
+            return frames
+
+    def _iter_range(self, indices):
+        """Streams the generations of a range of valid indices (any step, either direction)."""
+        if indices.step > 0:
+            previous = None
+            for t in indices:
+                state = self._frame(t, hint=previous)
+                previous = (t, state)
+                yield state
+            return
+
+        # Backwards: one checkpoint segment at a time (at most K frames held here)
+        k = self.checkpoint_every
+        i = 0
+        while i < len(indices):
+            top = indices[i]
+            base = top - top % k
+            frames = self._segment(base, top)
+            while i < len(indices) and indices[i] >= base:
+                yield frames[indices[i] - base]
+                i += 1
+
+    def _index(self, index):
+        t = operator.index(index)
+        if t < 0:
+            t += len(self)
+        if not 0 <= t < len(self):
+            raise IndexError("Timeline index out of range.")
+        return t
+
+    # ---------------------------------------------------------------------------------
+    # Sequence interface
+
+    def __len__(self):
+        return self.timesteps + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TimelineSlice(self, range(len(self))[index])
+        return self._frame(self._index(index))
+
+    def __iter__(self):
+        return self._iter_range(range(len(self)))
+
+    def __reversed__(self):
+        return self._iter_range(range(len(self) - 1, -1, -1))
+
+    def __repr__(self):
+        return (f"Timeline({len(self)} generations of {self.shape[0]}x{self.shape[1]}, "
+                f"computed up to {self._frontier})")
+
+    # ---------------------------------------------------------------------------------
+    # Memory
+
+    @property
+    def nbytes(self):
+        """Bytes held: checkpoints, cache and the frontier generation."""
+        with self._lock:
+            return self._checkpoint_nbytes + self._cache_nbytes + self._frontier_state.nbytes
+
+    def cache_info(self):
+        """dict with the hits, misses and steps so far, and the memory used."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "steps": self.steps,
+                    "computed": self._frontier, "cached_frames": len(self._cache),
+                    "cache_bytes": self._cache_nbytes, "checkpoints": len(self._checkpoints),
+                    "checkpoint_bytes": self._checkpoint_nbytes, "keyframes": self._keyframes,
+                    "keyframe_bytes": self._keyframe_nbytes, "storage": self.storage}
+
+    def clear_cache(self):
+        """Drops the cached generations (the checkpoints are kept)."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_nbytes = 0
+
+
+class TimelineSlice(Sequence):
+    """Lazy view of some generations of a Timeline (result of timeline[start:stop:step])."""
+
+    def __init__(self, timeline, indices):
+        self.timeline = timeline
+        self.indices = indices      # range of generations
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TimelineSlice(self.timeline, self.indices[index])
+        return self.timeline._frame(self.indices[operator.index(index)])
+
+    def __iter__(self):
+        return self.timeline._iter_range(self.indices)
+
+    def __reversed__(self):
+        return self.timeline._iter_range(self.indices[::-1])
+
+    def __repr__(self):
+        return f"TimelineSlice(generations {self.indices!r})"
@@ -0,0 +1,220 @@
+"""
+Auto-growing universe: a dense grid with dead boundaries that follows the pattern.
+
+Instead of a fixed torus much bigger than the pattern (so that gliders do not wrap around),
+the live cells are kept in a backing array only a little bigger than their bounding box:
+    - before every step, if the live cells come within `margin` cells of an edge, the array
+      is reallocated `growth` times bigger than the live area (geometric growth, so a gun
+      that emits gliders forever costs O(log T) reallocations);
+    - when the live area falls below 1 / (2 * growth) of the array, it is shrunk back;
+    - `origin` records the global coordinates of the array's top-left cell, so positions,
+      bounding box and center of mass are stable global coordinates (those of the initial grid).
+The plane is infinite (no wrap, no wall): cells are never lost at an edge, because the live
+cells always stay at least one cell away from it. Compute and memory follow the pattern's
+actual extent.
+
+Usage:
+    universe = Universe(grid)              # grid: 2D boolean array, global coordinates (0, 0) = grid[0, 0]
+    for _ in range(1000):
+        universe.step()
+    print(universe.generation, universe.population, universe.bbox, universe.center_of_mass())
+    view = universe.window(0, 0, 60, 80)   # fixed global window, e.g. for plotting
+"""
+
+import numpy as np
+
+try:
+    from . import engines
+except ImportError:     # Module used outside the package (e.g. "import universe")
+    import engines
+
+
+DEFAULT_MARGIN = 8          # Free cells kept between the live cells and the edges
+DEFAULT_GROWTH = 2.0        # Size of a reallocated array, relative to the live area plus margins
+
+
+# =======================================================================================
+# =======================================================================================
+
+# Universe
+
+def _live_span(occupied):
+    """(first, last + 1) of the True entries of a 1D mask, or None if there is none."""
+    idx = np.flatnonzero(occupied)
+    if idx.size == 0:
+        return None
+    return int(idx[0]), int(idx[-1]) + 1
+
+
+class Universe:
+    """Dense grid on an infinite plane, reallocated to follow the live cells (see module docstring)."""
+
+    def __init__(self, grid, rule=engines.DEFAULT_RULE, engine=engines.DEFAULT_ENGINE,
+                 margin=DEFAULT_MARGIN, growth=DEFAULT_GROWTH):
+        """
+        Args:
+            grid (np.ndarray): 2D boolean array with the generation zero. Its cell [0, 0] is the
+                               global position (0, 0); it is copied into a fitted backing array.
+            rule (str): Life-like rule "B.../S..." (rules with B0 would fill the infinite plane).
+            engine (str | Engine): Evolution engine (see gameoflife.engines), run with dead boundaries.
+            margin (int): Free cells kept between the live cells and the edges (at least 1).
+            growth (float): Backing array size relative to the live area plus margins (> 1).
+        """
+        # Anti bug checks
+        grid = np.asarray(grid)
+        if grid.ndim != 2:
+            raise ValueError(f"Input array must be 2D, but got {grid.ndim}D.")
+        if margin < 1:
+            raise ValueError("margin must be at least 1: live cells must never touch an edge.")
+        if growth <= 1:
+            raise ValueError("growth must be greater than 1.")
+        rule = engines.normalize_rule(rule)
+        if 0 in engines.parse_rule(rule)[0]:
+            raise ValueError(f"Rule {rule} gives birth on empty neighborhoods: the plane would fill up.")
+
+        self.rule = rule
+        self.engine_choice = engine
+        self.margin = margin
+        self.growth = growth
+        self.generation = 0
+        self.reallocations = 0      # Refits during the evolution (the initial fit is not counted)
+
+        self.cells = np.zeros((0, 0), dtype=bool)
+        self.origin = (0, 0)        # Global (row, col) of cells[0, 0]
+        self._bounds = None         # Live cells in array coordinates: (row0, row1, col0, col1), ends excluded
+        self._fit(grid.astype(bool), (0, 0))
+
+    # ---------------------------------------------------------------------------------
+    # Backing array
+
+    def _fit(self, cells, origin):
+        """Reallocates the backing array around the live cells of `cells` (placed at `origin`)."""
+        rows = _live_span(cells.any(axis=1))
+        if rows is None:
+            # Empty universe: a minimal array, the origin is kept for the next patterns
+            shape = (2 * self.margin, 2 * self.margin)
+            self.cells = np.zeros(shape, dtype=bool)
+            self.origin = origin
+            self._bounds = None
+            self._choose_engine()
+            return
+        cols = _live_span(cells.any(axis=0))
+        height, width = rows[1] - rows[0], cols[1] - cols[0]
+
+        # New shape: live area plus margins, times growth; live cells centered
+        shape = tuple(int(np.ceil((extent + 2 * self.margin) * self.growth)) for extent in (height, width))
+        top = (shape[0] - height) // 2
+        left = (shape[1] - width) // 2
+        fitted = np.zeros(shape, dtype=bool)
+        fitted[top:top + height, left:left + width] = cells[rows[0]:rows[1], cols[0]:cols[1]]
+
+        self.cells = fitted
+        self.origin = (origin[0] + rows[0] - top, origin[1] + cols[0] - left)
+        self._bounds = (top, top + height, left, left + width)
+        self._choose_engine()
+
+    def _choose_engine(self):
+        # Chosen again for every new shape (cheap: the cost model is loaded once per process)
+        self._step = engines.make_step(self.engine_choice, self.cells, horizon=1,
+                                       boundary="dead", rule=self.rule)
+
+    def _update_bounds(self):
+        rows = _live_span(self.cells.any(axis=1))
+        if rows is None:
+            self._bounds = None
+            return
+        cols = _live_span(self.cells.any(axis=0))
+        self._bounds = (rows[0], rows[1], cols[0], cols[1])
+
+    def _needs_refit(self):
+        """True when the live cells are within `margin` of an edge, or use a small part of the array."""
+        if self._bounds is None:
+            return self.cells.shape != (2 * self.margin, 2 * self.margin)
+        row0, row1, col0, col1 = self._bounds
+        rows, cols = self.cells.shape
+        if min(row0, col0, rows - row1, cols - col1) < self.margin:
+            return True
+        # Shrink with hysteresis: a refit makes the array `growth` times the live area, so only
+        # a further drop by a factor 2 triggers a new one
+        limit = 2 * self.growth
+        return ((row1 - row0 + 2 * self.margin) * limit < rows
+                or (col1 - col0 + 2 * self.margin) * limit < cols)
+
+    # ---------------------------------------------------------------------------------
+    # Evolution
+
+    def step(self, n=1):
+        """Computes the next n generations. Returns self."""
+        for _ in range(n):
+            if self._needs_refit():
+                self._fit(self.cells, self.origin)
+                self.reallocations += 1
+            if self._bounds is None:
+                self.generation += 1       # Nothing alive: nothing can ever be born (no B0)
+                continue
+            self.cells = self._step(self.cells)
+            self._update_bounds()
+            self.generation += 1
+        return self
+
+    def __iter__(self):
+        """Endless iterator: steps the universe and yields it after every generation."""
+        while True:
+            yield self.step()
+
+    # ---------------------------------------------------------------------------------
+    # Global coordinates
+
+    @property
+    def shape(self):
+        """Shape of the backing array (memory and compute follow it, not the covered area)."""
+        return self.cells.shape
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.cells))
+
+    @property
+    def bbox(self):
+        """Global bounding box of the live cells (row0, col0, row1, col1), ends excluded, or None."""
+        if self._bounds is None:
+            return None
+        row0, row1, col0, col1 = self._bounds
+        return (row0 + self.origin[0], col0 + self.origin[1], row1 + self.origin[0], col1 + self.origin[1])
+
+    def live_cells(self):
+        """(N, 2) int array with the global (row, col) of every live cell."""
+        return np.argwhere(self.cells) + np.array(self.origin)
+
+    def center_of_mass(self):
+        """Global (row, col) of the center of mass, (nan, nan) when nothing is alive."""
+        indices = np.argwhere(self.cells)
+        if indices.size == 0:
+            return np.nan, np.nan
+        mean_pos = indices.mean(axis=0)
+        return mean_pos[0] + self.origin[0], mean_pos[1] + self.origin[1]
+
+    def window(self, top, left, rows, cols):
+        """
+        Copy of a fixed global window (e.g. the initial grid size, for plotting).
+        Cells outside the backing array are dead.
+        """
+        view = np.zeros((rows, cols), dtype=bool)
+        r0, c0 = top - self.origin[0], left - self.origin[1]
+        src_r0, src_c0 = max(r0, 0), max(c0, 0)
+        src_r1 = min(r0 + rows, self.cells.shape[0])
+        src_c1 = min(c0 + cols, self.cells.shape[1])
+        if src_r0 < src_r1 and src_c0 < src_c1:
+            view[src_r0 - r0:src_r1 - r0, src_c0 - c0:src_c1 - c0] = self.cells[src_r0:src_r1, src_c0:src_c1]
+        return view
+
+    def crop(self):
+        """(top, left, cells): the live cells cropped to their bounding box, at global (top, left)."""
+        if self._bounds is None:
+            return self.origin[0], self.origin[1], np.zeros((0, 0), dtype=bool)
+        row0, row1, col0, col1 = self._bounds
+        return row0 + self.origin[0], col0 + self.origin[1], self.cells[row0:row1, col0:col1].copy()
+
+    def __repr__(self):
+        return (f"Universe(generation={self.generation}, population={self.population}, "
+                f"bbox={self.bbox}, array={self.shape[0]}x{self.shape[1]})")
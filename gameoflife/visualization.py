@@ -2,7 +2,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import matplotlib.animation as animation
-import evolution as evo
+
+try:
+    from . import engines
+    from . import producer as prod
+    from . import raster
+except ImportError:     # Module used outside the package (e.g. "import visualization")
+    import engines
+    import producer as prod
+    import raster
 
 
 # Color configuration for visualization
@@ -12,6 +20,10 @@ COLORS = {
     "Grid"  : "#505050",        # Grid color (light gray)
 }
 
+GRID_LINES_MAX_CELLS = 100      # Above this many cells per side, no grid lines are drawn
+STREAM_MIN_CELLS = 300          # From this many cells per side, notebooks stream the frames
+STREAM_MAX_PIXELS = 600         # Size (pixels) of the streamed images
+
 
 
 
@@ -39,21 +51,79 @@ def is_notebook() -> bool:
 
 
 
-def create_evolution(grid: np.ndarray, frames: int, interval: int) -> animation.FuncAnimation:
+def _render_settings(shape, max_pixels):
+    """
+    Chooses how a grid is drawn in an image at most max_pixels = (height, width) pixels large.
+    Returns (block, grid_lines): block > 1 merges block x block cells into one pixel
+    (shown as a density shade), grid_lines is True only for grids small enough to show them.
+    """
+    rows, cols = shape
+    block = max(1, int(np.ceil(max(rows / max_pixels[0], cols / max_pixels[1]))))
+    grid_lines = block == 1 and max(rows, cols) <= GRID_LINES_MAX_CELLS
+    return block, grid_lines
+
+
+def _palette():
+    """256 x 3 uint8 palette mapping the indices of gameoflife.raster to the COLORS of this module."""
+    to_rgb = lambda name: tuple(int(round(255 * c)) for c in mcolors.to_rgb(name))
+    return raster.make_palette(to_rgb(COLORS["Dead"]), to_rgb(COLORS["Alive"]), to_rgb(COLORS["Grid"]))
+
+
+def _palette_cmap():
+    """Colormap version of _palette(), for imshow with NoNorm."""
+    return mcolors.ListedColormap(_palette() / 255.0)
+
+
+def create_evolution(grid: np.ndarray, frames: int, interval: int,
+                     grid_lines: bool = None, background: bool = False, buffer_size: int = 8,
+                     timeline=None, step=None, engine=engines.DEFAULT_ENGINE) -> animation.FuncAnimation:
     """
     Creates the Game of Life grid evolution using matplotlib.
     Helper function to be used by plot_evolution.
     Args (passed by plot_evolution):
         grid (np.ndarray): 2D array (either boolean or numeric) representing the initial state.
+                           Can be None when a timeline is given.
         frames (int): Number of generations to animate.
         interval (int): Time in milliseconds between frames.
+        grid_lines (bool | None): Draw a line between cells. None (default) draws them only
+                                  up to GRID_LINES_MAX_CELLS cells per side.
+        background (bool): Compute the generations ahead in a background thread
+                           (gameoflife.producer.FrameProducer, at most buffer_size frames ahead),
+                           so that drawing a frame never waits for `step`.
+        buffer_size (int): Frames computed ahead in background mode.
+        timeline (Sequence[np.ndarray] | None): Precomputed generations to replay (e.g. the output
+                                                of evolution.evolution, a stored run or a lazy
+                                                gameoflife.timeline.Timeline). Frame i shows timeline[i + 1].
+        step (callable | None): Function grid -> next grid. None = one step of `engine`.
+        engine (str): Evolution engine used when no step is given (see gameoflife.engines),
+                      "auto" picks the fastest one for this grid and number of frames
+                      (calibrated once per machine).
     Returns:
         animation.FuncAnimation: The animation object that can be displayed in Jupyter.
+
+    Large grids are drawn at the resolution of the figure: when there are more cells than
+    pixels, every pixel shows the density of a block x block square of cells.
     """
 
+    # 0. Source of the generations: a precomputed timeline, a background producer,
+    #    or `step` called in the drawing loop
+    producer = None
+    if step is None and timeline is None:
+        step = engines.make_step(engine, grid, horizon=frames)
+    if timeline is not None:
+        grid = timeline[0]
+        frames = min(frames, len(timeline) - 1)
+        next_state = None
+    elif background:
+        producer = prod.FrameProducer(grid, step=step, maxsize=buffer_size, stop_when=None).start()
+        next_state = lambda: _next_from_producer(producer)
+    else:
+        next_state = lambda: step(shown["state"])
+
     # 1. Create a personalized colormap
-    colors_list = [COLORS["Dead"], COLORS["Alive"]]
-    cmap = mcolors.ListedColormap(colors_list)
+    #    The frames are uint8 palette indices (see gameoflife.raster): NoNorm uses them
+    #    directly as colormap entries, so no conversion to int / float is needed
+    cmap = _palette_cmap()
     
 
 
@@ -72,23 +142,34 @@ def create_evolution(grid: np.ndarray, frames: int, interval: int) -> animation.
     w = min(w, max_size)
     h = min(h, max_size)
 
+    # Pixels available for the grid: more cells than that are merged into blocks
+    dpi = 120
+    block, auto_lines = _render_settings(grid.shape, (int(h * dpi), int(w * dpi)))
+    if grid_lines is None:
+        grid_lines = auto_lines
+    render = lambda g: raster.cells_to_indices(np.asarray(g, dtype=bool), block=block)
+
 
 
     # 3. Visualization 
     #    We use imshow because it's very efficient for displaying 2D arrays.
     #    We add interpolation='nearest' to avoid blurring of the cells.
-    #    We add .astype(int) in case the grid is boolean, so it coverts False->0, True->1
-    fig, ax = plt.subplots(figsize=(w,h), dpi=120)    
-    img = ax.imshow(grid.astype(int), cmap=cmap, interpolation='nearest')
+    #    The extent keeps the axes in cell units even when the image is downsampled
+    fig, ax = plt.subplots(figsize=(w,h), dpi=dpi)    
+    img = ax.imshow(render(grid), cmap=cmap, norm=mcolors.NoNorm(), interpolation='nearest',
+                    extent=(-0.5, cols - 0.5, rows - 0.5, -0.5))
 
 
 
     # 4. Aesthetic adjustments
     #    First, we use major tick positions to definire where grid lines should be drawn
-    #    -0.5 is used to center the grid lines between the cells
-    ax.set_xticks(np.arange(-0.5, cols, 1))
-    ax.set_yticks(np.arange(-0.5, rows, 1))
-    ax.grid(which='major', color=COLORS["Grid"], linestyle='-', linewidth=1)
+    #    -0.5 is used to center the grid lines between the cells.
+    #    For large grids one tick per cell is very slow to draw and the lines would
+    #    cover the cells, so they are skipped
+    if grid_lines:
+        ax.set_xticks(np.arange(-0.5, cols, 1))
+        ax.set_yticks(np.arange(-0.5, rows, 1))
+        ax.grid(which='major', color=COLORS["Grid"], linestyle='-', linewidth=1)
      
     # Then, we remove the ticks marks and labels for a cleaner look (grid lines remain visible).
     # We also set the title, pad is used to add some space between title and grid
@@ -99,19 +180,28 @@ def create_evolution(grid: np.ndarray, frames: int, interval: int) -> animation.
 
     # 5. Creating the animation
     #    First, we create a function to "update" every frame
+    #    `shown` remembers the frame on screen: FuncAnimation draws frame 0 twice
+    #    (initial draw and first frame), which must not advance the simulation twice
+    shown = {"frame": -1, "state": grid}
+
     def update(frame):
         """
         This function is called by FuncAnimation for every frame.
         """
-        # 1. Compute the next generation of the grid. 
-        #    Keyword nonlocal "tells" Python to edit the variable "grid" from
-        #    the external scope, avoiding creating a new local variable
-        nonlocal grid
-        grid = evo.newgen(grid)
+        # 1. Get the generation of this frame: from the timeline, or the next one
+        #    (computed now, or already waiting in the producer's buffer)
+        if timeline is not None:
+            shown["state"] = timeline[frame + 1]
+        else:
+            while shown["frame"] < frame:
+                shown["state"] = next_state()
+                shown["frame"] += 1
+        if producer is not None and frame == frames - 1:
+            producer.stop()         # Last frame: nothing else to compute
 
         # 2. Update the image data and title text. 
         #    Instead of plotting again, we just update the data of the existing image
-        img.set_data(grid.astype(int))
+        img.set_data(render(shown["state"]))
         title.set_text(f"Game of Life - Dimension: {rows}x{cols}\nGeneration: {frame+1}")
 
         # Return a list of elements that have changed to be used by blit for optimization.
@@ -126,6 +216,10 @@ def create_evolution(grid: np.ndarray, frames: int, interval: int) -> animation.
     use_blit = is_notebook()
     anim = animation.FuncAnimation(fig, update, frames=frames, interval=interval, 
                                    blit=use_blit, repeat=False)
+
+    # Closing the window stops the background worker
+    if producer is not None:
+        fig.canvas.mpl_connect("close_event", lambda event: producer.stop())
     
     # Close the figure only in notebook environments to prevent static image display
     # In regular Python scripts, we need to keep it open for plt.show()
@@ -135,11 +229,78 @@ def create_evolution(grid: np.ndarray, frames: int, interval: int) -> animation.
     return anim
 
 
-def plot_evolution(grid: np.ndarray, frames: int, FPS: int) -> None:
+def _next_from_producer(producer):
+    """Next generation computed by a FrameProducer (waits for it if needed)."""
+    frame = producer.get()
+    if frame is None:
+        if producer.error is not None:
+            raise producer.error
+        raise RuntimeError("The background producer stopped before the end of the animation.")
+    return frame.state
+
+
+def stream_evolution(grid: np.ndarray, frames: int, FPS: int,
+                     max_pixels: int = STREAM_MAX_PIXELS, engine: str = engines.DEFAULT_ENGINE) -> None:
+    """
+    Shows the evolution in a Jupyter notebook by replacing a single image in place.
+    Used by plot_evolution for large grids: each generation is computed, rendered
+    (at most max_pixels x max_pixels, see _render_settings) and shown right away,
+    and the notebook keeps only the last frame instead of every frame as in to_jshtml().
+
+    Args:
+        grid (np.ndarray): 2D array representing the initial grid state.
+        frames (int): Number of generations to show.
+        FPS (int): Maximum frames per second.
+        max_pixels (int): Size of the images in pixels.
+        engine (str): Evolution engine (see gameoflife.engines).
+    """
+    import io
+    import time
+    from IPython.display import HTML, Image, display
+    from PIL import Image as PILImage
+
+    # 1. Rendering settings: downsample large grids, upscale small ones
+    rows, cols = grid.shape
+    block, grid_lines = _render_settings(grid.shape, (max_pixels, max_pixels))
+    cell_size = max(1, max_pixels // (max(rows, cols) // block))
+    palette = _palette().tobytes()
+    step = engines.make_step(engine, grid, horizon=frames)
+
+    def to_png(g):
+        indices = raster.cells_to_indices(np.asarray(g, dtype=bool), block=block)
+        pixels = np.ascontiguousarray(raster.upscale(indices, cell_size, grid_lines=grid_lines))
+        image = PILImage.frombuffer("P", (pixels.shape[1], pixels.shape[0]), pixels, "raw", "P", 0, 1)
+        image.putpalette(palette)
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", compress_level=1)     # Speed over size, frames are replaced
+        return buffer.getvalue()
+
+    def caption(generation):
+        return HTML(f"<b>Game of Life - Dimension: {rows}x{cols}</b><br>Generation: {generation}")
+
+    # 2. One output for the title and one for the image, updated at every frame
+    title = display(caption(1), display_id=True)
+    image = display(Image(data=to_png(grid)), display_id=True)
+
+    # 3. Compute and show the next generations, no faster than FPS
+    next_time = time.perf_counter() + 1 / FPS
+    for generation in range(2, frames + 1):
+        grid = step(grid)
+        png = to_png(grid)
+        time.sleep(max(0.0, next_time - time.perf_counter()))
+        next_time = time.perf_counter() + 1 / FPS
+        image.update(Image(data=png))
+        title.update(caption(generation))
+
+    return None
+
+
+def plot_evolution(grid: np.ndarray, frames: int, FPS: int, **kwargs) -> None:
     """
     Plots the Game of Life grid evolution.
     Automatically detects the environment and uses:
-    - HTML display for Jupyter notebooks
+    - HTML display for Jupyter notebooks (frames streamed one at a time for large grids,
+      see stream_evolution)
     - plt.show() for regular Python scripts
     
     Args:
@@ -147,13 +308,21 @@ def plot_evolution(grid: np.ndarray, frames: int, FPS: int) -> None:
         frames (int): Number of generations to animate.
         FPS (int): Frames per second for the animation (converted in "interval": delay
                    between frames in milliseconds).
+        **kwargs: Options of create_evolution (grid_lines, background, buffer_size, timeline, step, engine).
     """
 
-    # 1. Use the helper function to create the animation object
+    # 1. Large grids in a notebook: stream the frames instead of embedding all of them
+    if is_notebook() and set(kwargs) <= {"engine"} and max(grid.shape) >= STREAM_MIN_CELLS:
+        try:
+            return stream_evolution(grid, frames, FPS, **kwargs)
+        except ImportError:
+            pass    # IPython or Pillow not available: fall back to the animation below
+
+    # 2. Use the helper function to create the animation object
     interval = 1000 // FPS  # Convert FPS to interval in milliseconds
-    anim = create_evolution(grid, frames, interval=interval)
+    anim = create_evolution(grid, frames, interval=interval, **kwargs)
 
-    # 2. Display the animation based on the environment
+    # 3. Display the animation based on the environment
     if is_notebook():
         # In Jupyter notebook: use HTML display with styling
         try:
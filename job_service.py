@@ -0,0 +1,576 @@
+"""
+Local simulation job service.
+
+Other tools submit SimulationRunner.run configurations over HTTP (localhost TCP or a Unix
+socket), follow their progress and fetch the results, while the simulations run in a
+bounded pool of worker processes. Everything runs offline on one machine.
+
+    - priority queue: higher "priority" first, then submission order;
+    - deduplication: submitting a configuration identical to a queued or running job
+      (same config and engine) returns that job instead of starting a new one;
+    - cancellation: queued jobs are dropped, running ones stop at their next progress check
+      (a deduplicated job is only cancelled once every submitter has cancelled it);
+    - progress: {"generation", "population"} events, streamed as JSON lines;
+    - results: compressed .npz bytes (series, heatmap, and the scalars as JSON), see decode_result.
+
+API (JSON unless stated otherwise):
+    POST   /jobs               {"config": {...}, "priority": 0, "engine": "auto"} -> {"id", "state", "deduplicated"}
+    GET    /jobs               -> list of job statuses
+    GET    /jobs/<id>          -> {"id", "state", "generation", "population", "error", ...}
+    GET    /jobs/<id>/events   -> JSON lines, one per progress event, until the job ends
+    GET    /jobs/<id>/result   -> application/octet-stream (.npz), 409 until the job is done
+    DELETE /jobs/<id>          -> cancels the job
+
+Usage:
+    python job_service.py --port 8765 --workers 4
+    python job_service.py --unix /tmp/gameoflife.sock
+
+    client = JobClient(port=8765)                   # or JobClient(unix="/tmp/gameoflife.sock")
+    job = client.submit(config, priority=5)
+    for event in client.events(job["id"]):
+        print(event["generation"], event["population"])
+    data = client.result(job["id"])                 # dict of arrays and scalars
+"""
+
+import asyncio
+import heapq
+import http.client
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+
+import numpy as np
+
+import gameoflife.dataset as ds
+
+
+PROGRESS_INTERVAL = 0.1     # Seconds between two progress events of a running job
+KEEP_RESULTS = 1000         # Finished jobs kept in memory (oldest dropped first)
+
+FINAL_STATES = ("done", "failed", "cancelled")
+
+
+def _json_default(value):
+    """numpy scalars and arrays, tuples: not JSON types."""
+    return value.item() if hasattr(value, "item") else list(value)
+
+
+# ==========================================
+# 1. RESULT ENCODING
+# ==========================================
+
+def encode_result(data):
+    """
+    Packs the output of SimulationRunner.run into compressed .npz bytes:
+    one array per series, the heatmap, and "meta" (the config and scalar results as JSON).
+    """
+    from analysis import SERIES_KEYS, SCALAR_KEYS
+    meta = {key: data.get(key) for key in SCALAR_KEYS}
+    meta["config"] = data["config"]
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer,
+                        meta=np.frombuffer(json.dumps(meta, default=_json_default).encode(), dtype=np.uint8),
+                        heatmap=np.asarray(data["heatmap"]),
+                        **{key: np.asarray(data[key]) for key in SERIES_KEYS})
+    return buffer.getvalue()
+
+
+def decode_result(payload):
+    """Inverse of encode_result: dict with the series and heatmap arrays plus the scalars."""
+    with np.load(io.BytesIO(payload)) as archive:
+        data = {name: archive[name] for name in archive.files if name != "meta"}
+        data.update(json.loads(archive["meta"].tobytes()))
+    return data
+
+
+# ==========================================
+# 2. WORKER SIDE
+# ==========================================
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+_EVENTS = None      # Queue of (job_id, generation, population) progress events
+_CANCELLED = None   # Shared dict of the cancelled job ids
+
+
+def _ignore_sigint():
+    """Ctrl+C reaches the whole process group: only the service process handles it."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _init_worker(events, cancelled):
+    global _EVENTS, _CANCELLED
+    _ignore_sigint()
+    _EVENTS, _CANCELLED = events, cancelled
+
+
+def _run_job(job_id, config, engine):
+    """
+    Runs one configuration in a worker process and returns the encoded result,
+    or None if the job was cancelled.
+    """
+    from analysis import SimulationRunner
+    last = [0.0]
+
+    def progress(generation, state):
+        now = time.monotonic()
+        if now - last[0] < PROGRESS_INTERVAL:
+            return
+        last[0] = now
+        if job_id in _CANCELLED:
+            raise JobCancelled(job_id)
+        _EVENTS.put((job_id, generation, int(np.count_nonzero(state))))
+
+    try:
+        if job_id in _CANCELLED:
+            raise JobCancelled(job_id)
+        data = SimulationRunner.run(config, engine=engine, progress=progress)
+    except JobCancelled:
+        return None     # Not re-raised: the exception class may not unpickle in the service process
+    _EVENTS.put((job_id, config["steps"], int(data["population"][-1])))
+    return encode_result(data)
+
+
+# ==========================================
+# 3. SERVICE
+# ==========================================
+
+class Job:
+    """State of one submitted configuration (lives in the service process)."""
+
+    def __init__(self, job_id, key, config, engine, priority):
+        self.id = job_id
+        self.key = key                  # Deduplication key
+        self.config = config
+        self.engine = engine
+        self.priority = priority
+        self.state = "queued"
+        self.submitters = 1             # Identical submissions attached to this job
+        self.generation = 0
+        self.population = None
+        self.error = None
+        self.result = None              # Encoded result (bytes) once done
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.listeners = []             # asyncio.Queue of the open /events streams
+        self.heap_entry = None
+
+    def status(self):
+        return {"id": self.id, "state": self.state, "priority": self.priority,
+                "name": self.config.get("name"), "steps": self.config.get("steps"),
+                "generation": self.generation, "population": self.population,
+                "submitters": self.submitters, "error": self.error,
+                "submitted": self.submitted, "started": self.started, "finished": self.finished,
+                "result_bytes": None if self.result is None else len(self.result)}
+
+
+class JobService:
+    """Priority queue, deduplication and cancellation in front of a bounded process pool."""
+
+    def __init__(self, workers=None, keep_results=KEEP_RESULTS):
+        self.workers = workers or os.cpu_count() or 1
+        self.keep_results = keep_results
+        self.jobs = {}                  # id -> Job (finished ones included, up to keep_results)
+        self.active = {}                # dedup key -> queued or running Job
+        self.running = 0
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        self._loop = None
+        self._pool = None
+
+    def start(self):
+        """Starts the worker pool (must be called from the event loop)."""
+        self._loop = asyncio.get_running_loop()
+        context = multiprocessing.get_context("spawn")     # No fork of a process running threads
+        self._manager = SyncManager(ctx=context)
+        self._manager.start(_ignore_sigint)
+        self._cancelled = self._manager.dict()
+        self._events = context.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                         initializer=_init_worker,
+                                         initargs=(self._events, self._cancelled))
+        self._reader = threading.Thread(target=self._read_events, name="JobEvents", daemon=True)
+        self._reader.start()
+
+    def close(self):
+        for job in list(self.active.values()):
+            self._cancelled[job.id] = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._events.put(None)
+        self._reader.join()
+        self._manager.shutdown()
+
+    # ---------------------------------------------------------------------------------
+    # Requests
+
+    def submit(self, config, priority=0, engine="auto"):
+        """Queues a configuration. Returns (job, deduplicated)."""
+        for field in ("name", "category", "pattern_name", "grid_size", "steps", "pos"):
+            if field not in config:
+                raise ValueError(f"Missing configuration field '{field}'.")
+        key = ds.config_key({"config": config, "engine": engine})
+        job = self.active.get(key)
+        if job is not None:
+            job.submitters += 1
+            if job.state == "queued" and priority > job.priority:
+                self._push(job, priority)   # Raised by the new submitter
+            return job, True
+
+        job = Job(next(self._ids), key, config, engine, priority)
+        self.jobs[job.id] = job
+        self.active[key] = job
+        self._push(job, priority)
+        self._schedule()
+        return job, False
+
+    def cancel(self, job_id):
+        """Cancels a job for one submitter. Returns the job."""
+        job = self.jobs[job_id]
+        if job.state in FINAL_STATES:
+            return job
+        job.submitters -= 1
+        if job.submitters > 0:
+            return job
+        if job.state == "queued":
+            job.heap_entry = None       # Left in the heap, skipped when popped
+            self._finish(job, "cancelled")
+        else:
+            self._cancelled[job.id] = True      # Seen by the worker at its next progress check
+        return job
+
+    def subscribe(self, job):
+        """Queue receiving the progress events of a job (None marks the end)."""
+        queue = asyncio.Queue()
+        if job.state in FINAL_STATES:
+            queue.put_nowait(None)
+        else:
+            job.listeners.append(queue)
+        return queue
+
+    # ---------------------------------------------------------------------------------
+    # Scheduling
+
+    def _push(self, job, priority):
+        job.priority = priority
+        job.heap_entry = (-priority, next(self._order), job.id)
+        heapq.heappush(self._heap, job.heap_entry)
+
+    def _schedule(self):
+        """Starts queued jobs while workers are free (the pool never holds a backlog)."""
+        while self.running < self.workers and self._heap:
+            entry = heapq.heappop(self._heap)
+            job = self.jobs.get(entry[2])
+            if job is None or job.heap_entry is not entry or job.state != "queued":
+                continue        # Cancelled, or re-queued with a higher priority
+            job.state = "running"
+            job.started = time.time()
+            self.running += 1
+            self._notify(job)
+            future = self._loop.run_in_executor(self._pool, _run_job, job.id, job.config, job.engine)
+            future.add_done_callback(lambda f, job=job: self._done(job, f))
+
+    def _done(self, job, future):
+        self.running -= 1
+        self._cancelled.pop(job.id, None)
+        if future.cancelled() or (future.exception() is None and future.result() is None):
+            self._finish(job, "cancelled")
+        elif future.exception() is not None:
+            job.error = f"{type(future.exception()).__name__}: {future.exception()}"
+            self._finish(job, "failed")
+        else:
+            job.result = future.result()
+            self._finish(job, "done")
+        self._schedule()
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished = time.time()
+        if self.active.get(job.key) is job:
+            del self.active[job.key]
+        self._notify(job)
+        for queue in job.listeners:
+            queue.put_nowait(None)
+        job.listeners.clear()
+
+        # Forget the oldest finished jobs
+        finished = [j for j in self.jobs.values() if j.state in FINAL_STATES]
+        for old in finished[:max(0, len(finished) - self.keep_results)]:
+            del self.jobs[old.id]
+
+    # ---------------------------------------------------------------------------------
+    # Progress events
+
+    def _read_events(self):
+        """Thread forwarding the workers' progress events to the event loop."""
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._progress, *item)
+
+    def _progress(self, job_id, generation, population):
+        job = self.jobs.get(job_id)
+        if job is None or job.state != "running":
+            return
+        job.generation, job.population = generation, population
+        self._notify(job)
+
+    def _notify(self, job):
+        event = {"id": job.id, "state": job.state,
+                 "generation": job.generation, "population": job.population}
+        for queue in job.listeners:
+            queue.put_nowait(event)
+
+
+# ==========================================
+# 4. HTTP INTERFACE
+# ==========================================
+
+class _HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+
+async def _read_request(reader):
+    """Parses one HTTP/1.1 request. Returns (method, path, body)."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise _HttpError(400, "Malformed request line.")
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0].rstrip("/"), body
+
+
+def _response(status, body=b"", content_type="application/json"):
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def _json(status, value):
+    return _response(status, json.dumps(value, default=_json_default).encode())
+
+
+class JobServer:
+    """Serves a JobService over HTTP on localhost TCP or a Unix socket."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def handle(self, reader, writer):
+        try:
+            request = await _read_request(reader)
+            if request is not None:
+                await self._route(*request, writer)
+        except _HttpError as e:
+            writer.write(_json(e.status, {"error": str(e)}))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:      # Reported to the client, the server keeps running
+            writer.write(_json(500, {"error": f"{type(e).__name__}: {e}"}))
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _job(self, job_id):
+        try:
+            return self.service.jobs[int(job_id)]
+        except (KeyError, ValueError):
+            raise _HttpError(404, f"No job {job_id}.")
+
+    async def _route(self, method, path, body, writer):
+        parts = path.strip("/").split("/")
+        if parts[0] != "jobs":
+            raise _HttpError(404, f"Unknown path {path}.")
+
+        # /jobs
+        if len(parts) == 1:
+            if method == "GET":
+                writer.write(_json(200, [job.status() for job in self.service.jobs.values()]))
+            elif method == "POST":
+                try:
+                    request = json.loads(body or b"{}")
+                    job, deduplicated = self.service.submit(request["config"], int(request.get("priority", 0)),
+                                                            request.get("engine", "auto"))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise _HttpError(400, f"Invalid job: {e}")
+                writer.write(_json(202, {**job.status(), "deduplicated": deduplicated}))
+            else:
+                raise _HttpError(405, f"{method} not allowed on /jobs.")
+            return
+
+        job = self._job(parts[1])
+        action = parts[2] if len(parts) > 2 else None
+        if action is None and method == "GET":
+            writer.write(_json(200, job.status()))
+        elif action is None and method == "DELETE":
+            writer.write(_json(200, self.service.cancel(job.id).status()))
+        elif action == "result" and method == "GET":
+            if job.state != "done":
+                raise _HttpError(409, f"Job {job.id} is {job.state}.")
+            writer.write(_response(200, job.result, "application/octet-stream"))
+        elif action == "events" and method == "GET":
+            await self._stream_events(job, writer)
+        else:
+            raise _HttpError(404 if action not in (None, "result", "events") else 405,
+                             f"{method} {path} is not supported.")
+
+    async def _stream_events(self, job, writer):
+        """JSON lines until the job ends (no Content-Length: the connection closes at the end)."""
+        queue = self.service.subscribe(job)
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        writer.write(json.dumps(job.status()).encode() + b"\n")
+        await writer.drain()
+        while (event := await queue.get()) is not None:
+            writer.write(json.dumps(event).encode() + b"\n")
+            await writer.drain()
+        writer.write(json.dumps(job.status()).encode() + b"\n")
+
+
+async def serve(host="127.0.0.1", port=8765, unix=None, workers=None, keep_results=KEEP_RESULTS):
+    """Runs the service until cancelled."""
+    service = JobService(workers, keep_results)
+    service.start()
+    server = JobServer(service)
+    if unix is not None:
+        listener = await asyncio.start_unix_server(server.handle, path=unix)
+        where = unix
+    else:
+        listener = await asyncio.start_server(server.handle, host=host, port=port)
+        where = f"http://{host}:{port}"
+    print(f"Job service listening on {where} ({service.workers} workers)")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        service.close()
+        if unix is not None and os.path.exists(unix):
+            os.unlink(unix)
+
+
+# ==========================================
+# 5. CLIENT
+# ==========================================
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+class JobClient:
+    """Blocking client of the job service (standard library only)."""
+
+    def __init__(self, host="127.0.0.1", port=8765, unix=None, timeout=None):
+        self.host, self.port, self.unix, self.timeout = host, port, unix, timeout
+
+    def _request(self, method, path, body=None):
+        if self.unix is not None:
+            connection = _UnixConnection(self.unix, self.timeout)
+        else:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        payload = None if body is None else json.dumps(body, default=_json_default).encode()
+        connection.request(method, path, body=payload,
+                           headers={"Content-Type": "application/json"} if payload else {})
+        response = connection.getresponse()
+        return connection, response
+
+    def _call(self, method, path, body=None):
+        connection, response = self._request(method, path, body)
+        try:
+            data = response.read()
+        finally:
+            connection.close()
+        if response.status >= 400:
+            raise RuntimeError(f"{response.status}: {json.loads(data).get('error')}")
+        return data if response.getheader("Content-Type") == "application/octet-stream" else json.loads(data)
+
+    def submit(self, config, priority=0, engine="auto"):
+        return self._call("POST", "/jobs", {"config": config, "priority": priority, "engine": engine})
+
+    def status(self, job_id=None):
+        return self._call("GET", "/jobs" if job_id is None else f"/jobs/{job_id}")
+
+    def cancel(self, job_id):
+        return self._call("DELETE", f"/jobs/{job_id}")
+
+    def result(self, job_id):
+        return decode_result(self._call("GET", f"/jobs/{job_id}/result"))
+
+    def events(self, job_id):
+        """Yields the progress events of a job until it ends (the last one is its final status)."""
+        connection, response = self._request("GET", f"/jobs/{job_id}/events")
+        try:
+            if response.status >= 400:
+                raise RuntimeError(f"{response.status}: {json.loads(response.read()).get('error')}")
+            for line in response:
+                yield json.loads(line)
+        finally:
+            connection.close()
+
+    def wait(self, job_id):
+        """Blocks until the job ends. Returns its final status."""
+        status = None
+        for status in self.events(job_id):
+            pass
+        return status
+
+
+# ==========================================
+# 6. MAIN EXECUTION
+# ==========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve SimulationRunner jobs on a local socket.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address (local only by default).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--keep-results", type=int, default=KEEP_RESULTS,
+                        help="Finished jobs kept in memory.")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.keep_results))
+    except KeyboardInterrupt:
+        pass
@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
+import csv
 import sys
+import time
+from collections import deque
 sys.path.append('gameoflife')
-import gameoflife.evolution as evo
+import gameoflife.engines as engines
+import gameoflife.soup as soup
+import gameoflife.raster as raster
+from gameoflife.cycles import CycleDetector, CycleReplay
+from gameoflife.producer import FrameProducer
 
 
 # Global constants for colors
@@ -18,6 +25,69 @@ COLORS = {
     "text"      : "white"   ,   # General text color
 }
 
+# Generations the automatic engine selection plans for (an interactive run has no fixed end)
+ENGINE_HORIZON = 1000
+
+
+# Performance instrumentation for the live HUD
+class PerfMeter:
+    """
+    Collects one sample per displayed frame (time spent in newgen, in _draw_grid and
+    in the Tk event loop) and summarizes the last `window` seconds.
+    The full trace can be exported as CSV.
+    """
+
+    FIELDS = ["time", "generation", "generations", "steps", "cells",
+              "newgen_ms", "draw_ms", "tk_ms", "target_fps", "gens_per_frame"]
+
+    def __init__(self, window=1.0, max_rows=100_000):
+        self.window = window
+        self.trace = deque(maxlen=max_rows)     # Bounded: old samples are dropped
+        self.start = time.perf_counter()
+
+    def record(self, **sample):
+        """Add a sample; missing fields are stored as 0"""
+        row = {field: sample.get(field, 0) for field in self.FIELDS}
+        row["time"] = time.perf_counter() - self.start
+        self.trace.append(row)
+
+    def summary(self):
+        """Rates and average timings over the last `window` seconds (None if not enough samples)"""
+        if len(self.trace) < 2:
+            return None
+        now = self.trace[-1]["time"]
+        recent = [row for row in self.trace if row["time"] >= now - self.window]
+        if len(recent) < 2:
+            recent = list(self.trace)[-2:]
+        span = recent[-1]["time"] - recent[0]["time"]
+        if span <= 0:
+            return None
+
+        rows = recent[1:]   # Rates are measured between samples
+        steps = sum(row["steps"] for row in rows)
+        newgen_ms = sum(row["newgen_ms"] for row in rows)
+        return {
+            "fps": len(rows) / span,
+            "gens_per_s": sum(row["generations"] for row in rows) / span,
+            "cells_per_s": sum(row["steps"] * row["cells"] for row in rows) / span,
+            "newgen_ms": newgen_ms / steps if steps else 0.0,           # per generation
+            "newgen_frame_ms": newgen_ms / len(rows),                   # per displayed frame
+            "draw_ms": sum(row["draw_ms"] for row in rows) / len(rows),
+            "tk_ms": sum(row["tk_ms"] for row in rows) / len(rows),
+            "compute_gens_per_s": steps / (newgen_ms / 1000) if newgen_ms else 0.0,
+        }
+
+    def export_csv(self, path):
+        """Write the trace to a CSV file"""
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.trace)
+
+    def reset(self):
+        self.trace.clear()
+        self.start = time.perf_counter()
+
 
 # Game of Life implementation using a class
 class GameOfLife:
@@ -42,37 +112,66 @@ class GameOfLife:
         self.root.configure(bg=COLORS["bg"])
         
         # Bind ESC key to exit fullscreen
-        self.root.bind("<Escape>", lambda e: self.root.destroy())
+        self.root.bind("<Escape>", lambda e: self._exit())
+        self.root.protocol("WM_DELETE_WINDOW", self._exit)
 
         # Initialize state variables
         self.rows = 5
         self.cols = 5
-        self.state = np.random.choice([True, False], size=(self.rows, self.cols))
+        self.density = 0.3      # Probability of a live cell in random grids
+        self.state = soup.random_grid((self.rows, self.cols), density=0.5)
         self.previous_state = None  # For detecting stable states
         self.is_running = False
         self.fps = 5
         self.generation = 0
         self.animation_id = None
+        self.worker = None          # Background FrameProducer while running
+        self.gens_per_frame = 1     # Turbo mode: generations computed per displayed frame
+        self.buffer_size = 4        # Frames computed ahead of the display
+        self.last_tick = 0.0        # Time of the last display update
+        self.next_tick = 0.0        # Time the next display update is scheduled for
+        self.perf = PerfMeter()     # Timings shown in the performance panel
+        self.last_hud = 0.0         # Time of the last performance panel refresh
+        self.worker_steps = 0       # Worker counters at the last sample
+        self.worker_compute = 0.0
+        self.tk_lag = 0.0           # Tk event loop time accumulated since the last frame
+        self.max_gens_per_frame = 100
+        self.photo = None           # Canvas image with the grid (see _create_grid_image)
+        self.drawn_state = None     # Last state drawn on the canvas
+
+        # Cycle detection: fingerprints of the last max_period generations (see gameoflife.cycles)
+        self.max_period = 100
+        self.cycle_detector = CycleDetector(max_period=self.max_period)
+        self.cycle_base = 0         # Generation of the first state fed to the detector
+        self.cycle = None           # First cycle found (set by the worker thread)
+        self.cycle_replay = None    # Fast-forward stepper, replaces newgen once the cycle is known
+        self.cycle_shown = None     # Cycle currently shown in the panel
+        self.cycle_mode = "Pause"   # What to do on a cycle (read by the worker, not a Tk variable)
+
+        # Evolution engine (see gameoflife.engines): "auto" picks one for the grid size and density
+        self.engine_choice = engines.AUTO
+        self.engine = None          # Engine used by the worker, chosen when the simulation starts
+        self.engine_step = None     # Its step function
 
         # Calculate dimensions
         self.panel_width = 200
         self.canvas_width = self.screen_width - (2 * self.panel_width)
         self.canvas_height = self.screen_height
         
-        # Calculate cell size to fit grid in center
-        # Limit max cell size to prevent oversized grids with small dimensions
-        self.cell_size = min(
-            (self.canvas_width - 40) // self.cols,  # -40 for padding
-            (self.canvas_height - 180) // self.rows,  # -180 for title + padding
-            70  # Maximum cell size (larger for better visibility of small grids)
-        )
-        
-        # Calculate actual grid size and offset to center it
-        self.grid_width = self.cols * self.cell_size
-        self.grid_height = self.rows * self.cell_size
-        self.grid_offset_x = (self.canvas_width - self.grid_width) // 2
-        # Ensure grid starts below title (minimum Y = 80)
-        self.grid_offset_y = max(80, (self.canvas_height - self.grid_height) // 2)
+        # Area available for the grid (padding for the title and the borders)
+        self.max_view_width = self.canvas_width - 40
+        self.max_view_height = self.canvas_height - 180
+        self.max_cell_size = 70     # Maximum cell size (larger for better visibility of small grids)
+
+        # Viewport: only the visible part of the world is rendered.
+        # cell_size = screen pixels per displayed unit, block = cells per displayed unit
+        # (block > 1 when zoomed out: every pixel shows the density of block x block cells)
+        self.view_row = 0
+        self.view_col = 0
+        self.max_world_size = 10000     # Largest rows / cols accepted by "Apply Size"
+        self.drawn_view = None
+        self.image_key = None
+        self._fit_view()
 
         # Set up UI
         self._setup_layout()
@@ -168,6 +267,25 @@ class GameOfLife:
                               length=180)
         speed_slider.pack(pady=5, padx=10)
 
+        # Turbo control: generations computed for every displayed frame
+        turbo_label = tk.Label(self.left_frame, text="Turbo (gens / frame)", 
+                             font=("Arial", 11),
+                             fg=COLORS["text"], bg=COLORS["panel_bg"])
+        turbo_label.pack(pady=(20, 5))
+
+        self.turbo_var = tk.IntVar(value=self.gens_per_frame)
+        turbo_slider = tk.Scale(self.left_frame, from_=1, to=self.max_gens_per_frame, 
+                              orient=tk.HORIZONTAL,
+                              variable=self.turbo_var,
+                              command=self._update_turbo,
+                              bg=COLORS["panel_bg"], 
+                              fg=COLORS["text"],
+                              highlightthickness=0,
+                              troughcolor=COLORS["btn_bg"],
+                              activebackground="#505050",
+                              length=180)
+        turbo_slider.pack(pady=5, padx=10)
+
         # Seed control
         seed_label = tk.Label(self.left_frame, text="Seed (optional)", 
                              font=("Arial", 11),
@@ -195,7 +313,7 @@ class GameOfLife:
 
         # Exit button at bottom
         exit_btn = tk.Button(self.left_frame, text="EXIT",
-                           command=self.root.destroy,
+                           command=self._exit,
                            font=("Arial", 10),
                            bg="#B71C1C", fg=COLORS["btn_fg"],
                            activebackground="#C62828",
@@ -213,6 +331,20 @@ class GameOfLife:
                                highlightthickness=0)
         self.canvas.pack()
 
+        # Zoom (mouse wheel, +/-) and pan (drag, arrow keys)
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.root.bind("<plus>", lambda e: self._zoom(True))
+        self.root.bind("<equal>", lambda e: self._zoom(True))
+        self.root.bind("<minus>", lambda e: self._zoom(False))
+        self.root.bind("<Up>", lambda e: self._pan(-max(1, self.visible_rows // 4), 0))
+        self.root.bind("<Down>", lambda e: self._pan(max(1, self.visible_rows // 4), 0))
+        self.root.bind("<Left>", lambda e: self._pan(0, -max(1, self.visible_cols // 4)))
+        self.root.bind("<Right>", lambda e: self._pan(0, max(1, self.visible_cols // 4)))
+
         # Add title above grid (fixed position for all grid sizes)
         title_y = 30
         self.canvas.create_text(self.canvas_width // 2, title_y,
@@ -310,6 +442,36 @@ class GameOfLife:
                                        fg="#888888", bg=COLORS["panel_bg"])
         self.grid_info_label.pack(pady=(5, 0))
 
+        # Viewport (zoom / pan) info
+        view_frame = tk.Frame(self.right_frame, bg=COLORS["panel_bg"])
+        view_frame.pack(pady=(30, 10), padx=10)
+
+        view_title = tk.Label(view_frame, text="View", 
+                            font=("Arial", 11, "bold"),
+                            fg=COLORS["text"], bg=COLORS["panel_bg"])
+        view_title.pack(pady=(0, 5))
+
+        self.zoom_display = tk.Label(view_frame, text="",
+                                    font=("Arial", 9),
+                                    fg="#888888", bg=COLORS["panel_bg"],
+                                    justify=tk.CENTER)
+        self.zoom_display.pack()
+
+        fit_btn = tk.Button(view_frame, text="Fit View",
+                          command=self._fit_and_draw,
+                          font=("Arial", 10),
+                          bg=COLORS["btn_bg"], fg=COLORS["btn_fg"],
+                          activebackground="#505050",
+                          relief=tk.RAISED, bd=2,
+                          width=12, height=1)
+        fit_btn.pack(pady=(5, 0))
+
+        view_help = tk.Label(view_frame,
+                           text="wheel / +/- : zoom\ndrag / arrows : pan",
+                           font=("Arial", 9),
+                           fg="#888888", bg=COLORS["panel_bg"])
+        view_help.pack(pady=(5, 0))
+
         # Status indicator
         status_frame = tk.Frame(self.right_frame, bg=COLORS["panel_bg"])
         status_frame.pack(pady=(30, 10), padx=10)
@@ -324,56 +486,571 @@ class GameOfLife:
                                       fg="#FFC107", bg=COLORS["panel_bg"])
         self.status_display.pack()
 
+        # Cycle detection (oscillators, spaceships)
+        cycle_frame = tk.Frame(self.right_frame, bg=COLORS["panel_bg"])
+        cycle_frame.pack(pady=(30, 10), padx=10)
+
+        cycle_title = tk.Label(cycle_frame, text="Cycle",
+                             font=("Arial", 11, "bold"),
+                             fg=COLORS["text"], bg=COLORS["panel_bg"])
+        cycle_title.pack(pady=(0, 5))
+
+        self.cycle_display = tk.Label(cycle_frame, text="none detected",
+                                     font=("Arial", 9),
+                                     fg="#888888", bg=COLORS["panel_bg"],
+                                     justify=tk.CENTER)
+        self.cycle_display.pack()
+
+        period_label = tk.Label(cycle_frame, text="Max period",
+                              font=("Arial", 10),
+                              fg=COLORS["text"], bg=COLORS["panel_bg"])
+        period_label.pack(pady=(5, 0))
+
+        self.max_period_var = tk.IntVar(value=self.max_period)
+        period_slider = tk.Scale(cycle_frame, from_=1, to=1000,
+                               orient=tk.HORIZONTAL,
+                               variable=self.max_period_var,
+                               command=self._update_max_period,
+                               bg=COLORS["panel_bg"],
+                               fg=COLORS["text"],
+                               highlightthickness=0,
+                               troughcolor=COLORS["btn_bg"],
+                               activebackground="#505050",
+                               length=160)
+        period_slider.pack()
+
+        mode_label = tk.Label(cycle_frame, text="On cycle",
+                            font=("Arial", 10),
+                            fg=COLORS["text"], bg=COLORS["panel_bg"])
+        mode_label.pack(pady=(5, 0))
+
+        # Pause: stop the simulation / Fast-forward: replay the cycle instead of computing it
+        # Ignore: only report it (stable states always stop the simulation)
+        self.cycle_mode_var = tk.StringVar(value=self.cycle_mode)
+        mode_menu = tk.OptionMenu(cycle_frame, self.cycle_mode_var,
+                                  "Pause", "Fast-forward", "Ignore",
+                                  command=self._update_cycle_mode)
+        mode_menu.config(font=("Arial", 10), width=11,
+                         bg=COLORS["btn_bg"], fg=COLORS["btn_fg"],
+                         activebackground="#505050", highlightthickness=0)
+        mode_menu.pack(pady=(2, 0))
+
+        # Performance panel
+        perf_frame = tk.Frame(self.right_frame, bg=COLORS["panel_bg"])
+        perf_frame.pack(pady=(30, 10), padx=10)
+
+        perf_title = tk.Label(perf_frame, text="Performance", 
+                            font=("Arial", 11, "bold"),
+                            fg=COLORS["text"], bg=COLORS["panel_bg"])
+        perf_title.pack(pady=(0, 5))
+
+        self.perf_display = tk.Label(perf_frame, text="-",
+                                    font=("Courier", 9),
+                                    fg="#888888", bg=COLORS["panel_bg"],
+                                    justify=tk.LEFT)
+        self.perf_display.pack()
+
+        engine_label = tk.Label(perf_frame, text="Engine",
+                              font=("Arial", 10),
+                              fg=COLORS["text"], bg=COLORS["panel_bg"])
+        engine_label.pack(pady=(5, 0))
+
+        self.engine_var = tk.StringVar(value=self.engine_choice)
+        engine_menu = tk.OptionMenu(perf_frame, self.engine_var,
+                                    engines.AUTO, *engines.available(),
+                                    command=self._update_engine)
+        engine_menu.config(font=("Arial", 10), width=11,
+                           bg=COLORS["btn_bg"], fg=COLORS["btn_fg"],
+                           activebackground="#505050", highlightthickness=0)
+        engine_menu.pack(pady=(2, 0))
+
+        self.adaptive_var = tk.BooleanVar(value=False)
+        adaptive_check = tk.Checkbutton(perf_frame, text="Adaptive speed",
+                                      variable=self.adaptive_var,
+                                      font=("Arial", 10),
+                                      fg=COLORS["text"], bg=COLORS["panel_bg"],
+                                      selectcolor=COLORS["btn_bg"],
+                                      activebackground=COLORS["panel_bg"],
+                                      activeforeground=COLORS["text"])
+        adaptive_check.pack(pady=(5, 0))
+
+        export_btn = tk.Button(perf_frame, text="Export CSV",
+                             command=self._export_perf_trace,
+                             font=("Arial", 10),
+                             bg=COLORS["btn_bg"], fg=COLORS["btn_fg"],
+                             activebackground="#505050",
+                             relief=tk.RAISED, bd=2,
+                             width=12, height=1)
+        export_btn.pack(pady=(5, 0))
+
+        self.export_display = tk.Label(perf_frame, text="",
+                                      font=("Arial", 8),
+                                      fg="#888888", bg=COLORS["panel_bg"])
+        self.export_display.pack()
+
+
+    def _fit_view(self):
+        """Zoom and pan so that the whole world fits in the canvas"""
+        cs = min(self.max_view_width // self.cols, self.max_view_height // self.rows,
+                 self.max_cell_size)
+        if cs >= 1:
+            self.cell_size, self.block = cs, 1
+        else:
+            # More cells than pixels: smallest power-of-two block that fits
+            ratio = max(self.cols / self.max_view_width, self.rows / self.max_view_height)
+            self.cell_size, self.block = 1, 1 << int(np.ceil(np.log2(ratio)))
+        self.view_row = 0
+        self.view_col = 0
+        self._update_geometry()
+
+
+    def _update_geometry(self):
+        """Compute the visible window of the world and the size and position of the image"""
+        cs, block = self.cell_size, self.block
+
+        # Displayed units (cells or blocks) that fit on screen, limited by the world size
+        units_r = max(1, min(self.rows // block, self.max_view_height // cs))
+        units_c = max(1, min(self.cols // block, self.max_view_width // cs))
+        self.visible_rows = min(self.rows, units_r * block)
+        self.visible_cols = min(self.cols, units_c * block)
+
+        # Keep the viewport inside the world
+        self.view_row = int(min(max(self.view_row, 0), self.rows - self.visible_rows))
+        self.view_col = int(min(max(self.view_col, 0), self.cols - self.visible_cols))
+
+        self.grid_lines = block == 1 and cs >= 3     # Grid lines only if cells are big enough
+        self.grid_width = (self.visible_cols // block) * cs
+        self.grid_height = (self.visible_rows // block) * cs
+        self.grid_offset_x = (self.canvas_width - self.grid_width) // 2
+        # Ensure grid starts below title (minimum Y = 80)
+        self.grid_offset_y = max(80, (self.canvas_height - self.grid_height) // 2)
+
+
+    def _visible_window(self):
+        """The part of the world shown on screen (a view, no copy)"""
+        return self.state[self.view_row:self.view_row + self.visible_rows,
+                          self.view_col:self.view_col + self.visible_cols]
+
+
+    def _color_to_rgb(self, color):
+        """Convert a Tk color (name or #RRGGBB) to an (r, g, b) tuple of 0-255 values"""
+        r, g, b = self.root.winfo_rgb(color)    # 16-bit channels
+        return r >> 8, g >> 8, b >> 8
+
+
+    def _create_grid_image(self):
+        """
+        Create the single image that shows the visible part of the grid.
+        The grid is drawn as one PhotoImage instead of rows x cols rectangle items:
+        a cell is the (cell_size - 1)^2 square between the grid lines.
+        """
+        self.canvas.delete("cell")
+        extra = 1 if self.grid_lines else 0     # Closing grid line on the right and bottom
+        self.photo = tk.PhotoImage(width=self.grid_width + extra, height=self.grid_height + extra)
+        self.canvas.create_image(self.grid_offset_x, self.grid_offset_y,
+                                 image=self.photo, anchor=tk.NW, tags="cell")
+        self.image_key = (self.grid_width, self.grid_height,
+                          self.grid_offset_x, self.grid_offset_y, self.grid_lines)
+        self.drawn_state = None     # Nothing drawn yet: the next _draw_grid is a full blit
+
+        # Palette: dead -> alive shades (used when zoomed out), plus the grid color
+        self.palette = raster.make_palette(self._color_to_rgb(COLORS["dead"]),
+                                           self._color_to_rgb(COLORS["alive"]),
+                                           self._color_to_rgb(COLORS["grid"]))
+
+
+    def _blit_full(self):
+        """
+        Render the visible window with NumPy and send it to Tk as one PPM image.
+        The cost depends on the number of screen pixels, not on the size of the world.
+        """
+        indices = raster.cells_to_indices(self._visible_window(), self.block)
+        pixels = raster.upscale(indices, self.cell_size, self.grid_lines)
+        self.photo.configure(data=raster.to_ppm(pixels, self.palette), format="PPM")
+
 
     def _draw_grid(self):
-        """Draw the Game of Life grid on the canvas"""
-        self.canvas.delete("cell")  # Remove old cells
-        
-        for row in range(self.rows):
-            for col in range(self.cols):
-                x1 = self.grid_offset_x + col * self.cell_size
-                y1 = self.grid_offset_y + row * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                
-                color = COLORS["alive"] if self.state[row, col] else COLORS["dead"]
-                self.canvas.create_rectangle(x1, y1, x2, y2, 
-                                            fill=color, 
-                                            outline=COLORS["grid"],
-                                            tags="cell")
+        """
+        Draw the visible part of the Game of Life grid on the canvas.
+        Only the cells that changed since the last drawn frame (XOR of the two states)
+        are repainted, so the cost scales with the activity and not with the grid size.
+        """
+        image_key = (self.grid_width, self.grid_height,
+                     self.grid_offset_x, self.grid_offset_y, self.grid_lines)
+        if self.photo is None or self.image_key != image_key:
+            self._create_grid_image()
+
+        window = self._visible_window()
+        view_key = (self.view_row, self.view_col, self.cell_size, self.block, window.shape)
+        if self.drawn_state is None or self.drawn_view != view_key or self.block > 1:
+            changed = None
+        else:
+            changed = np.argwhere(np.logical_xor(self.drawn_state, window))
+
+        # Full repaint when there is no previous frame, when the view moved or is zoomed out,
+        # or when most of the grid changed: one big image transfer is then cheaper
+        if changed is None or len(changed) > window.size // 8:
+            self._blit_full()
+        else:
+            cs = self.cell_size
+            inset = 1 if self.grid_lines else 0     # Do not paint over the grid lines
+            for row, col in changed:
+                x1 = col * cs + inset
+                y1 = row * cs + inset
+                color = COLORS["alive"] if window[row, col] else COLORS["dead"]
+                self.photo.put(color, to=(x1, y1, (col + 1) * cs, (row + 1) * cs))
+
+        self.drawn_state = window.copy()
+        self.drawn_view = view_key
+        self._update_zoom_label()
+
+
+    def _update_zoom_label(self):
+        """Show the current zoom level and visible region in the right panel"""
+        if self.block > 1:
+            zoom = f"1 px = {self.block}×{self.block} cells"
+        else:
+            zoom = f"{self.cell_size} px / cell"
+        self.zoom_display.config(
+            text=f"{zoom}\nrows {self.view_row}-{self.view_row + self.visible_rows - 1}"
+                 f"\ncols {self.view_col}-{self.view_col + self.visible_cols - 1}")
+
+
+    def _zoom(self, zoom_in, x=None, y=None):
+        """
+        Zoom in or out by a factor 2, keeping the cell under the pointer (x, y) in place.
+        Without a pointer position the center of the view is used.
+        """
+        if x is None:
+            x = self.grid_offset_x + self.grid_width // 2
+            y = self.grid_offset_y + self.grid_height // 2
+
+        # World coordinates of the point under the pointer
+        px = min(max(x - self.grid_offset_x, 0), self.grid_width)
+        py = min(max(y - self.grid_offset_y, 0), self.grid_height)
+        world_col = self.view_col + px / self.cell_size * self.block
+        world_row = self.view_row + py / self.cell_size * self.block
+
+        if zoom_in:
+            if self.block > 1:
+                self.block //= 2
+            else:
+                self.cell_size = min(self.cell_size * 2, self.max_cell_size)
+        else:
+            if self.cell_size > 1:
+                self.cell_size //= 2
+            elif self.cols // self.block > self.max_view_width or self.rows // self.block > self.max_view_height:
+                self.block *= 2     # Stop once the whole world is visible
+
+        # Put the same world point back under the pointer
+        self.view_col = world_col - px / self.cell_size * self.block
+        self.view_row = world_row - py / self.cell_size * self.block
+        self._update_geometry()
+        self._draw_grid()
+
+
+    def _pan(self, d_rows, d_cols):
+        """Move the viewport by a number of world cells"""
+        self.view_row += d_rows
+        self.view_col += d_cols
+        self._update_geometry()
+        self._draw_grid()
+
+
+    def _on_mouse_wheel(self, event):
+        """Zoom with the mouse wheel (Button-4/5 on Linux, MouseWheel elsewhere)"""
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._zoom(zoom_in, event.x, event.y)
+
+
+    def _on_drag_start(self, event):
+        """Remember where a pan drag started"""
+        self.drag_origin = (event.x, event.y, self.view_row, self.view_col)
+
+
+    def _on_drag(self, event):
+        """Pan by dragging the grid with the mouse"""
+        x0, y0, row0, col0 = self.drag_origin
+        scale = self.block / self.cell_size     # World cells per screen pixel
+        self.view_row = row0 - round((event.y - y0) * scale)
+        self.view_col = col0 - round((event.x - x0) * scale)
+        self._update_geometry()
+        self._draw_grid()
+
+
+    def _fit_and_draw(self):
+        """Show the whole world"""
+        self._fit_view()
+        self._draw_grid()
+
+
+    def _start_worker(self):
+        """Start computing generations in the background from the current state"""
+        self._stop_worker()
+        self._sync_cycle_detector()
+        self._select_engine()
+        self.worker = FrameProducer(self.state, step=self._compute_step,
+                                    maxsize=self.buffer_size,
+                                    gens_per_frame=self.gens_per_frame,
+                                    generation=self.generation,
+                                    stop_when=self._check_cycle)
+        self.worker.start()
+        self.last_tick = time.perf_counter()
+        self.next_tick = self.last_tick + 1 / self.fps
+        self.worker_steps = 0
+        self.worker_compute = 0.0
+        self.tk_lag = 0.0
+
+
+    def _stop_worker(self):
+        """Cancel the background worker (its pending frames are discarded)"""
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+
+    def _select_engine(self):
+        """Choose the engine for the current grid (the chosen one, or the fastest for "auto")"""
+        self.engine = engines.resolve(self.engine_choice, self.state, horizon=ENGINE_HORIZON)
+        self.engine_step = self.engine.stepper()
+
+
+    def _update_engine(self, value):
+        """Change the evolution engine (restarts the worker if running)"""
+        if value == self.engine_choice:
+            return
+        was_running = self.is_running
+        if was_running:
+            self._toggle_simulation()
+        self.engine_choice = value
+        self.engine = self.engine_step = None
+        if was_running:
+            self._toggle_simulation()
+
+
+    def _compute_step(self, state):
+        """Next generation: one engine step, or a replay of the cycle once it is known (fast-forward)"""
+        replay = self.cycle_replay
+        if replay is not None:
+            return replay(state)
+        return self.engine_step(state)
+
+
+    def _check_cycle(self, previous, current):
+        """
+        Stop condition of the worker (runs in the worker thread).
+        Feeds every generation to the cycle detector until the first cycle is found, then
+        applies the "On cycle" choice. Returns True if the simulation has to stop.
+        """
+        if self.cycle is not None:
+            return False        # Already handled, nothing left to detect
+        cycle = self.cycle_detector.update(current)
+        if cycle is None:
+            return False
+
+        self.cycle = cycle
+        if cycle.period == 1 and not cycle.is_moving:
+            return True         # Stable state: nothing will ever change
+        mode = self.cycle_mode
+        if mode == "Fast-forward":
+            self.cycle_replay = CycleReplay(self.engine_step, cycle)
+        return mode == "Pause"
+
+
+    def _sync_cycle_detector(self):
+        """
+        Make the detector history end at the displayed generation before feeding it again.
+        The worker runs ahead of the display, so after a pause (or an engine change) the
+        detector may have seen generations that the restarted worker will compute again:
+        feeding them twice would report a repeat that does not exist. In that case the
+        history restarts from the displayed state (a cycle already found stays valid).
+        """
+        if self.cycle is not None:
+            return
+        if self.cycle_base + self.cycle_detector.generation == self.generation:
+            return      # In sync (or the same single state fed again below)
+        self.cycle_detector = CycleDetector(max_period=self.max_period)
+        self.cycle_detector.update(self.state)
+        self.cycle_base = self.generation
+
+
+    def _reset_cycle(self):
+        """Forget the generations seen so far (the state was replaced, not evolved)"""
+        self.cycle_detector = CycleDetector(max_period=self.max_period)
+        self.cycle_base = self.generation
+        self.cycle = None
+        self.cycle_replay = None
+        self._show_cycle()
+
+
+    def _show_cycle(self):
+        """Show the detected cycle (period, shift, transient) in the right panel"""
+        cycle = self.cycle
+        self.cycle_shown = cycle
+        if cycle is None:
+            self.cycle_display.config(text="none detected", fg="#888888")
+            return
+        if cycle.period == 1 and not cycle.is_moving:
+            kind = "stable"
+        elif cycle.is_moving:
+            kind = f"moving {cycle.speed} ({cycle.dx:+d}, {cycle.dy:+d})"
+        else:
+            kind = "oscillating"
+        self.cycle_display.config(fg="#4CAF50", text=(
+            f"period {cycle.period}, {kind}\n"
+            f"transient {self.cycle_base + cycle.transient} gens\n"
+            f"found at gen {self.cycle_base + cycle.generation}"))
+
+
+    def _update_max_period(self, value):
+        """Change the longest period looked for (restarts the detection)"""
+        value = int(value)
+        if value == self.max_period:
+            return
+        was_running = self.is_running
+        if was_running:
+            self._toggle_simulation()
+        self.max_period = value
+        self._reset_cycle()
+        if was_running:
+            self._toggle_simulation()
+
+
+    def _update_cycle_mode(self, value):
+        """Change what happens when a cycle is found"""
+        self.cycle_mode = value
+
+
+    def _finish_simulation(self, status="FINISHED", color="#4CAF50"):
+        """Stop the simulation on its own (stable state, cycle or error)"""
+        self.is_running = False
+        self._stop_worker()
+        self.start_btn.config(text="START", bg="#2E7D32", 
+                            activebackground="#388E3C")
+        self.status_display.config(text=status, fg=color)
+        if self.animation_id:
+            self.root.after_cancel(self.animation_id)
+            self.animation_id = None
 
 
     def _update_simulation(self):
-        """Update the grid to the next generation"""
-        if self.is_running:
-            # Save current state before evolving
-            self.previous_state = self.state.copy()
-            
-            # Evolve to next generation
-            self.state = evo.newgen(self.state)
-            self.generation += 1
-            
-            # Check if state is stable (no change from previous)
-            if np.array_equal(self.state, self.previous_state):
-                # Stable state detected - stop simulation
-                self.is_running = False
-                self.start_btn.config(text="START", bg="#2E7D32", 
-                                    activebackground="#388E3C")
-                self.status_display.config(text="FINISHED", fg="#4CAF50")
-                if self.animation_id:
-                    self.root.after_cancel(self.animation_id)
-                # Update display one last time
-                self._draw_grid()
-                self.gen_display.config(text=str(self.generation))
-                return
-            
+        """
+        Show the newest generation computed by the background worker.
+        The worker runs ahead of the display; frames that the clock has already
+        passed (display slower than requested) are dropped instead of queued.
+        """
+        if not self.is_running or self.worker is None:
+            return
+
+        # Time the Tk event loop kept us waiting past the scheduled tick
+        now = time.perf_counter()
+        self.tk_lag += max(0.0, now - self.next_tick)
+
+        # How far the display is allowed to go: one frame per elapsed tick
+        ticks = max(1, round((now - self.last_tick) * self.fps))
+        self.last_tick = now
+        max_generation = self.generation + ticks * self.gens_per_frame
+
+        frame = self.worker.latest(max_generation=max_generation)
+        if frame is not None:
+            # Save current state before showing the new one
+            self.previous_state = self.state
+            advanced = frame.generation - self.generation
+            self.state = frame.state
+            self.generation = frame.generation
+
             # Update display
+            t0 = time.perf_counter()
             self._draw_grid()
             self.gen_display.config(text=str(self.generation))
-            
-            # Schedule next update
-            delay = int(1000 / self.fps)
-            self.animation_id = self.root.after(delay, self._update_simulation)
+            draw_seconds = time.perf_counter() - t0
+
+            self._record_perf(advanced, draw_seconds)
+
+            if self.cycle is not self.cycle_shown:
+                self._show_cycle()
+                if self.cycle_replay is not None:
+                    # Replaying is cheap: jump ahead as fast as the display allows
+                    self.turbo_var.set(self.max_gens_per_frame)
+                    self._update_turbo(self.max_gens_per_frame)
+
+            if frame.finished:
+                # Stable state or cycle detected by the worker - stop simulation
+                cycle = self.cycle
+                if cycle is not None and (cycle.period > 1 or cycle.is_moving):
+                    self._finish_simulation(status=f"PERIOD {cycle.period}", color="#2196F3")
+                else:
+                    self._finish_simulation()
+                return
+
+        if self.worker.error is not None:
+            self._finish_simulation(status="ERROR", color="#C62828")
+            return
+
+        # Schedule next update
+        delay = int(1000 / self.fps)
+        self.next_tick = time.perf_counter() + delay / 1000
+        self.animation_id = self.root.after(delay, self._update_simulation)
+
+
+    def _record_perf(self, advanced, draw_seconds):
+        """Store the timings of the frame just shown and refresh the performance panel"""
+        steps = self.worker.total_steps - self.worker_steps
+        compute = self.worker.total_compute_seconds - self.worker_compute
+        self.worker_steps = self.worker.total_steps
+        self.worker_compute = self.worker.total_compute_seconds
+
+        self.perf.record(generation=self.generation, generations=advanced, steps=steps,
+                         cells=self.rows * self.cols,
+                         newgen_ms=compute * 1000, draw_ms=draw_seconds * 1000,
+                         tk_ms=self.tk_lag * 1000, target_fps=self.fps,
+                         gens_per_frame=self.gens_per_frame)
+        self.tk_lag = 0.0
+
+        # Refresh the panel (and the adaptive speed) a few times per second only
+        now = time.perf_counter()
+        if now - self.last_hud < 0.25:
+            return
+        self.last_hud = now
+        stats = self.perf.summary()
+        if stats is None:
+            return
+
+        if self.adaptive_var.get():
+            self._adapt_speed(stats)
+
+        bottleneck = "compute" if stats["newgen_frame_ms"] > stats["draw_ms"] else "render"
+        self.perf_display.config(text=(
+            f"FPS     {stats['fps']:6.1f} / {self.fps}\n"
+            f"gen/s   {stats['gens_per_s']:8.1f}\n"
+            f"cells/s {stats['cells_per_s']:8.2e}\n"
+            f"newgen  {stats['newgen_ms']:6.1f} ms/gen\n"
+            f"draw    {stats['draw_ms']:6.1f} ms\n"
+            f"Tk loop {stats['tk_ms']:6.1f} ms\n"
+            f"gens/frame {self.gens_per_frame}\n"
+            f"engine  {self.engine.name if self.engine else '-'}\n"
+            f"bottleneck: {bottleneck}"))
+
+
+    def _adapt_speed(self, stats):
+        """
+        Adaptive mode: choose the generations per frame so that computing them takes
+        about 80% of the frame budget (1 / target FPS), given the measured newgen speed.
+        """
+        if stats["compute_gens_per_s"] <= 0:
+            return
+        target = int(0.8 * stats["compute_gens_per_s"] / self.fps)
+        target = max(1, min(self.max_gens_per_frame, target))
+        if target != self.gens_per_frame:
+            self.turbo_var.set(target)
+            self._update_turbo(target)
+
+
+    def _export_perf_trace(self):
+        """Save the performance trace to a timestamped CSV file in the working directory"""
+        path = time.strftime("perf_trace_%Y%m%d_%H%M%S.csv")
+        self.perf.export_csv(path)
+        self.export_display.config(text=f"Saved {path}")
 
 
     def _toggle_simulation(self):
@@ -384,22 +1061,33 @@ class GameOfLife:
             self.start_btn.config(text="PAUSE", bg="#C62828", 
                                 activebackground="#D32F2F")
             self.status_display.config(text="RUNNING", fg="#4CAF50")
-            self._update_simulation()
+            self._start_worker()
+            delay = int(1000 / self.fps)
+            self.animation_id = self.root.after(delay, self._update_simulation)
         else:
             self.start_btn.config(text="START", bg="#2E7D32", 
                                 activebackground="#388E3C")
             self.status_display.config(text="PAUSED", fg="#FFC107")
+            self._stop_worker()
             if self.animation_id:
                 self.root.after_cancel(self.animation_id)
+                self.animation_id = None
 
 
     def _step_forward(self):
         """Advance one generation"""
         if not self.is_running:
-            self.state = evo.newgen(self.state)
+            self._sync_cycle_detector()
+            if self.engine_step is None:
+                self._select_engine()
+            previous = self.state
+            self.state = self._compute_step(self.state)
             self.generation += 1
+            self._check_cycle(previous, self.state)
             self._draw_grid()
             self.gen_display.config(text=str(self.generation))
+            if self.cycle is not self.cycle_shown:
+                self._show_cycle()
 
 
     def _reset_grid(self):
@@ -408,31 +1096,12 @@ class GameOfLife:
         if self.is_running:
             self._toggle_simulation()
         
-        # Get seed from entry field
-        seed_text = self.seed_entry.get().strip()
-        
-        if seed_text:
-            try:
-                seed = int(seed_text)
-                np.random.seed(seed)
-                # Show feedback to user
-                self.seed_entry.config(bg="#2E7D32")  # Green background
-                self.root.after(500, lambda: self.seed_entry.config(bg=COLORS["btn_bg"]))
-            except ValueError:
-                # Invalid seed, show error
-                self.seed_entry.config(bg="#C62828")  # Red background
-                self.root.after(500, lambda: self.seed_entry.config(bg=COLORS["btn_bg"]))
-                # Use random seed anyway
-                np.random.seed(None)
-        else:
-            # No seed provided, use random
-            np.random.seed(None)
-        
-        self.state = np.random.choice([True, False], 
-                                     size=(self.rows, self.cols), 
-                                     p=[0.3, 0.7])
+        # Get seed from entry field (None = random)
+        seed = self._read_seed()
+        self.state = soup.random_grid((self.rows, self.cols), density=self.density, seed=seed)
         self.previous_state = None  # Reset for fresh simulation
         self.generation = 0
+        self._reset_cycle()
         self._draw_grid()
         self.gen_display.config(text="0")
         
@@ -440,6 +1109,25 @@ class GameOfLife:
             self._toggle_simulation()
 
 
+    def _read_seed(self):
+        """Read the seed from the entry field. Returns None (fresh random grid) if empty or invalid."""
+        seed_text = self.seed_entry.get().strip()
+        if not seed_text:
+            return None
+
+        try:
+            seed = int(seed_text)
+            # Show feedback to user
+            self.seed_entry.config(bg="#2E7D32")  # Green background
+            self.root.after(500, lambda: self.seed_entry.config(bg=COLORS["btn_bg"]))
+            return seed
+        except ValueError:
+            # Invalid seed, show error and use a random grid anyway
+            self.seed_entry.config(bg="#C62828")  # Red background
+            self.root.after(500, lambda: self.seed_entry.config(bg=COLORS["btn_bg"]))
+            return None
+
+
     def _clear_grid(self):
         """Clear all cells"""
         was_running = self.is_running
@@ -449,6 +1137,7 @@ class GameOfLife:
         self.state = np.zeros((self.rows, self.cols), dtype=bool)
         self.previous_state = None  # Reset for fresh simulation
         self.generation = 0
+        self._reset_cycle()
         self._draw_grid()
         self.gen_display.config(text="0")
 
@@ -458,6 +1147,19 @@ class GameOfLife:
         self.fps = int(value)
 
 
+    def _update_turbo(self, value):
+        """Update the number of generations computed for every displayed frame"""
+        self.gens_per_frame = int(value)
+        if self.worker is not None:
+            self.worker.gens_per_frame = self.gens_per_frame
+
+
+    def _exit(self):
+        """Stop the background worker and close the window"""
+        self._stop_worker()
+        self.root.destroy()
+
+
     def _apply_grid_size(self):
         """Apply new grid dimensions"""
         try:
@@ -465,12 +1167,12 @@ class GameOfLife:
             new_cols = int(self.cols_entry.get())
             
             # Validate dimensions
-            if new_rows < 5 or new_rows > 200:
+            if new_rows < 5 or new_rows > self.max_world_size:
                 self.rows_entry.config(bg="#C62828")
                 self.root.after(500, lambda: self.rows_entry.config(bg=COLORS["btn_bg"]))
                 return
             
-            if new_cols < 5 or new_cols > 300:
+            if new_cols < 5 or new_cols > self.max_world_size:
                 self.cols_entry.config(bg="#C62828")
                 self.root.after(500, lambda: self.cols_entry.config(bg=COLORS["btn_bg"]))
                 return
@@ -484,27 +1186,15 @@ class GameOfLife:
             self.rows = new_rows
             self.cols = new_cols
             
-            # Recalculate cell size
-            # Limit max cell size to prevent oversized grids with small dimensions
-            self.cell_size = min(
-                (self.canvas_width - 40) // self.cols,
-                (self.canvas_height - 180) // self.rows,
-                70  # Maximum cell size (larger for better visibility of small grids)
-            )
-            
-            # Recalculate grid dimensions and offset
-            self.grid_width = self.cols * self.cell_size
-            self.grid_height = self.rows * self.cell_size
-            self.grid_offset_x = (self.canvas_width - self.grid_width) // 2
-            # Ensure grid starts below title (minimum Y = 80)
-            self.grid_offset_y = max(80, (self.canvas_height - self.grid_height) // 2)
+            # Show the whole new world
+            self._fit_view()
             
             # Create new state
-            self.state = np.random.choice([True, False], 
-                                         size=(self.rows, self.cols), 
-                                         p=[0.3, 0.7])
+            self.state = soup.random_grid((self.rows, self.cols), density=self.density,
+                                          seed=self._read_seed())
             self.previous_state = None  # Reset for fresh simulation
             self.generation = 0
+            self._reset_cycle()
             
             # Update displays
             self._draw_grid()